@@ -1,11 +1,132 @@
 from pydantic_settings import BaseSettings
- 
+
 class Settings(BaseSettings):
+    # Empty keeps the database next to the app (backend/task_manager.db)
+    DATABASE_PATH: str = ""
+
+    # Task storage: "sqlite" keeps tasks in the main database file; "sharded"
+    # partitions them by assignee across SHARD_COUNT files attached to every
+    # connection (task_manager.shard0.db, ...). Users and audit logs always
+    # stay in the main file. SQLite attaches at most 10 databases.
+    STORAGE_BACKEND: str = "sqlite"
+    SHARD_COUNT: int = 4
+
     SECRET_KEY: str = "your-secret-key-change-in-production-09876543210"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+    # Was 30 before refresh tokens existed; clients now refresh instead of
+    # holding one access token for the whole visit
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+
+    # Refresh tokens are opaque, stored hashed and rotated on every use;
+    # revoked sessions are re-read from the database this often
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    TOKEN_DENYLIST_REFRESH_SECONDS: float = 5.0
+    # Event streams authenticate with a single-use ticket in the URL (browsers'
+    # EventSource cannot send headers); it must be redeemed within this many seconds
+    STREAM_TICKET_SECONDS: int = 30
+
+    # SQLite connection pool
+    DB_POOL_SIZE: int = 16
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_SYNCHRONOUS: str = "NORMAL"
+    DB_CACHE_SIZE_KB: int = 20000
+    DB_MMAP_SIZE: int = 268435456
+
+    # Worker pools for blocking work called from async handlers. Password
+    # hashing runs in HASH_WORKERS processes ("process", one bcrypt per core)
+    # or threads ("thread"); at most HASH_QUEUE_SIZE more calls wait for a
+    # worker, and a login that cannot queue within HASH_QUEUE_TIMEOUT gets 503
+    DB_WORKERS: int = 16
+    HASH_WORKERS: int = 4
+    HASH_POOL: str = "process"
+    HASH_QUEUE_SIZE: int = 64
+    HASH_QUEUE_TIMEOUT: float = 5.0
+
+    # bcrypt cost factor for new hashes; stored hashes with another cost are
+    # rehashed at the owner's next successful login
+    BCRYPT_ROUNDS: int = 12
+
+    # Authentication caches
+    TOKEN_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    # Seconds a cached user row is trusted; bounds how long a change made by
+    # another process (e.g. app/utils/create_admin.py) goes unseen
+    PRINCIPAL_CACHE_TTL: float = 60.0
+
+    # Delta sync change log
+    TASK_CHANGES_RETENTION_DAYS: int = 30
+    TASK_CHANGES_MAX_BATCH: int = 1000
+
+    # Live task events (Server-Sent Events)
+    EVENT_QUEUE_SIZE: int = 256
+    EVENT_BROADCAST_LIMIT: int = 500
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+    EVENT_STREAM_MAX_SECONDS: float = 300.0
+
+    # Audit log writer
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    AUDIT_ENQUEUE_TIMEOUT: float = 2.0
+
+    # Task lists skip per-row response-model validation and are encoded
+    # directly (with orjson when installed); the JSON is identical either way
+    FAST_TASK_SERIALIZATION: bool = False
+
+    # Rendered task list / analytics responses, revalidated by ETag;
+    # MAX_ENTRIES=0 keeps the ETags but disables the cache
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_MAX_BYTES: int = 67108864
+
+    # Task search ranks at most this many of the newest matches per query
+    # (per shard), so very common words cost the same as rare ones; older
+    # matches cannot be paged to, and the response says so with "truncated"
+    SEARCH_RANK_WINDOW: int = 2000
+
+    # Prometheus-style metrics on /metrics (request, SQL, pool and cache
+    # figures); a non-empty METRICS_TOKEN requires "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+
+    # Request profiling: with PROFILING_ENABLED every request's stack is
+    # sampled every PROFILE_INTERVAL_MS and those slower than PROFILE_SLOW_MS
+    # are kept; PROFILING_HEADER lets admins profile one request with
+    # "X-Profile: 1". The last PROFILE_BUFFER_SIZE profiles are kept.
+    #
+    # Database connections time every SQL statement (InstrumentedConnection,
+    # app.metrics.SQL_TIMING) while any of METRICS_ENABLED, PROFILING_ENABLED
+    # or PROFILING_HEADER is on, so with the defaults they always do; turn all
+    # three off for plain sqlite3 connections. Read once at startup.
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: bool = True
+    PROFILE_SLOW_MS: float = 500.0
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_BUFFER_SIZE: int = 50
+    PROFILE_MAX_SQL: int = 1000
+
+    # Background jobs. Each runs every *_SECONDS plus a random delay of up to
+    # SCHEDULER_JITTER of its interval; with several server processes a
+    # database lease lets one of them run each job per interval, and
+    # SCHEDULER_ENABLED=false leaves the jobs to the other processes.
+    # Reminders go out REMINDER_WINDOW_HOURS before a task is due; each run
+    # flags at most SCHEDULER_BATCH_SIZE tasks per transaction
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_BATCH_SIZE: int = 500
+    OVERDUE_SWEEP_SECONDS: float = 60.0
+    REMINDER_SECONDS: float = 300.0
+    REMINDER_WINDOW_HOURS: float = 24.0
+    PRUNE_SECONDS: float = 3600.0
+
+    # Logging: default level, per-logger overrides ("app.services=DEBUG,uvicorn.access=WARNING"),
+    # "json" or "text" output, and 1-in-N sampling of DEBUG records per call site
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_FORMAT: str = "json"
+    LOG_DEBUG_SAMPLE_RATE: int = 100
+
     class Config:
         env_file = ".env"
- 
-settings = Settings()
\ No newline at end of file
+
+settings = Settings()
@@ -1,34 +1,329 @@
+import logging
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime
 import os
- 
-DATABASE_PATH = os.path.join(os.path.dirname(__file__), "..", "task_manager.db")
- 
-def get_db_connection():
-    """Create a database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
+from app.config import settings
+from app.metrics import db_fetch_seconds, db_statement_duration, sql_caller_var, sql_operation, SQL_TIMING, UNKNOWN_CALLER
+from app.profiling import profile_var
+from app.migrations import run_migrations, SHARD_MIGRATIONS
+
+DATABASE_PATH = settings.DATABASE_PATH or os.path.join(os.path.dirname(__file__), "..", "task_manager.db")
+
+STORAGE_BACKENDS = ("sqlite", "sharded")
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on attached databases
+MAX_SHARDS = 10
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """Apply the per-connection pragmas (run once when a connection is opened)"""
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {settings.DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{int(settings.DB_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings.DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA busy_timeout = {int(settings.DB_BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def shard_files() -> list:
+    """``(schema, path)`` of every task shard (none unless STORAGE_BACKEND is sharded)"""
+    if settings.STORAGE_BACKEND not in STORAGE_BACKENDS:
+        raise ValueError(f"STORAGE_BACKEND must be one of {STORAGE_BACKENDS}")
+    if settings.STORAGE_BACKEND != "sharded":
+        return []
+    if not 1 <= settings.SHARD_COUNT <= MAX_SHARDS:
+        raise ValueError(f"SHARD_COUNT must be between 1 and {MAX_SHARDS}")
+    base, extension = os.path.splitext(DATABASE_PATH)
+    return [(f"shard{index}", f"{base}.shard{index}{extension}") for index in range(settings.SHARD_COUNT)]
+
+
+def attach_shards(conn: sqlite3.Connection):
+    """Attach every task shard to ``conn``, with the same journaling as the main file"""
+    for schema, path in shard_files():
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+        conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+        conn.execute(f"PRAGMA {schema}.synchronous = {settings.DB_SYNCHRONOUS}")
     return conn
- 
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that records every statement in ``db_statement_duration_seconds``
+    and the row fetches after it in ``db_fetch_seconds_total``, labelled
+    with the service method that issued it, and adds the statement to the
+    request's profile when it is being profiled.
+    """
+
+    _caller = UNKNOWN_CALLER
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, time.perf_counter() - start)
+
+    def _record(self, sql: str, elapsed: float):
+        self._caller = caller = sql_caller_var.get()
+        db_statement_duration.observe((caller, sql_operation(sql)), elapsed)
+        profile = profile_var.get()
+        if profile is not None:
+            profile.add_statement(caller, sql, elapsed)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            db_fetch_seconds.inc((self._caller,), time.perf_counter() - start)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            db_fetch_seconds.inc((self._caller,), time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            db_fetch_seconds.inc((self._caller,), time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including ``conn.execute``'s) are ``InstrumentedCursor``"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def get_db_connection():
+    """Create a standalone (unpooled) database connection"""
+    factory = InstrumentedConnection if SQL_TIMING else sqlite3.Connection
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, factory=factory)
+    return attach_shards(configure_connection(conn))
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable SQLite connections.
+
+    Connections are opened lazily up to ``max_size`` and handed back to an
+    idle stack when released. While a thread holds a connection, nested
+    ``transaction()`` calls on that thread reuse it, so a service method and
+    the helpers it calls share one connection and one transaction.
+    """
+
+    def __init__(self, connect, max_size: int, timeout: float):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+        self._created = 0
+        self._acquired = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check a connection out of the pool, waiting up to ``timeout`` seconds"""
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        conn = None
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout}s"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            elapsed = time.perf_counter() - start
+            self._acquired += 1
+            if waited:
+                self._waits += 1
+                self._wait_total += elapsed
+                self._wait_max = max(self._wait_max, elapsed)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._created += 1
+
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """Return a connection to the pool (or close it if it is unusable)"""
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def current(self):
+        """Connection held by the calling thread, if any"""
+        return getattr(self._local, "conn", None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Yield the calling thread's connection, checking one out if needed.
+
+        Only the outermost block commits (or rolls back on error) and
+        returns the connection to the pool.
+        """
+        conn = self.current()
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.callbacks = []
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
+            raise
+        finally:
+            callbacks = self._local.callbacks
+            self._local.conn = None
+            self._local.callbacks = None
+            self.release(conn, discard=broken)
+
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback):
+        """
+        Run ``callback`` once the calling thread's transaction commits.
+        Callbacks are dropped on rollback; outside a transaction they run now.
+        """
+        if self.current() is None:
+            callback()
+        else:
+            self._local.callbacks.append(callback)
+
+    def close(self):
+        """Close idle connections and refuse new checkouts"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Pool size and wait-time statistics"""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "connections_created": self._created,
+                "acquisitions": self._acquired,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+pool = ConnectionPool(
+    get_db_connection,
+    max_size=settings.DB_POOL_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+)
+
+
 @contextmanager
 def get_db():
     """Context manager for database connections"""
-    conn = get_db_connection()
-    try:
+    with pool.transaction() as conn:
         yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
- 
+
+
+def after_commit(callback):
+    """Defer ``callback`` until the current transaction has committed"""
+    pool.after_commit(callback)
+
+
+def close_db():
+    """Release all pooled connections (called on application shutdown)"""
+    pool.close()
+
+
 def init_db():
     """Initialize database tables"""
     with get_db() as conn:
         cursor = conn.cursor()
-        
+
         # Users table with enhanced admin features
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -44,7 +339,7 @@ def init_db():
                 last_login TEXT
             )
         """)
-        
+
         # Tasks table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS tasks (
@@ -63,7 +358,7 @@ def init_db():
                 FOREIGN KEY (created_by) REFERENCES users(id)
             )
         """)
-        
+
         # Audit logs table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS audit_logs (
@@ -77,9 +372,22 @@ def init_db():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
         """)
-        
+
         conn.commit()
-        print("✅ Database initialized successfully")
- 
+
+        for version in run_migrations(conn):
+            logger.info("Applied schema migration %s", version)
+
+    # Each shard is its own file with its own migration history
+    for schema, path in shard_files():
+        shard = configure_connection(sqlite3.connect(path))
+        try:
+            for version in run_migrations(shard, SHARD_MIGRATIONS):
+                logger.info("Applied %s migration %s", schema, version)
+        finally:
+            shard.close()
+
+    logger.info("Database initialized at %s", DATABASE_PATH)
+
 # Initialize database on module import
-init_db()
\ No newline at end of file
+init_db()
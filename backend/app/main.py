@@ -1,7 +1,28 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+import logging
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, admin, user
-from app.database import init_db
+from app.logging_config import setup_logging, shutdown_logging
+
+# Before the app imports: importing app.database migrates the database and logs it
+setup_logging()
+
+from app.config import settings
+from app.metrics import CONTENT_TYPE, registry
+from app.middleware import MetricsMiddleware, ProfilingMiddleware, RequestIdMiddleware
+from app.routers import auth, admin, user, tasks
+from app.database import init_db, close_db, pool
+from app.services.sync_service import SyncService
+from app.services.token_service import TokenService
+from app.services.reminder_service import ReminderService
+from app.utils.events import event_hub
+from app.utils.audit_writer import audit_writer
+from app.utils.executors import shutdown_executors, start_hash_pool
+from app.utils.scheduler import scheduler
+ 
+logger = logging.getLogger(__name__)
  
 app = FastAPI(title="Smart Task Manager API", version="1.0.0")
  
@@ -12,18 +33,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "ETag", "X-Profile-Id"],
 )
+if settings.PROFILING_ENABLED or settings.PROFILING_HEADER:
+    # Inside RequestIdMiddleware, so profiles carry the request id
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestIdMiddleware)
+if settings.METRICS_ENABLED:
+    # Outermost, so its latency covers the other middleware too
+    app.add_middleware(MetricsMiddleware)
  
 # Include routers - IMPORTANT: Make sure these are here
 app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(user.router)
+app.include_router(tasks.router)
  
 @app.on_event("startup")
 async def startup_event():
     init_db()
-    print("✅ Application started successfully")
-    print("📋 API Documentation: http://localhost:8000/docs")
+    event_hub.bind(asyncio.get_running_loop())
+    audit_writer.start()
+    start_hash_pool()
+    TokenService.reload_denylist()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.add_job("overdue_sweep", settings.OVERDUE_SWEEP_SECONDS, ReminderService.sweep_overdue)
+        scheduler.add_job("due_reminders", settings.REMINDER_SECONDS, ReminderService.send_reminders)
+        scheduler.add_job("prune", settings.PRUNE_SECONDS, _prune)
+    # Every process keeps its own copy of the denylist, so this one is not shared
+    scheduler.add_job(
+        "token_denylist", settings.TOKEN_DENYLIST_REFRESH_SECONDS, TokenService.reload_denylist, shared=False
+    )
+    scheduler.start()
+    logger.info("Application started; API documentation at /docs")
+ 
+def _prune() -> dict:
+    """Drop change-log rows past retention and expired refresh tokens and revocations"""
+    return {"task_changes": SyncService.prune(), "tokens": TokenService.prune()}
+ 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await scheduler.stop()
+    event_hub.close()
+    shutdown_executors()
+    # Executors are drained first so every audit record they queued is flushed
+    audit_writer.stop()
+    close_db()
+    shutdown_logging()
  
 @app.get("/")
 async def root():
@@ -35,4 +91,15 @@ async def root():
  
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy", "database_pool": pool.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus text exposition of request, SQL, pool and cache metrics"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,308 @@
+"""
+In-process metrics in the Prometheus text exposition format (version 0.0.4).
+
+Counters, gauges and histograms are kept in plain dicts keyed by label
+values, guarded by one lock per metric, so recording a sample is a dict
+update. Figures that other components already track (connection pool,
+caches, audit writer, live events) are not duplicated: they are read from
+their ``stats()`` when ``/metrics`` is scraped.
+
+Recorded here:
+
+- ``http_*``: request counts, latency and in-flight requests, labelled by
+  route template (``MetricsMiddleware``)
+- ``db_*``: every SQL statement, labelled by the calling service method
+  (``InstrumentedConnection`` in ``app.database``, with service classes
+  marked by ``instrument_service``)
+"""
+import contextvars
+import functools
+import inspect
+import math
+import threading
+from bisect import bisect_left
+from app.config import settings
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric:
+    """A named family of samples; label values are passed as a tuple in ``labelnames`` order"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self):
+        """``(name, labelnames, labelvalues, value)`` for every sample"""
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, self.labelnames, labels, value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple = (), value: float = 0):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = HTTP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: tuple, value: float):
+        # Per-bucket (non-cumulative) counts; the +Inf bucket is the last slot
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        names = self.labelnames + ("le",)
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", names, labels + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.labelnames, labels, total
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+class Registry:
+    """Metrics plus collectors: callables returning extra families at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """
+        ``collector()`` returns ``(name, kind, documentation, samples)``
+        tuples, where ``samples`` is a list of ``(labels dict, value)``.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+        for collector in collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    rendered = _format_labels(tuple(labels), tuple(labels.values()))
+                    lines.append(f"{name}{rendered} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.",
+    ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the response body is sent).",
+    ("method", "route"), HTTP_BUCKETS
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("method",)
+))
+db_statement_duration = registry.register(Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time (to the first row for queries) by calling service method.",
+    ("caller", "operation"), SQL_BUCKETS
+))
+db_fetch_seconds = registry.register(Counter(
+    "db_fetch_seconds_total", "Time spent fetching query rows after execution, by calling service method.",
+    ("caller",)
+))
+
+
+# -- SQL caller labels ------------------------------------------------------
+
+UNKNOWN_CALLER = "other"
+
+# SQL statements are timed (database.InstrumentedConnection, and the service
+# labels below) when metrics or request profiles can use them: any of
+# METRICS_ENABLED, PROFILING_ENABLED or PROFILING_HEADER. Fixed at import.
+SQL_TIMING = settings.METRICS_ENABLED or settings.PROFILING_ENABLED or settings.PROFILING_HEADER
+
+# Service method whose SQL is being run ("TaskService.update_task"); copied
+# into worker threads by run_db along with the rest of the context
+sql_caller_var = contextvars.ContextVar("sql_caller", default=UNKNOWN_CALLER)
+
+
+def _labelled(func, label: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = sql_caller_var.set(label)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sql_caller_var.reset(token)
+    return wrapper
+
+
+def instrument_service(cls):
+    """
+    Class decorator: SQL run inside any of ``cls``'s synchronous static
+    methods is labelled ``Class.method`` (the innermost one when service
+    methods call each other). Async methods hand their database work to
+    synchronous ones, so they are left as they are.
+    """
+    if not SQL_TIMING:
+        return cls
+    for name, member in list(vars(cls).items()):
+        if not isinstance(member, staticmethod):
+            continue
+        func = member.__func__
+        if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+            continue
+        setattr(cls, name, staticmethod(_labelled(func, f"{cls.__name__}.{name}")))
+    return cls
+
+
+# SQL text -> operation; statements are mostly module constants or built
+# from a few templates, and str hashes are cached, so a hit is one lookup
+_operations = {}
+_MAX_OPERATIONS = 4096
+
+
+def sql_operation(sql: str) -> str:
+    """First keyword of a statement: SELECT, INSERT, UPDATE, WITH, PRAGMA, ..."""
+    operation = _operations.get(sql)
+    if operation is None:
+        keyword = sql.lstrip()[:8].split(None, 1)
+        operation = keyword[0].upper() if keyword else "OTHER"
+        if len(_operations) >= _MAX_OPERATIONS:
+            _operations.clear()
+        _operations[sql] = operation
+    return operation
+
+
+# -- Scrape-time collectors --------------------------------------------------
+
+def _collect_runtime():
+    # Imported here: app.database imports this module for the SQL hooks
+    from app.database import pool
+    from app.utils.audit_writer import audit_writer
+    from app.utils.auth_cache import cache_stats
+    from app.utils.events import event_hub
+    from app.utils.response_cache import response_cache
+    from app.utils.scheduler import scheduler
+
+    pool_stats = pool.stats()
+    caches = {**cache_stats(), "response_cache": response_cache.stats()}
+    audit = audit_writer.stats()
+    events = event_hub.stats()
+    jobs = scheduler.stats()
+
+    def per_cache(key):
+        return [({"cache": name.removesuffix("_cache")}, stats[key]) for name, stats in caches.items()]
+
+    return [
+        ("db_pool_connections", "gauge", "Pooled database connections by state.", [
+            ({"state": "in_use"}, pool_stats["in_use"]),
+            ({"state": "idle"}, pool_stats["idle"]),
+        ]),
+        ("db_pool_max_connections", "gauge", "Connection pool size limit.", [({}, pool_stats["max_size"])]),
+        ("db_pool_acquisitions_total", "counter", "Connections checked out of the pool.",
+         [({}, pool_stats["acquisitions"])]),
+        ("db_pool_waits_total", "counter", "Checkouts that had to wait for a connection.",
+         [({}, pool_stats["waits"])]),
+        ("db_pool_timeouts_total", "counter", "Checkouts that timed out.", [({}, pool_stats["timeouts"])]),
+        ("db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection.",
+         [({}, pool_stats["wait_time_total_ms"] / 1000)]),
+        ("cache_hits_total", "counter", "Cache hits.", per_cache("hits")),
+        ("cache_misses_total", "counter", "Cache misses.", per_cache("misses")),
+        ("cache_evictions_total", "counter", "Cache evictions.", per_cache("evictions")),
+        ("cache_hit_ratio", "gauge", "Hits over lookups since startup.", per_cache("hit_rate")),
+        ("cache_entries", "gauge", "Entries currently cached.", per_cache("size")),
+        ("audit_queue_depth", "gauge", "Audit records waiting to be written.", [({}, audit["queued"])]),
+        ("audit_records_dropped_total", "counter", "Audit records dropped because the queue was full.",
+         [({}, audit["dropped"])]),
+        ("event_subscribers", "gauge", "Open live event streams.", [({}, events["subscribers"])]),
+        ("scheduler_job_runs_total", "counter", "Background job runs in this process.",
+         [({"job": name}, stats["runs"]) for name, stats in jobs.items()]),
+        ("scheduler_job_failures_total", "counter", "Background job runs that raised.",
+         [({"job": name}, stats["failures"]) for name, stats in jobs.items()]),
+        ("scheduler_job_skips_total", "counter", "Shared job runs left to another process.",
+         [({"job": name}, stats["skipped"]) for name, stats in jobs.items()]),
+        ("scheduler_job_last_duration_seconds", "gauge", "Duration of the last run in this process.",
+         [({"job": name}, stats["last_duration_ms"] / 1000) for name, stats in jobs.items()
+          if stats["last_duration_ms"] is not None]),
+    ]
+
+
+registry.add_collector(_collect_runtime)
@@ -0,0 +1,196 @@
+"""
+Pure ASGI middleware (no per-request task or body buffering, so streaming
+responses pass straight through).
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+import uuid
+from fastapi import HTTPException
+from app.config import settings
+from app.logging_config import request_id_var
+from app.metrics import http_request_duration, http_requests, http_requests_in_flight
+from app.profiling import RequestProfile, profile_store, profile_var, sampler
+from app.utils.dependencies import get_current_user, require_admin
+
+access_logger = logging.getLogger("app.access")
+
+REQUEST_ID_HEADER = b"x-request-id"
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Anything else is counted as "OTHER" so clients cannot mint label values
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# Client-supplied ids are echoed back, so only short, plain tokens are accepted
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Give every HTTP request an id (the client's ``X-Request-ID`` if valid,
+    otherwise a new one), expose it to log records through ``request_id_var``
+    and return it in the ``X-Request-ID`` response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info(
+                    "%s %s %s",
+                    scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    }
+                )
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Count, time and track in-flight HTTP requests in ``app.metrics``. The
+    route label is the matched route's path template
+    (``/api/admin/tasks/{task_id}``), read from the scope after routing, so
+    label cardinality stays bounded; requests no route handled (404s, CORS
+    preflights) are labelled ``unmatched``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        http_requests_in_flight.inc((method,))
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe((method, template), time.perf_counter() - start)
+            http_requests.inc((method, template, str(status_code)))
+            http_requests_in_flight.dec((method,))
+
+
+async def _admin_profile_requested(scope) -> bool:
+    """
+    ``X-Profile: 1`` (or ``true``) sent with an admin's bearer token. The
+    token goes through the same checks as the ``require_admin`` routes:
+    signature and expiry, the revocation list, the user row for older
+    tokens, and the role.
+    """
+    requested = False
+    authorization = None
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            requested = value.strip().lower() in (b"1", b"true", b"yes")
+        elif name == b"authorization":
+            authorization = value
+    if not requested or authorization is None:
+        return False
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        await require_admin(await get_current_user(token))
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests with ``app.profiling``: every request while
+    ``PROFILING_ENABLED`` (kept when slower than ``PROFILE_SLOW_MS``), and
+    any admin request sent with ``X-Profile: 1`` (always kept; its id is
+    returned in ``X-Profile-Id``). Other requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = settings.PROFILING_HEADER and await _admin_profile_requested(scope)
+        if not (forced or settings.PROFILING_ENABLED):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            profile_store.next_id(), scope["method"], scope["path"], request_id_var.get(), forced,
+            asyncio.current_task(), threading.get_ident()
+        )
+        token = profile_var.set(profile)
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if forced:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (PROFILE_ID_HEADER, str(profile.id).encode("latin-1"))
+                    ]
+            await send(message)
+
+        sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop(profile)
+            profile_var.reset(token)
+            route = scope.get("route")
+            profile.finish(getattr(route, "path", None), status_code)
+            if forced or profile.duration_ms >= settings.PROFILE_SLOW_MS:
+                profile_store.add(profile)
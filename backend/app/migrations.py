@@ -0,0 +1,432 @@
+"""
+Versioned schema migrations.
+
+Each migration is a ``(version, name, steps)`` tuple. A step is either a SQL
+string or a callable taking a cursor. Applied versions are recorded in the
+``schema_migrations`` table, so every migration runs exactly once per
+database no matter how many times ``run_migrations`` is called.
+"""
+from datetime import datetime
+
+
+def _backfill_due_ts(cursor):
+    """Parse every stored due_date once; rows that cannot be parsed keep a NULL due_ts"""
+    # Imported here: app.utils pulls in app.database, which imports this module
+    from app.utils.dates import to_timestamp
+
+    cursor.execute("SELECT id, due_date FROM tasks WHERE due_date IS NOT NULL")
+    rows = []
+    for task_id, due_date in cursor.fetchall():
+        due_ts = to_timestamp(due_date)
+        if due_ts is not None:
+            rows.append((due_ts, task_id))
+    cursor.executemany("UPDATE tasks SET due_ts = ? WHERE id = ?", rows)
+
+
+TASK_COUNTERS_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_counters (
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (scope, key)
+    ) WITHOUT ROWID
+"""
+
+# Shared by the main database (migration 4) and every task shard
+TASK_CHANGE_LOG_STEPS = [
+    # One row per task write, numbered by a monotonic sequence. Deletes
+    # leave a row too, which is how clients learn about tombstones.
+    """
+    CREATE TABLE IF NOT EXISTS task_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        assigned_to INTEGER,
+        previous_assigned_to INTEGER,
+        changed_at TEXT NOT NULL
+    )
+    """,
+    # Per-user change feeds: WHERE assigned_to = ? AND seq > ?
+    """
+    CREATE INDEX IF NOT EXISTS idx_task_changes_assigned
+    ON task_changes (assigned_to, seq)
+    """,
+    # Tasks reassigned away from a user must still reach that user
+    """
+    CREATE INDEX IF NOT EXISTS idx_task_changes_previous
+    ON task_changes (previous_assigned_to, seq)
+    WHERE previous_assigned_to IS NOT NULL
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, assigned_to, previous_assigned_to, changed_at)
+        VALUES (NEW.id, 'upsert', NEW.assigned_to, NULL, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_update
+    AFTER UPDATE ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, assigned_to, previous_assigned_to, changed_at)
+        VALUES (
+            NEW.id, 'upsert', NEW.assigned_to,
+            CASE WHEN OLD.assigned_to IS NOT NEW.assigned_to THEN OLD.assigned_to END,
+            strftime('%Y-%m-%dT%H:%M:%f', 'now')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, assigned_to, previous_assigned_to, changed_at)
+        VALUES (OLD.id, 'delete', OLD.assigned_to, NULL, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+    END
+    """,
+]
+
+# Full-text index over task titles and descriptions, shared by the main
+# database (migration 8) and every task shard. External content: the index
+# stores no copy of the text and reads it from ``tasks`` for snippets.
+TASK_SEARCH_STEPS = [
+    # Diacritics are folded ("cafe" finds "café"); the prefix indexes keep
+    # short search-as-you-type prefixes from scanning whole term ranges
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4 5'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    # Updates write every column, so only real text changes are reindexed
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update
+    AFTER UPDATE OF title, description ON tasks
+    WHEN OLD.title IS NOT NEW.title OR OLD.description IS NOT NEW.description
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    END
+    """,
+    # Index the tasks stored before the triggers existed
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+
+# Due-date notifications, shared by the main database (migration 10) and
+# every task shard. The scheduled jobs flag each task once: when it turns
+# overdue and when it comes within the reminder window. Partial indexes
+# hold only the tasks still waiting for a flag, so a sweep reads the newly
+# due tasks and nothing else.
+TASK_DUE_NOTIFICATION_STEPS = [
+    "ALTER TABLE tasks ADD COLUMN overdue_marked_at TEXT",
+    "ALTER TABLE tasks ADD COLUMN reminder_sent_at TEXT",
+    # Reminder flags are bookkeeping that clients never see, so the change
+    # log now ignores updates that only touch reminder_sent_at. Dropped
+    # before the backfill, which must not log a change per overdue task.
+    "DROP TRIGGER IF EXISTS trg_tasks_change_update",
+    # Tasks already overdue were not newly overdue when the sweep started
+    """
+    UPDATE tasks SET overdue_marked_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')
+    WHERE status != 'done' AND due_ts IS NOT NULL
+    AND due_ts < CAST(strftime('%s', 'now') AS INTEGER)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_update
+    AFTER UPDATE OF title, description, status, priority, due_date, due_ts,
+        assigned_to, updated_at, completed_at, overdue_marked_at ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, assigned_to, previous_assigned_to, changed_at)
+        VALUES (
+            NEW.id, 'upsert', NEW.assigned_to,
+            CASE WHEN OLD.assigned_to IS NOT NEW.assigned_to THEN OLD.assigned_to END,
+            strftime('%Y-%m-%dT%H:%M:%f', 'now')
+        );
+    END
+    """,
+    # Overdue sweep: WHERE status != 'done' AND overdue_marked_at IS NULL AND due_ts < now
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_overdue_pending
+    ON tasks (due_ts) WHERE status != 'done' AND overdue_marked_at IS NULL AND due_ts IS NOT NULL
+    """,
+    # Reminders: WHERE ... AND reminder_sent_at IS NULL AND due_ts BETWEEN now AND now + window
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_reminder_pending
+    ON tasks (due_ts) WHERE status != 'done' AND reminder_sent_at IS NULL AND due_ts IS NOT NULL
+    """,
+]
+
+
+MIGRATIONS = [
+    (1, "secondary indexes for task and audit access paths", [
+        # TaskService.get_all_tasks for a user: WHERE assigned_to = ? ORDER BY created_at DESC
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_assigned_created
+        ON tasks (assigned_to, created_at)
+        """,
+        # Admin task list: ORDER BY created_at DESC
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_created
+        ON tasks (created_at)
+        """,
+        # Status / priority breakdowns and filters
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_priority
+        ON tasks (status, priority)
+        """,
+        # Overdue lookups only ever consider open tasks
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_open_due
+        ON tasks (due_date) WHERE status != 'done'
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_audit_logs_entity
+        ON audit_logs (entity_type, entity_id)
+        """,
+    ]),
+    (2, "materialized task counters", [
+        TASK_COUNTERS_TABLE,
+        "DELETE FROM task_counters",
+        """
+        INSERT INTO task_counters (scope, key, count)
+        SELECT 'status', status, COUNT(*) FROM tasks GROUP BY status
+        """,
+        """
+        INSERT INTO task_counters (scope, key, count)
+        SELECT 'priority', priority, COUNT(*) FROM tasks GROUP BY priority
+        """,
+        """
+        INSERT INTO task_counters (scope, key, count)
+        SELECT 'open_priority', priority, COUNT(*) FROM tasks
+        WHERE status != 'done' GROUP BY priority
+        """,
+        """
+        INSERT INTO task_counters (scope, key, count)
+        SELECT 'assignee', COALESCE(CAST(assigned_to AS TEXT), 'none'), COUNT(*)
+        FROM tasks GROUP BY assigned_to
+        """,
+    ]),
+    (3, "index for status-filtered task pages", [
+        # Keyset pages filtered by status: WHERE status = ? ORDER BY created_at DESC, id DESC
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_created
+        ON tasks (status, created_at)
+        """,
+    ]),
+    (4, "task change log for delta sync", TASK_CHANGE_LOG_STEPS),
+    (5, "index for audit log queries by user", [
+        # Audit pages filtered by user: WHERE user_id = ? ORDER BY id DESC
+        """
+        CREATE INDEX IF NOT EXISTS idx_audit_logs_user
+        ON audit_logs (user_id)
+        """,
+    ]),
+    (6, "normalized due dates as UTC epoch seconds", [
+        "ALTER TABLE tasks ADD COLUMN due_ts INTEGER",
+        _backfill_due_ts,
+        # Overdue checks: WHERE status != 'done' AND due_ts < now
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_open_due_ts
+        ON tasks (due_ts) WHERE status != 'done'
+        """,
+        # Due-date range filters over all tasks
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_ts
+        ON tasks (due_ts)
+        """,
+        # Superseded by the due_ts indexes; nothing filters on the raw text anymore
+        "DROP INDEX IF EXISTS idx_tasks_open_due",
+    ]),
+    (7, "index for per-user open due dates", [
+        # ETag versions: next open due date among a user's tasks
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_assigned_open_due_ts
+        ON tasks (assigned_to, due_ts) WHERE status != 'done'
+        """,
+    ]),
+    (8, "full-text search over task titles and descriptions", TASK_SEARCH_STEPS),
+    (9, "refresh tokens and access token revocations", [
+        # Only a SHA-256 of each refresh token is stored. Tokens of one login
+        # share a session_id; rotation marks the old token used, and a used
+        # token coming back revokes the whole session.
+        """
+        CREATE TABLE IF NOT EXISTS refresh_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_hash TEXT NOT NULL UNIQUE,
+            session_id TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            expires_at INTEGER NOT NULL,
+            used_at TEXT,
+            revoked_at TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_session ON refresh_tokens (session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens (user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires ON refresh_tokens (expires_at)",
+        # Revoked sessions ('session', session id) and per-user cutoffs
+        # ('user', user id: access tokens issued before revoked_at). Servers
+        # mirror the unexpired rows in memory, reading new ones by id.
+        """
+        CREATE TABLE IF NOT EXISTS token_revocations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            revoked_at REAL NOT NULL,
+            expires_at INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_token_revocations_expires ON token_revocations (expires_at)",
+    ]),
+    (10, "overdue and reminder flags for scheduled task notifications", TASK_DUE_NOTIFICATION_STEPS),
+    (11, "scheduled job leases and last runs", [
+        # One row per shared background job (app.utils.scheduler). A run
+        # claims the row by setting an unexpired lease, which only succeeds
+        # once the previous run is an interval old; times are epoch seconds.
+        """
+        CREATE TABLE IF NOT EXISTS scheduled_jobs (
+            name TEXT PRIMARY KEY,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            last_started_at REAL,
+            last_finished_at REAL,
+            last_duration_ms REAL,
+            last_result TEXT,
+            last_error TEXT,
+            runs INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+    ]),
+    (12, "single-use tickets for event streams", [
+        # SHA-256 of each ticket and the verified access token claims it
+        # stands for; redeeming deletes the row, so a ticket works once
+        """
+        CREATE TABLE IF NOT EXISTS stream_tickets (
+            ticket_hash TEXT PRIMARY KEY,
+            claims TEXT NOT NULL,
+            expires_at INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stream_tickets_expires ON stream_tickets (expires_at)",
+    ]),
+]
+
+
+# Schema of a task shard (STORAGE_BACKEND=sharded): the task tables only.
+# Users live in the main database, so assignees carry no foreign key here.
+SHARD_MIGRATIONS = [
+    (1, "task tables for a storage shard", [
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL DEFAULT 'todo',
+            priority TEXT NOT NULL DEFAULT 'medium',
+            due_date TEXT,
+            assigned_to INTEGER,
+            created_by INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            completed_at TEXT,
+            due_ts INTEGER
+        )
+        """,
+        # Ids are handed out per shard (see ShardedTaskRepository), so they
+        # stay unique across shards and survive moves between them
+        """
+        CREATE TABLE IF NOT EXISTS task_ids (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO task_ids (id, last) VALUES (1, 0)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_assigned_created ON tasks (assigned_to, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks (status, priority)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_open_due_ts ON tasks (due_ts) WHERE status != 'done'",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_ts ON tasks (due_ts)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_assigned_open_due_ts
+        ON tasks (assigned_to, due_ts) WHERE status != 'done'
+        """,
+        TASK_COUNTERS_TABLE,
+        *TASK_CHANGE_LOG_STEPS,
+    ]),
+    (2, "full-text search over task titles and descriptions", TASK_SEARCH_STEPS),
+    (3, "overdue and reminder flags for scheduled task notifications", TASK_DUE_NOTIFICATION_STEPS),
+]
+
+
+def current_version(conn) -> int:
+    """Highest migration version applied to this database"""
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def run_migrations(conn, migrations: list = MIGRATIONS):
+    """Apply every pending migration, each in its own transaction"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+    applied = []
+    for version, name, steps in migrations:
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent workers
+        # starting together serialize here instead of racing on the same DDL.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = conn.execute(
+                "SELECT 1 FROM schema_migrations WHERE version = ?", (version,)
+            ).fetchone()
+            if done:
+                conn.rollback()
+                continue
+
+            cursor = conn.cursor()
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.utcnow().isoformat())
+            )
+            conn.commit()
+            applied.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+
+    return applied
@@ -1,4 +1,5 @@
 from .user import User, UserInDB
 from .task import Task
+from .audit import AuditLog
  
-__all__ = ['User', 'UserInDB', 'Task']
\ No newline at end of file
+__all__ = ['User', 'UserInDB', 'Task', 'AuditLog']
\ No newline at end of file
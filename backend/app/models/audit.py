@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class AuditLog(BaseModel):
+    id: Optional[int] = None
+    user_id: int
+    action: str
+    entity_type: str
+    entity_id: int
+    details: Optional[str] = None
+    created_at: Optional[datetime] = None
@@ -0,0 +1,236 @@
+"""
+Sampling profiler for individual HTTP requests.
+
+``ProfilingMiddleware`` (in ``app.middleware``) attaches a ``RequestProfile``
+to a request when profiling is switched on (``PROFILING_ENABLED``) or an
+admin sends ``X-Profile: 1``. While it runs, one shared sampler thread
+records the stack of every thread working for it every
+``PROFILE_INTERVAL_MS``:
+
+- the event loop thread, only while the request's own task is running there
+- database workers (and hashing threads with ``HASH_POOL=thread``) while
+  they run ``run_db`` / ``run_hash`` work for the request (registered by
+  ``app.utils.executors``)
+
+Stacks are kept in collapsed form (``root;caller;callee count``), which
+flamegraph.pl, speedscope and inferno read directly. The request's SQL
+statements and their timings are recorded alongside by the database layer.
+Requests slower than ``PROFILE_SLOW_MS`` (and every admin-requested one)
+land in a ring buffer of the last ``PROFILE_BUFFER_SIZE`` profiles.
+
+With profiling off, requests carry no profile and the hooks reduce to a
+header scan per request and a context variable lookup per SQL statement.
+"""
+import asyncio
+import contextvars
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from app.config import settings
+
+# Profile of the request being handled; copied into worker threads by run_db
+profile_var = contextvars.ContextVar("profile", default=None)
+
+# Statement text kept per SQL entry
+MAX_SQL_TEXT = 500
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse(frame) -> str:
+    """``outermost;...;innermost`` for the stack ending at ``frame``"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class RequestProfile:
+    """Stack samples and SQL timings of one request"""
+
+    def __init__(self, profile_id: int, method: str, path: str, request_id, forced: bool, task, loop_thread: int):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.request_id = request_id
+        self.forced = forced
+        self.started_at = datetime.utcnow()
+        self.start = time.perf_counter()
+        self.stacks = Counter()
+        self.samples = 0
+        self.sql = []
+        self.sql_dropped = 0
+        self.sql_seconds = 0.0
+        self._lock = threading.Lock()
+        # thread id -> the task that must be current there (event loop), or None
+        self._threads = {loop_thread: task}
+
+    def threads(self) -> list:
+        with self._lock:
+            return list(self._threads.items())
+
+    def run_in_thread(self, func, *args, **kwargs):
+        """Call ``func`` with the calling worker thread registered for sampling"""
+        thread = threading.get_ident()
+        with self._lock:
+            self._threads[thread] = None
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._threads.pop(thread, None)
+
+    def add_sample(self, stack: str):
+        with self._lock:
+            self.stacks[stack] += 1
+            self.samples += 1
+
+    def add_statement(self, caller: str, sql: str, seconds: float):
+        """Record one SQL statement (called from the database layer)"""
+        with self._lock:
+            self.sql_seconds += seconds
+            if len(self.sql) >= settings.PROFILE_MAX_SQL:
+                self.sql_dropped += 1
+                return
+            self.sql.append({
+                "caller": caller,
+                "sql": " ".join(sql.split())[:MAX_SQL_TEXT],
+                "offset_ms": round((time.perf_counter() - seconds - self.start) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3),
+            })
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "request_id": self.request_id,
+            "forced": self.forced,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "sql_statements": len(self.sql) + self.sql_dropped,
+            "sql_total_ms": round(self.sql_seconds * 1000, 3),
+        }
+
+    def details(self) -> dict:
+        with self._lock:
+            stacks = self.stacks.most_common()
+            sql = list(self.sql)
+        return {
+            **self.summary(),
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "sql_dropped": self.sql_dropped,
+            "sql": sql,
+            "stacks": [{"stack": stack, "samples": count} for stack, count in stacks],
+        }
+
+    def collapsed(self) -> str:
+        """Flame-graph input: one ``stack count`` line per distinct stack"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def finish(self, route, status: int):
+        self.route = route
+        self.status = status
+        self.duration_ms = round((time.perf_counter() - self.start) * 1000, 3)
+
+
+class StackSampler:
+    """
+    One daemon thread that samples every active profile, started on first
+    use and parked on an event while nothing is being profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, profile: RequestProfile):
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: RequestProfile):
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                profiles = list(self._active)
+                if not profiles:
+                    self._wake.clear()
+            if not profiles:
+                self._wake.wait()
+                continue
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                for thread, task in profile.threads():
+                    frame = frames.get(thread)
+                    if frame is None or thread == me:
+                        continue
+                    # The loop thread counts only while this request's task runs on it
+                    if task is not None and asyncio.current_task(task.get_loop()) is not task:
+                        continue
+                    profile.add_sample(collapse(frame))
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """Ring buffer of the most recent kept profiles"""
+
+    def __init__(self, size: int):
+        self._profiles = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> list:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [profile.summary() for profile in reversed(profiles)]
+
+    def get(self, profile_id: int):
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._profiles)
+            self._profiles.clear()
+        return count
+
+
+sampler = StackSampler(settings.PROFILE_INTERVAL_MS / 1000)
+profile_store = ProfileStore(settings.PROFILE_BUFFER_SIZE)
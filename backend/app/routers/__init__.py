@@ -1,3 +1,3 @@
-from . import auth, admin, user
+from . import auth, admin, user, tasks
  
-__all__ = ['auth', 'admin', 'user']
\ No newline at end of file
+__all__ = ['auth', 'admin', 'user', 'tasks']
\ No newline at end of file
@@ -1,10 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+import io
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse,
+    TaskBulkUpdateItem, TaskBulkReassign, TaskBulkDelete, BulkResponse, MAX_BULK_ITEMS
+)
 from app.services.task_service import TaskService
 from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.audit_service import AuditService
+from app.schemas.audit import AuditLogResponse
 from app.utils.dependencies import require_admin, get_current_user
-from app.database import get_db
+from app.utils.executors import run_db
+from app.database import get_db, pool
+from app.utils.auth_cache import cache_stats
+from app.utils.events import event_hub
+from app.utils.audit_writer import audit_writer
+from app.utils.token_denylist import token_denylist
+from app.utils.scheduler import scheduler
+from app.config import settings
+from app.serialization import task_rows, render_task_page
+from app.utils.response_cache import cached_response, response_cache
+from app.profiling import profile_store
  
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
  
@@ -12,17 +33,79 @@ router = APIRouter(prefix="/api/admin", tags=["Admin"])
 async def create_task(task: TaskCreate, current_user: dict = Depends(require_admin)):
     """Create a new task (Admin only)"""
     task_dict = task.model_dump()
-    return TaskService.create_task(task_dict, current_user["id"])
+    return await run_db(TaskService.create_task, task_dict, current_user["id"])
+ 
+# Bulk routes are declared before /tasks/{task_id} so "bulk" is not parsed as an id
+@router.post("/tasks/bulk", response_model=BulkResponse)
+async def bulk_create_tasks(
+    tasks: List[TaskCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    current_user: dict = Depends(require_admin)
+):
+    """Create many tasks in one transaction (Admin only)"""
+    items = [task.model_dump() for task in tasks]
+    return await run_db(TaskService.bulk_create_tasks, items, current_user["id"])
+ 
+@router.put("/tasks/bulk", response_model=BulkResponse)
+async def bulk_update_tasks(
+    tasks: List[TaskBulkUpdateItem] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    current_user: dict = Depends(require_admin)
+):
+    """Update many tasks in one transaction (Admin only)"""
+    items = [task.model_dump() for task in tasks]
+    return await run_db(TaskService.bulk_update_tasks, items, current_user["id"])
+ 
+@router.post("/tasks/bulk/reassign", response_model=BulkResponse)
+async def bulk_reassign_tasks(request: TaskBulkReassign, current_user: dict = Depends(require_admin)):
+    """Reassign many tasks in one transaction (Admin only)"""
+    return await run_db(TaskService.bulk_reassign_tasks, request.task_ids, request.assigned_to, current_user["id"])
+ 
+@router.post("/tasks/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_tasks(request: TaskBulkDelete, current_user: dict = Depends(require_admin)):
+    """Delete many tasks in one transaction (Admin only)"""
+    return await run_db(TaskService.bulk_delete_tasks, request.task_ids, current_user["id"])
  
 @router.get("/tasks", response_model=List[TaskResponse])
-async def get_all_tasks(current_user: dict = Depends(require_admin)):
-    """Get all tasks (Admin only)"""
-    return TaskService.get_all_tasks(role="admin")
+async def get_all_tasks(
+    request: Request,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(require_admin)
+):
+    """Get all tasks (Admin only)
+
+    Pass ``limit`` for keyset pagination; the cursor of the next page is
+    returned in the ``X-Next-Cursor`` header. Responses carry an ETag;
+    send it back in ``If-None-Match`` to get 304 while nothing changed.
+    """
+    fast = settings.FAST_TASK_SERIALIZATION
+
+    def render():
+        page = TaskService.list_tasks(
+            role="admin",
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to,
+            due_after=due_after.isoformat() if due_after else None,
+            due_before=due_before.isoformat() if due_before else None,
+            overdue=overdue,
+            limit=limit,
+            cursor=cursor,
+            convert_rows=task_rows if fast else None
+        )
+        return render_task_page(page, fast)
+
+    return await cached_response(request, "admin.tasks", current_user, render)
  
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: int, current_user: dict = Depends(require_admin)):
     """Get a specific task (Admin only)"""
-    return TaskService.get_task_by_id(task_id)
+    return await run_db(TaskService.get_task_by_id, task_id)
  
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
@@ -32,23 +115,179 @@ async def update_task(
 ):
     """Update a task (Admin only)"""
     task_dict = {k: v for k, v in task.model_dump().items() if v is not None}
-    return TaskService.update_task(task_id, task_dict, current_user["id"], "admin")
+    return await run_db(TaskService.update_task, task_id, task_dict, current_user["id"], "admin")
  
 @router.delete("/tasks/{task_id}")
 async def delete_task(task_id: int, current_user: dict = Depends(require_admin)):
     """Delete a task (Admin only)"""
-    return TaskService.delete_task(task_id)
+    return await run_db(TaskService.delete_task, task_id, current_user["id"])
  
 @router.get("/analytics")
-async def get_analytics(current_user: dict = Depends(require_admin)):
-    """Get analytics data (Admin only)"""
-    return AnalyticsService.get_analytics()
+async def get_analytics(
+    request: Request,
+    mode: str = Query("full", pattern="^(full|summary)$"),
+    preview: int = Query(5, ge=0, le=50),
+    current_user: dict = Depends(require_admin)
+):
+    """Get analytics data (Admin only)
+
+    ``mode=summary`` returns counts plus ``preview`` tasks per category
+    instead of embedding every task list.
+    """
+    def render():
+        return _json_body(AnalyticsService.get_analytics(mode=mode, preview_size=preview)), {}
+
+    return await cached_response(request, "admin.analytics", current_user, render)
+ 
+@router.get("/analytics/tasks/{category}")
+async def get_analytics_tasks(
+    request: Request,
+    category: str,
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    assigned_to: Optional[int] = None,
+    current_user: dict = Depends(require_admin)
+):
+    """Paginated task list for one analytics category (Admin only)"""
+    def render():
+        return _json_body(AnalyticsService.get_category_tasks(category, limit, offset, assigned_to)), {}
+
+    return await cached_response(request, f"admin.analytics.{category}", current_user, render)
+ 
+def _json_body(content) -> bytes:
+    # What FastAPI renders for a route without a response_model
+    return JSONResponse(jsonable_encoder(content)).body
  
 @router.get("/users")
 async def get_all_users(current_user: dict = Depends(require_admin)):
     """Get all users (Admin only)"""
+    return await run_db(_list_users)
+ 
+def _list_users():
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT id, name, email, role, created_at FROM users ORDER BY created_at DESC")
         users = [dict(row) for row in cursor.fetchall()]
         return users
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+ 
+def _export_response(table: str, filename: str, export_format: str, after_id: int):
+    return StreamingResponse(
+        ExportService.stream(table, export_format, after_id),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+ 
+@router.get("/export/tasks")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: int = Query(0, ge=0),
+    current_user: dict = Depends(require_admin)
+):
+    """Stream every task as NDJSON or CSV, resuming after ``after_id`` (Admin only)"""
+    return _export_response("tasks", "tasks", format, after_id)
+ 
+@router.get("/export/audit")
+async def export_audit_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: int = Query(0, ge=0),
+    current_user: dict = Depends(require_admin)
+):
+    """Stream the audit log as NDJSON or CSV, resuming after ``after_id`` (Admin only)"""
+    return _export_response("audit_logs", "audit_logs", format, after_id)
+ 
+@router.post("/import/tasks")
+async def import_tasks(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    current_user: dict = Depends(require_admin)
+):
+    """Import tasks from an uploaded CSV or NDJSON file (Admin only)
+
+    The format defaults to the file extension. Returns counts and a
+    per-row error report; valid rows are imported even if others fail.
+    """
+    import_format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return await run_db(ImportService.import_tasks, stream, import_format, current_user["id"])
+ 
+@router.get("/audit", response_model=List[AuditLogResponse])
+async def get_audit_logs(
+    response: Response,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(require_admin)
+):
+    """Audit records, newest first, filtered by entity and/or user (Admin only)"""
+    page = await run_db(
+        AuditService.list_logs,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=action,
+        limit=limit,
+        cursor=cursor
+    )
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["logs"]
+ 
+@router.get("/system")
+async def get_system_stats(current_user: dict = Depends(require_admin)):
+    """Connection pool, cache, live event, audit writer and token denylist statistics (Admin only)"""
+    return {
+        "database_pool": pool.stats(),
+        "caches": cache_stats(),
+        "events": event_hub.stats(),
+        "audit_writer": audit_writer.stats(),
+        "response_cache": response_cache.stats(),
+        "token_denylist": token_denylist.stats()
+    }
+ 
+@router.get("/jobs")
+async def get_jobs(current_user: dict = Depends(require_admin)):
+    """
+    Background jobs: the shared jobs' lease and last run as recorded by
+    whichever server process ran them, and this process's own runs (Admin only)
+    """
+    return {
+        "shared": await run_db(scheduler.job_states),
+        "this_process": scheduler.stats()
+    }
+ 
+@router.get("/profiles")
+async def list_profiles(current_user: dict = Depends(require_admin)):
+    """Kept request profiles, newest first (Admin only)"""
+    return {
+        "profiling_enabled": settings.PROFILING_ENABLED,
+        "slow_ms": settings.PROFILE_SLOW_MS,
+        "interval_ms": settings.PROFILE_INTERVAL_MS,
+        "profiles": profile_store.list()
+    }
+ 
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    One profile with its SQL statements and sampled stacks (Admin only).
+    ``format=collapsed`` returns the stacks as flame-graph input.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return Response(content=profile.collapsed(), media_type="text/plain")
+    return profile.details()
+ 
+@router.delete("/profiles")
+async def clear_profiles(current_user: dict = Depends(require_admin)):
+    """Drop every kept profile (Admin only)"""
+    return {"cleared": profile_store.clear()}
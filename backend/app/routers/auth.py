@@ -1,14 +1,18 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from app.schemas.auth import UserRegister, Token
+from app.schemas.auth import UserRegister, Token, RefreshRequest, LogoutRequest
 from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
+from app.utils.dependencies import get_optional_user
+from app.utils.executors import run_db
  
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
  
 @router.post("/register", response_model=dict)
 async def register(user_data: UserRegister):
     """Register a new user"""
-    return AuthService.register_user(
+    return await AuthService.register(
         name=user_data.name,
         email=user_data.email,
         password=user_data.password,
@@ -18,7 +22,27 @@ async def register(user_data: UserRegister):
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login with username (email) and password"""
-    return AuthService.authenticate_user(
+    return await AuthService.login(
         email=form_data.username,  # OAuth2 uses 'username' field
         password=form_data.password
-    )
\ No newline at end of file
+    )
+ 
+@router.post("/refresh", response_model=Token)
+async def refresh(request: RefreshRequest):
+    """Exchange a refresh token for a new access / refresh token pair (the old one stops working)"""
+    return await run_db(TokenService.refresh, request.refresh_token)
+ 
+@router.post("/logout")
+async def logout(request: LogoutRequest, current_user: Optional[dict] = Depends(get_optional_user)):
+    """
+    Revoke the current session, identified by the access token or, once
+    that has expired, by the refresh token. ``all_sessions`` signs the user
+    out everywhere.
+    """
+    return await run_db(
+        TokenService.logout,
+        session_id=current_user.get("session_id") if current_user else None,
+        refresh_token=request.refresh_token,
+        user_id=current_user["id"] if current_user else None,
+        all_sessions=request.all_sessions
+    )
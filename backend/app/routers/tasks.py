@@ -0,0 +1,112 @@
+import asyncio
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.config import settings
+from app.schemas.auth import StreamTicket
+from app.schemas.task import TaskChanges, TaskSearchResults
+from app.serialization import render_search_page
+from app.services.sync_service import SyncService
+from app.services.task_service import TaskService
+from app.services.token_service import TokenService
+from app.utils.dependencies import get_current_user, get_stream_user, get_token_claims
+from app.utils.events import event_hub
+from app.utils.executors import run_db
+from app.utils.response_cache import cached_response
+
+router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Tasks created or updated after the ``since`` token, plus deleted ids.
+    Admins see every task; users see the tasks assigned to them.
+    """
+    return await run_db(
+        SyncService.get_changes,
+        current_user["id"],
+        current_user["role"],
+        since=since,
+        limit=limit
+    )
+
+@router.get("/search", response_model=TaskSearchResults)
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Full-text search over task titles and descriptions. Every word of ``q``
+    must match, as a prefix; results come best match first with a
+    ``snippet`` whose matched terms are wrapped in ``<mark>`` (the rest of
+    the snippet is raw task text). Users search their own tasks; admins
+    search all of them (``assigned_to`` narrows it). Only the newest
+    ``SEARCH_RANK_WINDOW`` matches are ranked: ``total`` counts them and
+    ``truncated`` says older matches were left out.
+    """
+    def render():
+        return render_search_page(TaskService.search_tasks(
+            q,
+            user_id=current_user["id"],
+            role=current_user["role"],
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to,
+            limit=limit,
+            offset=offset
+        ))
+
+    return await cached_response(request, "tasks.search", current_user, render)
+
+@router.post("/events/ticket", response_model=StreamTicket)
+async def create_stream_ticket(claims: dict = Depends(get_token_claims)):
+    """
+    Single-use ticket for ``GET /events?ticket=``, valid for
+    ``STREAM_TICKET_SECONDS``. EventSource cannot send an Authorization
+    header, and a ticket keeps the access token itself out of URLs.
+    """
+    return await run_db(TokenService.issue_stream_ticket, claims)
+
+@router.get("/events")
+async def stream_task_events(current_user: dict = Depends(get_stream_user)):
+    """
+    Live task events as Server-Sent Events (created / updated / deleted).
+    A ``resync`` event means events were dropped; catch up via /changes.
+    Authenticate with the Authorization header or, from a browser, a
+    ``?ticket=`` from ``POST /events/ticket``; every connection needs a new one.
+    """
+    subscription = event_hub.subscribe(current_user["id"], current_user["role"])
+    return StreamingResponse(
+        _event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _event_stream(subscription):
+    loop = asyncio.get_running_loop()
+    # Streams end after a while and EventSource reconnects, so a shutting-down
+    # server is never held open indefinitely by idle dashboards.
+    deadline = loop.time() + settings.EVENT_STREAM_MAX_SECONDS
+    try:
+        yield "retry: 5000\n: connected\n\n"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            frames = await subscription.get(min(settings.EVENT_KEEPALIVE_SECONDS, remaining))
+            if frames is None:
+                break
+            # Comment lines keep idle connections open through proxies
+            yield frames or ": keepalive\n\n"
+    finally:
+        event_hub.unsubscribe(subscription)
@@ -1,14 +1,46 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request
+from typing import List, Optional
+from datetime import datetime
 from app.schemas.task import TaskResponse, TaskUpdate
 from app.services.task_service import TaskService
 from app.utils.dependencies import get_current_user
+from app.utils.executors import run_db
+from app.config import settings
+from app.serialization import task_rows, render_task_page
+from app.utils.response_cache import cached_response
  
 router = APIRouter(prefix="/api/user", tags=["User"])
  
 @router.get("/tasks", response_model=List[TaskResponse])
-async def get_my_tasks(current_user: dict = Depends(get_current_user)):
-    return TaskService.get_all_tasks(user_id=current_user["id"], role=current_user["role"])
+async def get_my_tasks(
+    request: Request,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    fast = settings.FAST_TASK_SERIALIZATION
+
+    def render():
+        page = TaskService.list_tasks(
+            user_id=current_user["id"],
+            role=current_user["role"],
+            status=status,
+            priority=priority,
+            due_after=due_after.isoformat() if due_after else None,
+            due_before=due_before.isoformat() if due_before else None,
+            overdue=overdue,
+            limit=limit,
+            cursor=cursor,
+            convert_rows=task_rows if fast else None
+        )
+        return render_task_page(page, fast)
+
+    return await cached_response(request, "user.tasks", current_user, render)
  
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_my_task(
@@ -17,7 +49,7 @@ async def update_my_task(
     current_user: dict = Depends(get_current_user)
 ):
     task_dict = {k: v for k, v in task.model_dump().items() if v is not None}
-    return TaskService.update_task(task_id, task_dict, current_user["id"], current_user["role"])
+    return await run_db(TaskService.update_task, task_id, task_dict, current_user["id"], current_user["role"])
  
 @router.get("/profile")
 async def get_profile(current_user: dict = Depends(get_current_user)):
@@ -1,4 +1,11 @@
 from .auth import Token, TokenData, UserRegister, UserLogin
-from .task import TaskCreate, TaskUpdate, TaskResponse
+from .audit import AuditLogResponse
+from .task import (
+    TaskCreate, TaskUpdate, TaskResponse,
+    TaskBulkUpdateItem, TaskBulkReassign, TaskBulkDelete, BulkItemResult, BulkResponse,
+    TaskChanges
+)
  
-__all__ = ['Token', 'TokenData', 'UserRegister', 'UserLogin', 'TaskCreate', 'TaskUpdate', 'TaskResponse']
\ No newline at end of file
+__all__ = ['Token', 'TokenData', 'UserRegister', 'UserLogin', 'TaskCreate', 'TaskUpdate', 'TaskResponse',
+           'TaskBulkUpdateItem', 'TaskBulkReassign', 'TaskBulkDelete', 'BulkItemResult', 'BulkResponse',
+           'TaskChanges', 'AuditLogResponse']
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class AuditLogResponse(BaseModel):
+    id: int
+    user_id: int
+    user_name: Optional[str] = None
+    action: str
+    entity_type: str
+    entity_id: int
+    details: Optional[Dict[str, Any]] = None
+    created_at: datetime
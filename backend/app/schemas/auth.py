@@ -1,9 +1,23 @@
+from typing import Optional
 from pydantic import BaseModel, EmailStr
  
 class Token(BaseModel):
     access_token: str
     token_type: str
     user: dict
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+ 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+ 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+    all_sessions: bool = False
+ 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
  
 class TokenData(BaseModel):
     email: str | None = None
@@ -1,9 +1,10 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
 from datetime import datetime
 
 ALLOWED_STATUS = {"todo", "in-progress", "done"}
 ALLOWED_PRIORITY = {"low", "medium", "high"}
+MAX_BULK_ITEMS = 1000
 
 class TaskCreate(BaseModel):
     title: str
@@ -59,3 +60,43 @@ class TaskResponse(BaseModel):
     completed_at: Optional[datetime]
     assigned_user_name: Optional[str] = None
     is_overdue: bool = False
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkReassign(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    assigned_to: Optional[int] = None
+
+class TaskBulkDelete(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+class TaskChanges(BaseModel):
+    changes: List[TaskResponse]
+    deleted: List[int]
+    since: str
+    has_more: bool
+    reset: bool
+
+class TaskSearchHit(TaskResponse):
+    rank: float
+    snippet: Optional[str] = None
+
+class TaskSearchResults(BaseModel):
+    results: List[TaskSearchHit]
+    has_more: bool
+    # Matches ranked (at most SEARCH_RANK_WINDOW per shard); truncated when
+    # older matches were left out
+    total: int
+    truncated: bool
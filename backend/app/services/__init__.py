@@ -1,5 +1,8 @@
 from .auth_service import AuthService
 from .task_service import TaskService
 from .analytics_service import AnalyticsService
+from .stats_service import StatsService
+from .sync_service import SyncService
+from .audit_service import AuditService
  
-__all__ = ['AuthService', 'TaskService', 'AnalyticsService']
\ No newline at end of file
+__all__ = ['AuthService', 'TaskService', 'AnalyticsService', 'StatsService', 'SyncService', 'AuditService']
\ No newline at end of file
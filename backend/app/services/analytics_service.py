@@ -1,33 +1,38 @@
+import logging
 from app.database import get_db
-from datetime import datetime
+from app.services.task_repository import task_repository, task_from_row, OVERDUE_SQL
+from app.metrics import instrument_service
+from fastapi import HTTPException
 
+# Drill-down categories: SQL filter and the counter holding the category size
+TASK_CATEGORIES = {
+    "all": ("1 = 1", None),
+    "completed": ("t.status = 'done'", ("status", "done")),
+    "todo": ("t.status = 'todo'", ("status", "todo")),
+    "in_progress": ("t.status = 'in-progress'", ("status", "in-progress")),
+    "overdue": (OVERDUE_SQL, None),
+    "high_priority": ("t.status != 'done' AND t.priority = 'high'", ("open_priority", "high")),
+    "medium_priority": ("t.status != 'done' AND t.priority = 'medium'", ("open_priority", "medium")),
+    "low_priority": ("t.status != 'done' AND t.priority = 'low'", ("open_priority", "low")),
+}
+
+logger = logging.getLogger(__name__)
+
+@instrument_service
 class AnalyticsService:
     @staticmethod
-    def get_analytics():
+    def get_analytics(mode: str = "full", preview_size: int = 5):
+        if mode == "summary":
+            return AnalyticsService.get_summary(preview_size)
+
         with get_db() as conn:
             cursor = conn.cursor()
             
             # Get all tasks with full details
-            cursor.execute("""
-                SELECT t.*, u.name as assigned_user_name
-                FROM tasks t
-                LEFT JOIN users u ON t.assigned_to = u.id
-                ORDER BY t.created_at DESC
-            """)
-            all_tasks_raw = cursor.fetchall()
-            all_tasks = [dict(row) for row in all_tasks_raw]
+            # is_overdue is computed by SQLite from the normalized due_ts
+            all_tasks = [task_from_row(row) for row in task_repository.select(cursor)]
             
-            # Add is_overdue flag to each task
-            now = datetime.utcnow()
-            for task in all_tasks:
-                task['is_overdue'] = AnalyticsService._check_overdue(task, now)
-            
-            # Print debug info
-            print("\n" + "="*60)
-            print("ANALYTICS CALCULATION")
-            print("="*60)
-            print(f"Current UTC Time: {now}")
-            print(f"Total tasks in DB: {len(all_tasks)}")
+            logger.debug("Analytics calculation over %d tasks", len(all_tasks))
             
             # Initialize empty lists
             completed_tasks = []
@@ -39,27 +44,26 @@ class AnalyticsService:
             low_priority_tasks = []
             
             # Categorize tasks - FIXED: Check for 'done' not 'completed'
+            # (the level check is hoisted so the loop costs nothing when DEBUG is off)
+            debug = logger.isEnabledFor(logging.DEBUG)
             for task in all_tasks:
-                print(f"\nProcessing task: {task['title']}")
-                print(f"  Status: {task['status']}")
-                print(f"  Priority: {task['priority']}")
-                print(f"  Is Overdue: {task['is_overdue']}")
+                if debug:
+                    logger.debug(
+                        "Categorizing task %s: status=%s priority=%s overdue=%s",
+                        task['id'], task['status'], task['priority'], task['is_overdue']
+                    )
                 
                 # By status - CRITICAL FIX: Use 'done' not 'completed'
                 if task['status'] == 'done':
                     completed_tasks.append(task)
-                    print(f"  ✓ Added to completed_tasks")
                 elif task['status'] == 'todo':
                     todo_tasks.append(task)
-                    print(f"  ✓ Added to todo_tasks")
                 elif task['status'] == 'in-progress':
                     in_progress_tasks.append(task)
-                    print(f"  ✓ Added to in_progress_tasks")
                 
                 # By overdue (only non-completed tasks)
                 if task['is_overdue'] and task['status'] != 'done':
                     overdue_tasks.append(task)
-                    print(f"  ✓ Added to overdue_tasks")
                 
                 # By priority (only pending tasks)
                 if task['status'] != 'done':
@@ -70,68 +74,41 @@ class AnalyticsService:
                     elif task['priority'] == 'low':
                         low_priority_tasks.append(task)
             
-            # Print categorization results
-            print(f"\n{'='*60}")
-            print(f"CATEGORIZATION RESULTS:")
-            print(f"{'='*60}")
-            print(f"  Total: {len(all_tasks)} tasks")
-            print(f"  Completed: {len(completed_tasks)} tasks")
-            for task in completed_tasks:
-                print(f"    - {task['title']} (Status: {task['status']})")
-            print(f"  Overdue: {len(overdue_tasks)} tasks")
-            print(f"  To Do: {len(todo_tasks)} tasks")
-            print(f"  In Progress: {len(in_progress_tasks)} tasks")
-            print(f"  High Priority: {len(high_priority_tasks)} tasks")
-            print(f"  Medium Priority: {len(medium_priority_tasks)} tasks")
-            print(f"  Low Priority: {len(low_priority_tasks)} tasks")
-            print("="*60 + "\n")
-            
-            # Total counts
-            total_tasks = len(all_tasks)
-            
+            logger.debug(
+                "Categorized %d tasks: completed=%d overdue=%d todo=%d in_progress=%d "
+                "high=%d medium=%d low=%d",
+                len(all_tasks), len(completed_tasks), len(overdue_tasks), len(todo_tasks),
+                len(in_progress_tasks), len(high_priority_tasks), len(medium_priority_tasks),
+                len(low_priority_tasks)
+            )
+            
+            # Counts come from the materialized counters, not the task lists
+            counters = task_repository.counters(cursor)
+            status_breakdown = counters["status"]
+            priority_breakdown = counters["priority"]
+            assignee_counts = counters["assignee"]
+            total_tasks = sum(status_breakdown.values())
+
             cursor.execute("SELECT COUNT(*) as count FROM users")
             total_users = cursor.fetchone()["count"]
-            
-            # Status breakdown
-            cursor.execute("""
-                SELECT status, COUNT(*) as count
-                FROM tasks
-                GROUP BY status
-            """)
-            status_breakdown = {
-                row["status"]: row["count"]
-                for row in cursor.fetchall()
-            }
-            
-            # Priority breakdown
-            cursor.execute("""
-                SELECT priority, COUNT(*) as count
-                FROM tasks
-                GROUP BY priority
-            """)
-            priority_breakdown = {
-                row["priority"]: row["count"]
-                for row in cursor.fetchall()
-            }
-            
-            # User distribution
-            cursor.execute("""
-                SELECT u.id, u.name, COUNT(t.id) as task_count
-                FROM users u
-                LEFT JOIN tasks t ON u.id = t.assigned_to
-                GROUP BY u.id, u.name
-            """)
+
+            # User distribution (tasks grouped in one pass instead of per user)
+            tasks_by_user = {}
+            for task in all_tasks:
+                tasks_by_user.setdefault(task.get('assigned_to'), []).append(task)
+
+            cursor.execute("SELECT id, name FROM users")
             user_distribution = []
             for row in cursor.fetchall():
                 user_dict = dict(row)
-                user_tasks = [t for t in all_tasks if t.get('assigned_to') == user_dict['id']]
-                user_dict['tasks'] = user_tasks
+                user_dict['task_count'] = assignee_counts.get(str(user_dict['id']), 0)
+                user_dict['tasks'] = tasks_by_user.get(user_dict['id'], [])
                 user_distribution.append(user_dict)
             
             result = {
                 "total_tasks": total_tasks,
                 "total_users": total_users,
-                "completed_tasks": len(completed_tasks),
+                "completed_tasks": status_breakdown.get("done", 0),
                 "overdue_tasks": len(overdue_tasks),
                 "status_breakdown": status_breakdown,
                 "priority_breakdown": priority_breakdown,
@@ -147,58 +124,97 @@ class AnalyticsService:
                 "low_priority_tasks_list": low_priority_tasks
             }
             
-            # Debug: Print what we're returning
-            print("FINAL RESULT:")
-            print(f"  all_tasks_list: {len(result['all_tasks_list'])} tasks")
-            print(f"  completed_tasks_list: {len(result['completed_tasks_list'])} tasks")
-            print(f"  overdue_tasks_list: {len(result['overdue_tasks_list'])} tasks")
-            print(f"  todo_tasks_list: {len(result['todo_tasks_list'])} tasks")
-            print(f"  in_progress_tasks_list: {len(result['in_progress_tasks_list'])} tasks")
-            print("\n")
-            
             return result
-    
+
     @staticmethod
-    def _check_overdue(task: dict, now: datetime = None) -> bool:
-        """Check if a task is overdue"""
-        if now is None:
-            now = datetime.utcnow()
-            
-        # Completed tasks are never overdue - FIXED: Check for 'done'
-        if task.get("status") == "done":
-            return False
-        
-        # No due date means not overdue
-        due_date_str = task.get("due_date")
-        if not due_date_str:
-            return False
-        
-        try:
-            # Parse the due date
-            if due_date_str.endswith('Z'):
-                due_date_str = due_date_str[:-1]
-            
-            # Remove timezone if present
-            if '+' in due_date_str:
-                due_date_str = due_date_str.split('+')[0]
-            
-            try:
-                due_date = datetime.fromisoformat(due_date_str)
-            except:
-                if 'T' in due_date_str:
-                    date_part = due_date_str.split('T')[0]
-                    due_date = datetime.strptime(date_part, '%Y-%m-%d')
-                else:
-                    due_date = datetime.strptime(due_date_str, '%Y-%m-%d')
-            
-            # Task is overdue if current time > due date
-            is_overdue = now > due_date
-            
-            print(f"  Overdue check for '{task.get('title')}':")
-            print(f"    Due: {due_date}, Now: {now}, Overdue: {is_overdue}")
-            
-            return is_overdue
-            
-        except Exception as e:
-            print(f"  Error checking overdue status: {str(e)}")
-            return False
\ No newline at end of file
+    def get_summary(preview_size: int = 5):
+        """Counts plus a small, fixed-size preview of each task category"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            counters = task_repository.counters(cursor)
+            status_breakdown = counters["status"]
+            assignee_counts = counters["assignee"]
+
+            cursor.execute("SELECT COUNT(*) as count FROM users")
+            total_users = cursor.fetchone()["count"]
+
+            cursor.execute("SELECT id, name FROM users")
+            user_distribution = [
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "task_count": assignee_counts.get(str(row["id"]), 0)
+                }
+                for row in cursor.fetchall()
+            ]
+
+            category_counts = {
+                category: AnalyticsService._category_count(cursor, category, counters)
+                for category in TASK_CATEGORIES
+            }
+            previews = {
+                category: AnalyticsService._category_tasks(cursor, category, preview_size, 0)
+                for category in TASK_CATEGORIES
+            }
+
+            return {
+                "total_tasks": category_counts["all"],
+                "total_users": total_users,
+                "completed_tasks": category_counts["completed"],
+                "overdue_tasks": category_counts["overdue"],
+                "status_breakdown": status_breakdown,
+                "priority_breakdown": counters["priority"],
+                "user_distribution": user_distribution,
+                "category_counts": category_counts,
+                "previews": previews
+            }
+
+    @staticmethod
+    def get_category_tasks(category: str, limit: int = 20, offset: int = 0, assigned_to: int = None):
+        """One page of the tasks in an analytics category (tooltip drill-down)"""
+        if category not in TASK_CATEGORIES:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown analytics category '{category}'"
+            )
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            counters = None if assigned_to is not None else task_repository.counters(cursor)
+            return {
+                "category": category,
+                "total": AnalyticsService._category_count(cursor, category, counters, assigned_to),
+                "limit": limit,
+                "offset": offset,
+                "tasks": AnalyticsService._category_tasks(cursor, category, limit, offset, assigned_to)
+            }
+
+    @staticmethod
+    def _category_count(cursor, category: str, counters: dict = None, assigned_to: int = None) -> int:
+        condition, counter = TASK_CATEGORIES[category]
+
+        if assigned_to is None and counters is not None:
+            if category == "all":
+                return sum(counters["status"].values())
+            if counter:
+                scope, key = counter
+                return counters[scope].get(key, 0)
+
+        conditions = [condition]
+        params = []
+        if assigned_to is not None:
+            conditions.append("t.assigned_to = ?")
+            params.append(assigned_to)
+        return task_repository.count(cursor, conditions, params, assigned_to)
+
+    @staticmethod
+    def _category_tasks(cursor, category: str, limit: int, offset: int, assigned_to: int = None) -> list:
+        condition, _ = TASK_CATEGORIES[category]
+        conditions = [condition]
+        params = []
+        if assigned_to is not None:
+            conditions.append("t.assigned_to = ?")
+            params.append(assigned_to)
+
+        rows = task_repository.select(cursor, conditions, params, limit, offset, assigned_to)
+        return [task_from_row(row) for row in rows]
@@ -0,0 +1,113 @@
+import json
+from datetime import datetime
+from app.database import get_db, after_commit
+from app.utils.audit_writer import audit_writer
+from app.metrics import instrument_service
+from fastapi import HTTPException
+
+MAX_AUDIT_PAGE_SIZE = 500
+
+# Task fields captured in create records and compared for update diffs
+AUDITED_TASK_FIELDS = ("title", "description", "status", "priority", "due_date", "assigned_to")
+
+
+def audit_entry(user_id: int, action: str, entity_type: str, entity_id: int, details: dict = None) -> tuple:
+    """Audit row ready for the writer queue"""
+    return (
+        user_id,
+        action,
+        entity_type,
+        entity_id,
+        json.dumps(details, default=str) if details else None,
+        datetime.utcnow().isoformat()
+    )
+
+
+def task_snapshot(task: dict) -> dict:
+    return {field: task.get(field) for field in AUDITED_TASK_FIELDS if task.get(field) is not None}
+
+
+def task_diff(old: dict, new: dict) -> dict:
+    """``{field: {"from": old, "to": new}}`` for every audited field that changed"""
+    return {
+        field: {"from": old.get(field), "to": new.get(field)}
+        for field in AUDITED_TASK_FIELDS
+        if old.get(field) != new.get(field)
+    }
+
+
+@instrument_service
+class AuditService:
+    """
+    Audit trail in the ``audit_logs`` table.
+
+    Records are queued for the background writer once the surrounding
+    transaction commits, so auditing never adds a write to the request's own
+    transaction and rolled-back changes are never audited.
+    """
+
+    @staticmethod
+    def record(entries: list):
+        """Queue audit rows built with ``audit_entry`` after the current transaction commits"""
+        entries = [entry for entry in entries if entry[0] is not None]
+        if entries:
+            after_commit(lambda: audit_writer.submit(entries))
+
+    @staticmethod
+    def list_logs(
+        entity_type: str = None,
+        entity_id: int = None,
+        user_id: int = None,
+        action: str = None,
+        limit: int = 100,
+        cursor: str = None
+    ):
+        """Audit records newest first, one keyset page at a time (``cursor`` is the last id seen)"""
+        conditions = []
+        params = []
+        if entity_type is not None:
+            conditions.append("a.entity_type = ?")
+            params.append(entity_type)
+        if entity_id is not None:
+            conditions.append("a.entity_id = ?")
+            params.append(entity_id)
+        if user_id is not None:
+            conditions.append("a.user_id = ?")
+            params.append(user_id)
+        if action is not None:
+            conditions.append("a.action = ?")
+            params.append(action)
+        if cursor:
+            try:
+                conditions.append("a.id < ?")
+                params.append(int(cursor))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+        limit = max(1, min(limit, MAX_AUDIT_PAGE_SIZE))
+        query = """
+            SELECT a.*, u.name AS user_name
+            FROM audit_logs a
+            LEFT JOIN users u ON a.user_id = u.id
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with get_db() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1]["id"])
+
+        logs = []
+        for row in rows:
+            log = dict(row)
+            log["details"] = json.loads(log["details"]) if log["details"] else None
+            logs.append(log)
+        return {"logs": logs, "next_cursor": next_cursor}
@@ -1,15 +1,30 @@
-from datetime import datetime, timedelta
-from app.database import get_db
-from app.utils.security import verify_password, get_password_hash, create_access_token
-from app.config import settings
+from datetime import datetime
+from app.database import get_db, after_commit
+from app.utils.passwords import verify_and_update_password, get_password_hash
+from app.utils.executors import run_db, run_hash
+from app.utils.auth_cache import invalidate_user
+from app.services.audit_service import AuditService, audit_entry
+from app.services.token_service import TokenService
+from app.metrics import instrument_service
 from fastapi import HTTPException, status
- 
+
+@instrument_service
 class AuthService:
     @staticmethod
     def register_user(name: str, email: str, password: str, role: str = "user"):
+        return AuthService._create_user(name, email, get_password_hash(password), role)
+
+    @staticmethod
+    async def register(name: str, email: str, password: str, role: str = "user"):
+        """Async registration: bcrypt on the hashing pool, SQL on the database pool"""
+        hashed_password = await run_hash(get_password_hash, password)
+        return await run_db(AuthService._create_user, name, email, hashed_password, role)
+
+    @staticmethod
+    def _create_user(name: str, email: str, hashed_password: str, role: str = "user"):
         with get_db() as conn:
             cursor = conn.cursor()
-            
+
             # Check if user exists
             cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
             if cursor.fetchone():
@@ -17,7 +32,7 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already registered"
                 )
-            
+
             # Only allow admin creation through special utility
             # Regular registration always creates users
             if role == "admin":
@@ -25,21 +40,22 @@ class AuthService:
                 is_superuser = 0
             else:
                 is_superuser = 0
-            
+
             # Create user
-            hashed_password = get_password_hash(password)
             now = datetime.utcnow().isoformat()
-            
+
             cursor.execute("""
                 INSERT INTO users (name, email, hashed_password, role, is_superuser, is_active, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (name, email, hashed_password, role, is_superuser, 1, now, now))
-            
+
             user_id = cursor.lastrowid
-            
+            # A request racing this one must not re-cache the row before it commits
+            after_commit(lambda: invalidate_user(email))
+
             cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
             user = dict(cursor.fetchone())
-            
+
             return {
                 "id": user["id"],
                 "name": user["name"],
@@ -47,53 +63,78 @@ class AuthService:
                 "role": user["role"],
                 "is_superuser": bool(user.get("is_superuser", 0))
             }
-    
+
     @staticmethod
     def authenticate_user(email: str, password: str):
+        user_dict = AuthService._get_login_user(email)
+        matches, new_hash = verify_and_update_password(password, user_dict["hashed_password"])
+        if not matches:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password"
+            )
+        return AuthService._issue_token(user_dict, new_hash)
+
+    @staticmethod
+    async def login(email: str, password: str):
+        """Async login: user lookup and token issue on the database pool, bcrypt on the hashing pool"""
+        user_dict = await run_db(AuthService._get_login_user, email)
+        matches, new_hash = await run_hash(verify_and_update_password, password, user_dict["hashed_password"])
+        if not matches:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password"
+            )
+        return await run_db(AuthService._issue_token, user_dict, new_hash)
+
+    @staticmethod
+    def _get_login_user(email: str) -> dict:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
             user = cursor.fetchone()
-            
+
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect email or password"
                 )
-            
+
             user_dict = dict(user)
-            
+
             # Check if user is active
             if not user_dict.get("is_active", 1):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="User account is disabled"
                 )
-            
-            if not verify_password(password, user_dict["hashed_password"]):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Incorrect email or password"
-                )
-            
+
+            return user_dict
+
+    @staticmethod
+    def _issue_token(user_dict: dict, new_hash: str = None):
+        with get_db() as conn:
+            cursor = conn.cursor()
+
             # Update last login
             now = datetime.utcnow().isoformat()
             cursor.execute("UPDATE users SET last_login = ? WHERE id = ?", (now, user_dict["id"]))
-            
-            # Create access token with additional claims
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-            access_token = create_access_token(
-                data={
-                    "sub": user_dict["email"],
-                    "role": user_dict["role"],
-                    "is_superuser": bool(user_dict.get("is_superuser", 0))
-                },
-                expires_delta=access_token_expires
-            )
-            
+            if new_hash:
+                # Stored hash predates the current BCRYPT_ROUNDS; skipped if
+                # the password was changed since it was read
+                cursor.execute(
+                    "UPDATE users SET hashed_password = ? WHERE id = ? AND hashed_password = ?",
+                    (new_hash, user_dict["id"], user_dict["hashed_password"])
+                )
+            after_commit(lambda: invalidate_user(user_dict["email"]))
+            AuditService.record([audit_entry(user_dict["id"], "login", "user", user_dict["id"])])
+
+            # Access token claims cover authorization; the refresh token
+            # starts a new session
+            tokens = TokenService.issue(cursor, user_dict)
+
             return {
-                "access_token": access_token,
-                "token_type": "bearer",
+                **tokens,
                 "user": {
                     "id": user_dict["id"],
                     "name": user_dict["name"],
@@ -102,4 +143,4 @@ class AuthService:
                     "is_superuser": bool(user_dict.get("is_superuser", 0)),
                     "last_login": now
                 }
-            }
\ No newline at end of file
+            }
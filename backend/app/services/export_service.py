@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from app.database import get_db
+from app.services.task_repository import task_repository
+from app.utils.executors import run_db
+from app.metrics import instrument_service
+
+EXPORT_COLUMNS = {
+    "tasks": (
+        "id", "title", "description", "status", "priority", "due_date",
+        "assigned_to", "created_by", "created_at", "updated_at", "completed_at"
+    ),
+    "audit_logs": (
+        "id", "user_id", "action", "entity_type", "entity_id", "details", "created_at"
+    ),
+}
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+@instrument_service
+class ExportService:
+    """
+    Streaming table exports.
+
+    Rows are read in id order, one keyset chunk at a time, each on a
+    short-lived pooled connection. Plain tuples are encoded straight to
+    NDJSON or CSV without Pydantic validation, so memory use depends only
+    on the chunk size. Passing the last id seen as ``after_id`` resumes an
+    interrupted export.
+    """
+
+    @staticmethod
+    def fetch_chunk(table: str, after_id: int, limit: int = EXPORT_CHUNK_SIZE) -> list:
+        columns = EXPORT_COLUMNS[table]
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            if table == "tasks":
+                return task_repository.export_rows(cursor, columns, after_id, limit)
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    async def iter_chunks(table: str, after_id: int = 0, chunk_size: int = EXPORT_CHUNK_SIZE):
+        while True:
+            rows = await run_db(ExportService.fetch_chunk, table, after_id, chunk_size)
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            after_id = rows[-1][0]
+
+    @staticmethod
+    async def stream_ndjson(table: str, after_id: int = 0):
+        columns = EXPORT_COLUMNS[table]
+        async for rows in ExportService.iter_chunks(table, after_id):
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=str) + "\n"
+                for row in rows
+            ).encode("utf-8")
+
+    @staticmethod
+    async def stream_csv(table: str, after_id: int = 0):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS[table])
+
+        async for rows in ExportService.iter_chunks(table, after_id):
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header only, when there is nothing to export
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def stream(table: str, export_format: str, after_id: int = 0):
+        if export_format == "csv":
+            return ExportService.stream_csv(table, after_id)
+        return ExportService.stream_ndjson(table, after_id)
@@ -0,0 +1,127 @@
+import csv
+import json
+from pydantic import ValidationError
+from app.database import get_db
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+from app.metrics import instrument_service
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Optional CSV/NDJSON columns where an empty value means "not set"
+OPTIONAL_FIELDS = ("description", "status", "priority", "due_date", "assigned_to")
+
+
+@instrument_service
+class ImportService:
+    """
+    Bulk task import from CSV or NDJSON.
+
+    The input is read as a stream and every row is validated against the
+    ``TaskCreate`` rules. Assignees may be given as ``assigned_to`` (user
+    id) or ``assignee_email``; both are resolved through one user map
+    fetched up front. Valid rows are inserted with ``executemany``, one
+    transaction per chunk, so memory stays bounded by the chunk size and
+    the capped error report.
+    """
+
+    @staticmethod
+    def iter_records(stream, import_format: str):
+        """Yield ``(line_number, record_or_None, parse_error_or_None)`` from a text stream"""
+        if import_format == "csv":
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, record, None
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Each line must be a JSON object"
+                continue
+            yield line_number, record, None
+
+    @staticmethod
+    def _load_user_map(cursor):
+        cursor.execute("SELECT id, email FROM users")
+        emails = {}
+        ids = set()
+        for row in cursor.fetchall():
+            emails[row["email"].lower()] = row["id"]
+            ids.add(row["id"])
+        return emails, ids
+
+    @staticmethod
+    def _prepare(record: dict, emails: dict, user_ids: set):
+        """Validated task dict for one record, or a list of error messages"""
+        data = {key: value for key, value in record.items() if key is not None}
+        for field in OPTIONAL_FIELDS:
+            if data.get(field) == "":
+                data.pop(field)
+
+        email = str(data.pop("assignee_email", None) or "").strip().lower()
+        if email:
+            if email not in emails:
+                return None, [f"Unknown assignee email '{email}'"]
+            data["assigned_to"] = emails[email]
+
+        try:
+            task = TaskCreate(**data).model_dump()
+        except ValidationError as e:
+            return None, [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            ]
+
+        if task["assigned_to"] and task["assigned_to"] not in user_ids:
+            return None, [f"Assigned user with ID {task['assigned_to']} does not exist"]
+        return task, None
+
+    @staticmethod
+    def _flush(batch: list, created_by: int):
+        with get_db() as conn:
+            TaskService.insert_tasks(conn.cursor(), batch, created_by)
+
+    @staticmethod
+    def import_tasks(stream, import_format: str, created_by: int, chunk_size: int = IMPORT_CHUNK_SIZE):
+        """Import tasks from a CSV/NDJSON text stream and return a per-row error report"""
+        with get_db() as conn:
+            emails, user_ids = ImportService._load_user_map(conn.cursor())
+
+        report = {"total_rows": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+        batch = []
+
+        for line_number, record, parse_error in ImportService.iter_records(stream, import_format):
+            report["total_rows"] += 1
+            errors = [parse_error] if parse_error else None
+            task = None
+            if record is not None:
+                task, errors = ImportService._prepare(record, emails, user_ids)
+
+            if errors:
+                report["failed"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append({"row": line_number, "errors": errors})
+                else:
+                    report["errors_truncated"] = True
+                continue
+
+            batch.append(task)
+            if len(batch) >= chunk_size:
+                ImportService._flush(batch, created_by)
+                report["imported"] += len(batch)
+                batch = []
+
+        if batch:
+            ImportService._flush(batch, created_by)
+            report["imported"] += len(batch)
+
+        return report
@@ -0,0 +1,70 @@
+import time
+from datetime import datetime
+from app.config import settings
+from app.database import get_db
+from app.services.task_repository import task_repository
+from app.utils.events import event_hub, task_event
+from app.utils.response_cache import response_cache
+from app.metrics import instrument_service
+
+
+@instrument_service
+class ReminderService:
+    """
+    Due-date notifications, run as scheduled jobs (see ``app.main``).
+
+    Both jobs claim tasks with one UPDATE ... RETURNING per batch and
+    partition, through partial indexes that only hold the tasks not yet
+    flagged, so a run costs O(tasks flagged) rather than O(tasks). A task
+    is announced once, whichever server process runs the job.
+    """
+
+    @staticmethod
+    def sweep_overdue(batch_size: int = None) -> int:
+        """Flag tasks that became overdue and send an ``overdue`` event for each; returns how many"""
+        batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+        marked = 0
+        for partition in task_repository.partitions:
+            while True:
+                with get_db() as conn:
+                    rows = partition.mark_overdue(
+                        conn.cursor(), int(time.time()), datetime.utcnow().isoformat(), batch_size
+                    )
+                    events = [task_event("overdue", row["id"], row["assigned_to"]) for row in rows]
+                    # is_overdue changed, so cached lists showing these tasks are stale
+                    event_hub.publish_after_commit(events)
+                    response_cache.invalidate_after_commit(events)
+                marked += len(rows)
+                if len(rows) < batch_size:
+                    break
+        return marked
+
+    @staticmethod
+    def send_reminders(window_hours: float = None, batch_size: int = None) -> int:
+        """
+        Send a ``reminder`` event for every open task falling due within
+        ``window_hours`` that has not had one; returns how many were sent.
+        """
+        window_hours = settings.REMINDER_WINDOW_HOURS if window_hours is None else window_hours
+        batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+        sent = 0
+        for partition in task_repository.partitions:
+            while True:
+                now_ts = int(time.time())
+                with get_db() as conn:
+                    rows = partition.mark_reminders(
+                        conn.cursor(), now_ts, now_ts + int(window_hours * 3600),
+                        datetime.utcnow().isoformat(), batch_size
+                    )
+                    event_hub.publish_after_commit([
+                        {
+                            **task_event("reminder", row["id"], row["assigned_to"]),
+                            "title": row["title"],
+                            "due_date": row["due_date"],
+                        }
+                        for row in rows
+                    ])
+                sent += len(rows)
+                if len(rows) < batch_size:
+                    break
+        return sent
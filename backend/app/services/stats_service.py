@@ -0,0 +1,151 @@
+from collections import Counter
+from app.database import get_db
+from app.metrics import instrument_service
+
+# Counter scopes kept in the task_counters table
+COUNTER_SCOPES = ("status", "priority", "open_priority", "assignee")
+
+UNASSIGNED_KEY = "none"
+
+
+@instrument_service
+class StatsService:
+    """
+    Materialized task counters.
+
+    Every task write adjusts the counters inside the same transaction, so
+    analytics can read totals without scanning the tasks table. ``verify``
+    and ``rebuild`` recompute them from scratch to detect and repair drift.
+    Counters live next to the tasks they count: ``schema`` names the attached
+    database (``main`` or a shard) holding both tables.
+    """
+
+    @staticmethod
+    def _keys(task: dict):
+        assigned_to = task.get("assigned_to")
+        keys = [
+            ("status", task["status"]),
+            ("priority", task["priority"]),
+            ("assignee", str(assigned_to) if assigned_to else UNASSIGNED_KEY),
+        ]
+        if task["status"] != "done":
+            keys.append(("open_priority", task["priority"]))
+        return keys
+
+    @staticmethod
+    def counter_deltas(old: dict = None, new: dict = None) -> Counter:
+        """Counter adjustments for a task going from ``old`` to ``new`` (None = absent)"""
+        deltas = Counter()
+        if old:
+            for key in StatsService._keys(old):
+                deltas[key] -= 1
+        if new:
+            for key in StatsService._keys(new):
+                deltas[key] += 1
+        return deltas
+
+    @staticmethod
+    def apply(cursor, deltas: Counter, schema: str = "main"):
+        """Add ``deltas`` to the stored counters"""
+        rows = [(scope, key, delta) for (scope, key), delta in deltas.items() if delta]
+        if not rows:
+            return
+        cursor.executemany(f"""
+            INSERT INTO {schema}.task_counters (scope, key, count)
+            VALUES (?, ?, ?)
+            ON CONFLICT (scope, key) DO UPDATE SET count = count + excluded.count
+        """, rows)
+
+    @staticmethod
+    def get_counters(cursor=None, schema: str = "main") -> dict:
+        """All counters as ``{scope: {key: count}}`` (zero counts omitted)"""
+        if cursor is None:
+            with get_db() as conn:
+                return StatsService.get_counters(conn.cursor(), schema)
+
+        counters = {scope: {} for scope in COUNTER_SCOPES}
+        cursor.execute(f"SELECT scope, key, count FROM {schema}.task_counters WHERE count != 0")
+        for row in cursor.fetchall():
+            counters.setdefault(row["scope"], {})[row["key"]] = row["count"]
+        return counters
+
+    @staticmethod
+    def compute_counters(cursor, schema: str = "main") -> dict:
+        """Counters recomputed from the tasks table"""
+        counters = {scope: {} for scope in COUNTER_SCOPES}
+        queries = {
+            "status": f"SELECT status AS key, COUNT(*) AS count FROM {schema}.tasks GROUP BY status",
+            "priority": f"SELECT priority AS key, COUNT(*) AS count FROM {schema}.tasks GROUP BY priority",
+            "open_priority": f"""
+                SELECT priority AS key, COUNT(*) AS count FROM {schema}.tasks
+                WHERE status != 'done' GROUP BY priority
+            """,
+            "assignee": f"""
+                SELECT COALESCE(CAST(assigned_to AS TEXT), '{UNASSIGNED_KEY}') AS key, COUNT(*) AS count
+                FROM {schema}.tasks GROUP BY assigned_to
+            """,
+        }
+        for scope, query in queries.items():
+            cursor.execute(query)
+            for row in cursor.fetchall():
+                counters[scope][row["key"]] = row["count"]
+        return counters
+
+    @staticmethod
+    def verify() -> list:
+        """Compare stored counters with the tasks table and list every mismatch"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            return [
+                entry
+                for schema in StatsService._schemas()
+                for entry in StatsService._drift(
+                    schema, StatsService.get_counters(cursor, schema),
+                    StatsService.compute_counters(cursor, schema)
+                )
+            ]
+
+    @staticmethod
+    def rebuild() -> list:
+        """Recompute all counters from the tasks table; returns the drift that was fixed"""
+        drift = []
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # Drift is measured under the same write lock as the repair, so
+            # it is exactly what the rebuild corrected
+            cursor.execute("BEGIN IMMEDIATE")
+            for schema in StatsService._schemas():
+                actual = StatsService.compute_counters(cursor, schema)
+                drift.extend(StatsService._drift(schema, StatsService.get_counters(cursor, schema), actual))
+                cursor.execute(f"DELETE FROM {schema}.task_counters")
+                cursor.executemany(
+                    f"INSERT INTO {schema}.task_counters (scope, key, count) VALUES (?, ?, ?)",
+                    [
+                        (scope, key, count)
+                        for scope, values in actual.items()
+                        for key, count in values.items()
+                    ]
+                )
+        return drift
+
+    @staticmethod
+    def _drift(schema: str, stored: dict, actual: dict) -> list:
+        """Every counter where ``stored`` differs from ``actual``"""
+        drift = []
+        for scope in COUNTER_SCOPES:
+            keys = set(stored.get(scope, {})) | set(actual.get(scope, {}))
+            for key in sorted(keys):
+                have = stored.get(scope, {}).get(key, 0)
+                want = actual.get(scope, {}).get(key, 0)
+                if have != want:
+                    drift.append({
+                        "schema": schema, "scope": scope, "key": key,
+                        "stored": have, "actual": want
+                    })
+        return drift
+
+    @staticmethod
+    def _schemas() -> list:
+        # Imported here: the repository imports this module to apply counter deltas
+        from app.services.task_repository import task_repository
+        return [partition.schema for partition in task_repository.partitions]
@@ -0,0 +1,150 @@
+import heapq
+from datetime import datetime, timedelta
+from app.config import settings
+from app.database import get_db
+from app.services.task_repository import task_repository, task_from_row
+from app.metrics import instrument_service
+from fastapi import HTTPException
+
+
+def encode_token(seqs: list) -> str:
+    """One position per storage partition (a plain seq with single-file storage)"""
+    return ".".join(str(seq) for seq in seqs)
+
+
+def decode_token(token: str) -> list:
+    try:
+        seqs = [int(part) for part in token.split(".")]
+    except (AttributeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    if any(seq < 0 for seq in seqs):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return seqs
+
+
+@instrument_service
+class SyncService:
+    """
+    Delta sync over the ``task_changes`` log.
+
+    Triggers on the tasks table append one row per insert, update and
+    delete, numbered by a monotonic ``seq``. A client keeps the last token
+    it was given and asks for everything after it, so a board refresh costs
+    O(changes) instead of O(tasks). Each storage partition keeps its own
+    log, so a token holds one ``seq`` per partition.
+    """
+
+    @staticmethod
+    def get_changes(user_id: int, role: str, since: str = None, limit: int = None):
+        """
+        Tasks changed after ``since`` plus tombstones for ids the caller can no
+        longer see (deleted, or reassigned away from a non-admin).
+
+        ``reset`` is set when there is no usable token (first sync, or the log
+        was pruned past it); the client must then reload the full list and
+        continue from the returned ``since``.
+        """
+        limit = max(1, min(limit or settings.TASK_CHANGES_MAX_BATCH, settings.TASK_CHANGES_MAX_BATCH))
+
+        partitions = task_repository.partitions
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            bounds = [partition.change_bounds(cursor) for partition in partitions]
+            last_seqs = [last_seq or 0 for _, last_seq in bounds]
+
+            if since is None:
+                return SyncService._reset(last_seqs)
+            since_seqs = decode_token(since)
+            # A token from another storage layout cannot be resumed either
+            if len(since_seqs) != len(partitions):
+                return SyncService._reset(last_seqs)
+            for since_seq, (first_seq, _), last_seq in zip(since_seqs, bounds, last_seqs):
+                if since_seq > last_seq or (first_seq is not None and since_seq < first_seq - 1):
+                    return SyncService._reset(last_seqs)
+
+            feeds = [
+                [(row["changed_at"], position, row["seq"], row["task_id"]) for row in
+                 partition.change_entries(cursor, since_seq, user_id, role, limit + 1)]
+                for position, (partition, since_seq) in enumerate(zip(partitions, since_seqs))
+            ]
+            # Each feed is in seq order; merging by time keeps every feed's
+            # taken entries a prefix of it, so the token can resume after them
+            entries = list(heapq.merge(*feeds))
+
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+
+            # Several changes to one task collapse into its current state
+            task_ids = list(dict.fromkeys(entry[3] for entry in reversed(entries)))[::-1]
+            current = SyncService._fetch_visible(cursor, task_ids, user_id, role)
+
+        changes = []
+        deleted = []
+        for task_id in task_ids:
+            task = current.get(task_id)
+            if task is None:
+                deleted.append(task_id)
+            else:
+                changes.append(task)
+
+        next_seqs = list(since_seqs)
+        for _, position, seq, _ in entries:
+            next_seqs[position] = seq
+        return {
+            "changes": changes,
+            "deleted": deleted,
+            "since": encode_token(next_seqs),
+            "has_more": has_more,
+            "reset": False
+        }
+
+    @staticmethod
+    def get_version(user_id: int, role: str) -> str:
+        """
+        Cheap fingerprint of the task data visible to a caller, for ETags.
+
+        Every task write appends to the change log, so the newest relevant
+        ``seq`` moves on any change; the oldest retained ``seq`` moves when
+        pruning drops rows. New users change assignee names and analytics,
+        and the next open due date in scope changes once it passes, which
+        is exactly when ``is_overdue`` flips. Each part is one index probe.
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            parts = []
+            if role == "admin":
+                cursor.execute("SELECT MAX(id) FROM users")
+                parts.append(cursor.fetchone()[0])
+            for partition in task_repository.partitions:
+                parts.extend(partition.version(cursor, user_id, role))
+            return ":".join(str(value) for value in parts)
+
+    @staticmethod
+    def prune(retention_days: int = None) -> int:
+        """Drop change-log rows older than the retention window; returns the number removed"""
+        if retention_days is None:
+            retention_days = settings.TASK_CHANGES_RETENTION_DAYS
+        cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            return sum(partition.prune_changes(cursor, cutoff) for partition in task_repository.partitions)
+
+    @staticmethod
+    def _fetch_visible(cursor, task_ids: list, user_id: int, role: str) -> dict:
+        """Current rows for ``task_ids`` that the caller may see, keyed by id"""
+        return {
+            task_id: task_from_row(row)
+            for task_id, row in task_repository.get_rows(cursor, task_ids).items()
+            if role == "admin" or row["assigned_to"] == user_id
+        }
+
+    @staticmethod
+    def _reset(last_seqs: list) -> dict:
+        return {
+            "changes": [],
+            "deleted": [],
+            "since": encode_token(last_seqs),
+            "has_more": False,
+            "reset": True
+        }
@@ -0,0 +1,618 @@
+"""
+Task storage.
+
+Services reach the ``tasks``, ``tasks_fts``, ``task_changes`` and
+``task_counters`` tables only through ``task_repository``; users and audit
+logs stay in the main database either way. Every method takes the caller's cursor, so it runs in
+the caller's ``get_db()`` transaction.
+
+``SQLiteTaskRepository`` keeps all tasks in one database: ``main`` in the
+default single-file layout. ``ShardedTaskRepository``
+(``STORAGE_BACKEND=sharded``) partitions tasks by assignee across
+``SHARD_COUNT`` files attached to every pooled connection. Writes for
+assignees on different shards take different file locks instead of queueing
+on one, a user's reads touch a single shard, and admin reads scatter to all
+shards and merge the already sorted results.
+"""
+import heapq
+from collections import Counter, defaultdict
+from itertools import islice
+from app.config import settings
+from app.database import shard_files
+from app.services.stats_service import StatsService, COUNTER_SCOPES
+from app.utils.dates import to_timestamp
+
+# Current time as UTC epoch seconds (SQLite evaluates 'now' once per statement)
+NOW_TS_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# SQL condition matching open tasks whose due date has passed
+# (served by the partial index idx_tasks_open_due_ts)
+OVERDUE_SQL = (
+    "t.status != 'done' AND t.due_ts IS NOT NULL "
+    f"AND t.due_ts < {NOW_TS_SQL}"
+)
+
+# Select list for task rows returned by the API; pass rows through task_from_row
+TASK_COLUMNS_SQL = f"t.*, u.name AS assigned_user_name, ({OVERDUE_SQL}) AS is_overdue"
+
+# Full-text rank (lower is better): bm25 with title hits outweighing description hits.
+# FTS5 auxiliary functions take the table name, so search queries never alias tasks_fts.
+SEARCH_RANK_SQL = "bm25(tasks_fts, 10.0, 1.0)"
+
+# Best fragment of either column with the matched terms wrapped in <mark>
+SEARCH_SNIPPET_SQL = "snippet(tasks_fts, -1, '<mark>', '</mark>', '…', 12)"
+
+# Largest IN (...) list sent to SQLite in one statement
+IN_CHUNK_SIZE = 500
+
+# Every stored column (a task moving between shards is copied with all of them)
+STORED_COLUMNS = (
+    "id", "title", "description", "status", "priority", "due_date", "due_ts",
+    "assigned_to", "created_by", "created_at", "updated_at", "completed_at",
+    "overdue_marked_at", "reminder_sent_at",
+)
+
+# Columns an update may change
+UPDATED_COLUMNS = (
+    "title", "description", "status", "priority", "due_date", "due_ts",
+    "assigned_to", "updated_at", "completed_at", "overdue_marked_at", "reminder_sent_at",
+)
+
+# Stored columns that are not part of the API task
+INTERNAL_COLUMNS = ("due_ts", "overdue_marked_at", "reminder_sent_at")
+
+
+def task_from_row(row) -> dict:
+    """API task dict for a row selected with ``TASK_COLUMNS_SQL``"""
+    task = dict(row)
+    for column in INTERNAL_COLUMNS:
+        task.pop(column, None)
+    task["is_overdue"] = bool(task.get("is_overdue"))
+    return task
+
+
+def reset_due_flags(existing: dict, updated: dict):
+    """Clear both notification flags when the due date moves or a done task is reopened"""
+    if updated["due_ts"] != existing["due_ts"] or (existing["status"] == "done" and updated["status"] != "done"):
+        updated["overdue_marked_at"] = None
+        updated["reminder_sent_at"] = None
+
+
+def _chunks(values: list, size: int = IN_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _newest_first(row):
+    return (row["created_at"], row["id"])
+
+
+def _best_match(row):
+    return (row["rank"], -row["id"])
+
+
+class TaskRepository:
+    """
+    Storage interface for tasks.
+
+    ``partitions`` are the ``SQLiteTaskRepository`` instances holding the
+    data; the change log and counters are kept per partition, so sync,
+    counter maintenance and the scheduled due-date jobs walk them one by one. Everything else addresses
+    tasks wherever they are stored.
+    """
+
+    partitions = ()
+
+    def get(self, cursor, task_ids) -> dict:
+        """Stored task dicts (every column) for ``task_ids``, keyed by id"""
+        raise NotImplementedError
+
+    def get_rows(self, cursor, task_ids) -> dict:
+        """``TASK_COLUMNS_SQL`` rows for ``task_ids``, keyed by id"""
+        raise NotImplementedError
+
+    def select(self, cursor, conditions=(), params=(), limit: int = None, offset: int = 0,
+               assigned_to: int = None) -> list:
+        """
+        ``TASK_COLUMNS_SQL`` rows matching every condition (SQL over the
+        alias ``t``), newest first by (created_at, id). ``assigned_to`` says
+        the conditions only match that assignee's tasks.
+        """
+        raise NotImplementedError
+
+    def count(self, cursor, conditions=(), params=(), assigned_to: int = None) -> int:
+        raise NotImplementedError
+
+    def search(self, cursor, match: str, conditions=(), params=(), limit: int = 20, offset: int = 0,
+               assigned_to: int = None) -> tuple:
+        """
+        ``(rows, total, truncated)`` for tasks matching the FTS5 query
+        ``match`` and every condition. Only the ``SEARCH_RANK_WINDOW``
+        newest matches are ranked: ``rows`` are ``TASK_COLUMNS_SQL`` rows
+        plus ``rank`` and ``snippet`` from those, best first (lowest rank,
+        then newest id), ``total`` is how many were ranked and
+        ``truncated`` whether older matches were left out.
+        """
+        raise NotImplementedError
+
+    def counters(self, cursor) -> dict:
+        """Materialized counters as ``{scope: {key: count}}``"""
+        raise NotImplementedError
+
+    def insert(self, cursor, items: list, created_by: int, now: str) -> list:
+        """Insert validated task dicts, update the counters and return the new ids in order"""
+        raise NotImplementedError
+
+    def update(self, cursor, changes: list):
+        """Write ``(existing, updated)`` pairs of stored task dicts in order and update the counters"""
+        raise NotImplementedError
+
+    def delete(self, cursor, tasks: list):
+        """Delete stored task dicts and update the counters"""
+        raise NotImplementedError
+
+    def export_rows(self, cursor, columns: tuple, after_id: int, limit: int) -> list:
+        """Rows of ``columns`` (``id`` first) for tasks after ``after_id``, in id order"""
+        raise NotImplementedError
+
+
+class SQLiteTaskRepository(TaskRepository):
+    """
+    Tasks in one database, ``schema`` being its name on the connection.
+
+    By default ids come from the table's AUTOINCREMENT. With ``id_stride``
+    they are drawn from the ``task_ids`` counter as
+    ``n * id_stride + id_offset``, which keeps the ids of several shards
+    disjoint.
+    """
+
+    def __init__(self, schema: str = "main", id_stride: int = None, id_offset: int = 0):
+        self.schema = schema
+        self.id_stride = id_stride
+        self.id_offset = id_offset
+
+    @property
+    def partitions(self):
+        return (self,)
+
+    def get(self, cursor, task_ids) -> dict:
+        tasks = {}
+        for chunk in _chunks(list(task_ids)):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT * FROM {self.schema}.tasks WHERE id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                tasks[row["id"]] = dict(row)
+        return tasks
+
+    def get_rows(self, cursor, task_ids) -> dict:
+        rows = {}
+        for chunk in _chunks(list(task_ids)):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT {TASK_COLUMNS_SQL}
+                FROM {self.schema}.tasks t
+                LEFT JOIN users u ON t.assigned_to = u.id
+                WHERE t.id IN ({placeholders})
+            """, chunk)
+            for row in cursor.fetchall():
+                rows[row["id"]] = row
+        return rows
+
+    def select(self, cursor, conditions=(), params=(), limit: int = None, offset: int = 0,
+               assigned_to: int = None) -> list:
+        query = f"""
+            SELECT {TASK_COLUMNS_SQL}
+            FROM {self.schema}.tasks t
+            LEFT JOIN users u ON t.assigned_to = u.id
+        """
+        params = list(params)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY t.created_at DESC, t.id DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend((limit, offset))
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+    def count(self, cursor, conditions=(), params=(), assigned_to: int = None) -> int:
+        query = f"SELECT COUNT(*) AS count FROM {self.schema}.tasks t"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor.execute(query, list(params))
+        return cursor.fetchone()["count"]
+
+    def search(self, cursor, match: str, conditions=(), params=(), limit: int = 20, offset: int = 0,
+               assigned_to: int = None) -> tuple:
+        # Scoring every match of a word found in most tasks takes seconds on
+        # a large table. The first statement walks the index newest first
+        # (filters are a primary-key probe per match) to count the matches
+        # and find the oldest id worth ranking, one past the window telling
+        # whether it cut any off; FTS5 then seeks straight to that rowid bound.
+        filters = "".join(f" AND {condition}" for condition in conditions)
+        window = settings.SEARCH_RANK_WINDOW
+        cursor.execute(f"""
+            WITH candidates AS (
+                SELECT tasks_fts.rowid AS id
+                FROM {self.schema}.tasks_fts
+                JOIN {self.schema}.tasks t ON t.id = tasks_fts.rowid
+                WHERE tasks_fts MATCH ?{filters}
+                ORDER BY tasks_fts.rowid DESC
+                LIMIT ?
+            )
+            SELECT COUNT(*) AS matches,
+                   (SELECT MIN(id) FROM (SELECT id FROM candidates ORDER BY id DESC LIMIT ?)) AS oldest
+            FROM candidates
+        """, [match, *params, window + 1, window])
+        matches, oldest = cursor.fetchone()
+        if not matches:
+            return [], 0, False
+
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS_SQL},
+                   {SEARCH_RANK_SQL} AS rank,
+                   {SEARCH_SNIPPET_SQL} AS snippet
+            FROM {self.schema}.tasks_fts
+            JOIN {self.schema}.tasks t ON t.id = tasks_fts.rowid
+            LEFT JOIN users u ON t.assigned_to = u.id
+            WHERE tasks_fts MATCH ?
+            AND tasks_fts.rowid >= ?{filters}
+            ORDER BY rank, t.id DESC
+            LIMIT ? OFFSET ?
+        """, [match, oldest, *params, limit, offset])
+        return cursor.fetchall(), min(matches, window), matches > window
+
+    def counters(self, cursor) -> dict:
+        return StatsService.get_counters(cursor, self.schema)
+
+    def insert(self, cursor, items: list, created_by: int, now: str) -> list:
+        if not items:
+            return []
+        rows = [
+            (
+                item.get("title"),
+                item.get("description"),
+                item["status"],
+                item["priority"],
+                item.get("due_date"),
+                to_timestamp(item.get("due_date")),
+                item.get("assigned_to"),
+                created_by,
+                now,
+                now
+            )
+            for item in items
+        ]
+        columns = """
+            title, description, status, priority, due_date, due_ts,
+            assigned_to, created_by, created_at, updated_at
+        """
+        if self.id_stride is None:
+            cursor.executemany(f"""
+                INSERT INTO {self.schema}.tasks ({columns})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            # AUTOINCREMENT ids are contiguous while this transaction holds the write lock
+            cursor.execute("SELECT last_insert_rowid()")
+            last_id = cursor.fetchone()[0]
+            ids = list(range(last_id - len(items) + 1, last_id + 1))
+        else:
+            ids = self._allocate_ids(cursor, len(items))
+            cursor.executemany(f"""
+                INSERT INTO {self.schema}.tasks (id, {columns})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(task_id, *row) for task_id, row in zip(ids, rows)])
+
+        deltas = Counter()
+        for item in items:
+            deltas.update(StatsService.counter_deltas(None, item))
+        StatsService.apply(cursor, deltas, self.schema)
+        return ids
+
+    def insert_stored(self, cursor, tasks: list):
+        """Insert complete stored task dicts, ids included, and update the counters"""
+        placeholders = ", ".join("?" * len(STORED_COLUMNS))
+        cursor.executemany(
+            f"INSERT INTO {self.schema}.tasks ({', '.join(STORED_COLUMNS)}) VALUES ({placeholders})",
+            [tuple(task[column] for column in STORED_COLUMNS) for task in tasks]
+        )
+        deltas = Counter()
+        for task in tasks:
+            deltas.update(StatsService.counter_deltas(None, task))
+        StatsService.apply(cursor, deltas, self.schema)
+
+    def update(self, cursor, changes: list):
+        if not changes:
+            return
+        for existing, updated in changes:
+            reset_due_flags(existing, updated)
+        assignments = ", ".join(f"{column} = ?" for column in UPDATED_COLUMNS)
+        cursor.executemany(
+            f"UPDATE {self.schema}.tasks SET {assignments} WHERE id = ?",
+            [(*(updated[column] for column in UPDATED_COLUMNS), updated["id"]) for _, updated in changes]
+        )
+        deltas = Counter()
+        for existing, updated in changes:
+            deltas.update(StatsService.counter_deltas(existing, updated))
+        StatsService.apply(cursor, deltas, self.schema)
+
+    def delete(self, cursor, tasks: list):
+        if not tasks:
+            return
+        cursor.executemany(
+            f"DELETE FROM {self.schema}.tasks WHERE id = ?",
+            [(task["id"],) for task in tasks]
+        )
+        deltas = Counter()
+        for task in tasks:
+            deltas.update(StatsService.counter_deltas(task, None))
+        StatsService.apply(cursor, deltas, self.schema)
+
+    def export_rows(self, cursor, columns: tuple, after_id: int, limit: int) -> list:
+        cursor.execute(
+            f"SELECT {', '.join(columns)} FROM {self.schema}.tasks WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        )
+        return cursor.fetchall()
+
+    # Change log of this partition (used by SyncService)
+
+    def change_bounds(self, cursor) -> tuple:
+        """``(first_seq, last_seq)`` of the change log; both None when it is empty"""
+        # Separate subqueries so each aggregate is a single index probe
+        cursor.execute(f"""
+            SELECT (SELECT MIN(seq) FROM {self.schema}.task_changes),
+                   (SELECT MAX(seq) FROM {self.schema}.task_changes)
+        """)
+        return tuple(cursor.fetchone())
+
+    def change_entries(self, cursor, since_seq: int, user_id: int, role: str, limit: int) -> list:
+        """Change-log rows after ``since_seq`` that concern the caller, in seq order"""
+        if role == "admin":
+            cursor.execute(f"""
+                SELECT seq, task_id, changed_at FROM {self.schema}.task_changes
+                WHERE seq > ?
+                ORDER BY seq
+                LIMIT ?
+            """, (since_seq, limit))
+        else:
+            # previous_assigned_to is only set when the assignee changed,
+            # so the two branches never return the same row
+            cursor.execute(f"""
+                SELECT seq, task_id, changed_at FROM {self.schema}.task_changes
+                WHERE assigned_to = ? AND seq > ?
+                UNION ALL
+                SELECT seq, task_id, changed_at FROM {self.schema}.task_changes
+                WHERE previous_assigned_to = ? AND seq > ?
+                ORDER BY seq
+                LIMIT ?
+            """, (user_id, since_seq, user_id, since_seq, limit))
+        return cursor.fetchall()
+
+    def version(self, cursor, user_id: int, role: str) -> tuple:
+        """Index probes that change whenever the caller's view of this partition does"""
+        if role == "admin":
+            cursor.execute(f"""
+                SELECT (SELECT MIN(seq) FROM {self.schema}.task_changes),
+                       (SELECT MAX(seq) FROM {self.schema}.task_changes),
+                       (SELECT MIN(due_ts) FROM {self.schema}.tasks
+                        WHERE status != 'done' AND due_ts > {NOW_TS_SQL})
+            """)
+        else:
+            cursor.execute(f"""
+                SELECT (SELECT MIN(seq) FROM {self.schema}.task_changes),
+                       (SELECT MAX(seq) FROM {self.schema}.task_changes WHERE assigned_to = ?),
+                       (SELECT MAX(seq) FROM {self.schema}.task_changes WHERE previous_assigned_to = ?),
+                       (SELECT MIN(due_ts) FROM {self.schema}.tasks
+                        WHERE assigned_to = ? AND status != 'done' AND due_ts > {NOW_TS_SQL})
+            """, (user_id, user_id, user_id))
+        return tuple(cursor.fetchone())
+
+    def prune_changes(self, cursor, cutoff: str) -> int:
+        # The newest row always stays so the current token survives pruning
+        cursor.execute(f"""
+            DELETE FROM {self.schema}.task_changes
+            WHERE changed_at < ?
+            AND seq < (SELECT MAX(seq) FROM {self.schema}.task_changes)
+        """, (cutoff,))
+        return cursor.rowcount
+
+    # Due-date notifications of this partition (used by ReminderService)
+
+    def mark_overdue(self, cursor, now_ts: int, marked_at: str, limit: int) -> list:
+        """
+        Flag up to ``limit`` open tasks whose due date passed since they were
+        last swept; returns their ``(id, assigned_to)`` rows. Only unflagged
+        tasks are in idx_tasks_overdue_pending, so this reads the newly
+        overdue tasks, however many have been flagged before. The flag is a
+        task change, so delta sync picks up the new ``is_overdue``.
+        """
+        cursor.execute(f"""
+            UPDATE {self.schema}.tasks SET overdue_marked_at = ?
+            WHERE id IN (
+                SELECT id FROM {self.schema}.tasks
+                WHERE status != 'done' AND overdue_marked_at IS NULL
+                AND due_ts IS NOT NULL AND due_ts < ?
+                ORDER BY due_ts
+                LIMIT ?
+            )
+            RETURNING id, assigned_to
+        """, (marked_at, now_ts, limit))
+        return cursor.fetchall()
+
+    def mark_reminders(self, cursor, now_ts: int, until_ts: int, sent_at: str, limit: int) -> list:
+        """
+        Flag up to ``limit`` open tasks due between ``now_ts`` and
+        ``until_ts`` that have had no reminder; returns their
+        ``(id, assigned_to, title, due_date)`` rows. The change log ignores
+        this flag.
+        """
+        cursor.execute(f"""
+            UPDATE {self.schema}.tasks SET reminder_sent_at = ?
+            WHERE id IN (
+                SELECT id FROM {self.schema}.tasks
+                WHERE status != 'done' AND reminder_sent_at IS NULL
+                AND due_ts IS NOT NULL AND due_ts >= ? AND due_ts < ?
+                ORDER BY due_ts
+                LIMIT ?
+            )
+            RETURNING id, assigned_to, title, due_date
+        """, (sent_at, now_ts, until_ts, limit))
+        return cursor.fetchall()
+
+    def _allocate_ids(self, cursor, count: int) -> list:
+        cursor.execute(
+            f"UPDATE {self.schema}.task_ids SET last = last + ? WHERE id = 1 RETURNING last",
+            (count,)
+        )
+        last = cursor.fetchone()[0]
+        return [n * self.id_stride + self.id_offset for n in range(last - count + 1, last + 1)]
+
+
+class ShardedTaskRepository(TaskRepository):
+    """
+    Tasks partitioned by assignee over several attached databases.
+
+    A task lives on shard ``assigned_to % len(schemas)`` (unassigned tasks
+    on the first) and is moved, keeping its id, when a reassignment crosses
+    shards. SQLite commits each attached WAL file separately, so such a move
+    is not atomic if the process dies mid-commit. Lookups by id probe every
+    shard's primary key; reads that cannot be routed to one shard run on
+    all of them and are merged.
+    """
+
+    def __init__(self, schemas: list):
+        self.shards = tuple(
+            SQLiteTaskRepository(schema, id_stride=len(schemas), id_offset=index)
+            for index, schema in enumerate(schemas)
+        )
+
+    @property
+    def partitions(self):
+        return self.shards
+
+    def shard_for(self, assigned_to: int = None) -> SQLiteTaskRepository:
+        if not assigned_to:
+            return self.shards[0]
+        return self.shards[assigned_to % len(self.shards)]
+
+    def _targets(self, assigned_to: int = None) -> tuple:
+        return self.shards if assigned_to is None else (self.shard_for(assigned_to),)
+
+    def get(self, cursor, task_ids) -> dict:
+        task_ids = list(task_ids)
+        tasks = {}
+        for shard in self.shards:
+            tasks.update(shard.get(cursor, task_ids))
+        return tasks
+
+    def get_rows(self, cursor, task_ids) -> dict:
+        task_ids = list(task_ids)
+        rows = {}
+        for shard in self.shards:
+            rows.update(shard.get_rows(cursor, task_ids))
+        return rows
+
+    def select(self, cursor, conditions=(), params=(), limit: int = None, offset: int = 0,
+               assigned_to: int = None) -> list:
+        targets = self._targets(assigned_to)
+        if len(targets) == 1:
+            return targets[0].select(cursor, conditions, params, limit, offset)
+
+        # Every shard returns its own first offset + limit rows in order
+        window = None if limit is None else offset + limit
+        merged = heapq.merge(
+            *(shard.select(cursor, conditions, params, window) for shard in targets),
+            key=_newest_first,
+            reverse=True
+        )
+        return list(islice(merged, offset, window))
+
+    def count(self, cursor, conditions=(), params=(), assigned_to: int = None) -> int:
+        return sum(shard.count(cursor, conditions, params) for shard in self._targets(assigned_to))
+
+    def search(self, cursor, match: str, conditions=(), params=(), limit: int = 20, offset: int = 0,
+               assigned_to: int = None) -> tuple:
+        targets = self._targets(assigned_to)
+        if len(targets) == 1:
+            return targets[0].search(cursor, match, conditions, params, limit, offset)
+
+        # bm25 weighs terms by each shard's own statistics, which are close
+        # to the global ones once shards hold more than a handful of tasks.
+        # Each shard ranks its own window, so ``total`` can reach
+        # SEARCH_RANK_WINDOW times the shard count.
+        results = [shard.search(cursor, match, conditions, params, offset + limit) for shard in targets]
+        merged = heapq.merge(*(rows for rows, _, _ in results), key=_best_match)
+        return (
+            list(islice(merged, offset, offset + limit)),
+            sum(total for _, total, _ in results),
+            any(truncated for _, _, truncated in results)
+        )
+
+    def counters(self, cursor) -> dict:
+        merged = {scope: {} for scope in COUNTER_SCOPES}
+        for shard in self.shards:
+            for scope, values in shard.counters(cursor).items():
+                totals = merged.setdefault(scope, {})
+                for key, count in values.items():
+                    totals[key] = totals.get(key, 0) + count
+        # Key order as a single task_counters table returns it
+        return {scope: dict(sorted(totals.items())) for scope, totals in merged.items()}
+
+    def insert(self, cursor, items: list, created_by: int, now: str) -> list:
+        positions = defaultdict(list)
+        for position, item in enumerate(items):
+            positions[self.shard_for(item.get("assigned_to"))].append(position)
+
+        ids = [None] * len(items)
+        for shard, shard_positions in positions.items():
+            shard_ids = shard.insert(cursor, [items[position] for position in shard_positions], created_by, now)
+            for position, task_id in zip(shard_positions, shard_ids):
+                ids[position] = task_id
+        return ids
+
+    def update(self, cursor, changes: list):
+        pending = defaultdict(list)
+        for existing, updated in changes:
+            source = self.shard_for(existing["assigned_to"])
+            target = self.shard_for(updated["assigned_to"])
+            if source is target:
+                pending[source].append((existing, updated))
+                continue
+            # Earlier changes may touch the same task, so they are written first
+            self._flush_updates(cursor, pending)
+            reset_due_flags(existing, updated)
+            source.delete(cursor, [existing])
+            target.insert_stored(cursor, [updated])
+        self._flush_updates(cursor, pending)
+
+    def delete(self, cursor, tasks: list):
+        grouped = defaultdict(list)
+        for task in tasks:
+            grouped[self.shard_for(task["assigned_to"])].append(task)
+        for shard, shard_tasks in grouped.items():
+            shard.delete(cursor, shard_tasks)
+
+    def export_rows(self, cursor, columns: tuple, after_id: int, limit: int) -> list:
+        merged = heapq.merge(
+            *(shard.export_rows(cursor, columns, after_id, limit) for shard in self.shards),
+            key=lambda row: row[0]
+        )
+        return list(islice(merged, limit))
+
+    @staticmethod
+    def _flush_updates(cursor, pending: dict):
+        for shard, shard_changes in pending.items():
+            shard.update(cursor, shard_changes)
+        pending.clear()
+
+
+def create_task_repository() -> TaskRepository:
+    """Repository for the configured ``STORAGE_BACKEND``"""
+    schemas = [schema for schema, _ in shard_files()]
+    if schemas:
+        return ShardedTaskRepository(schemas)
+    return SQLiteTaskRepository()
+
+
+task_repository = create_task_repository()
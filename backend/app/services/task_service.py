@@ -1,28 +1,59 @@
+import base64
+import json
+import re
 from datetime import datetime
 from app.database import get_db
+from app.services.task_repository import task_repository, task_from_row, IN_CHUNK_SIZE, OVERDUE_SQL
+from app.services.audit_service import AuditService, audit_entry, task_snapshot, task_diff
+from app.utils.events import event_hub, task_event
+from app.utils.response_cache import response_cache
+from app.utils.dates import to_timestamp
+from app.metrics import instrument_service
 from fastapi import HTTPException
 
 # Allowed enums (recommended for consistency)
 TASK_STATUSES = {"todo", "in-progress", "done"}
 TASK_PRIORITIES = {"low", "medium", "high"}
 
+MAX_PAGE_SIZE = 500
 
+# Search input is reduced to word tokens, so no FTS5 query syntax gets through
+SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 16
+
+# Fields a bulk update item may change
+BULK_UPDATE_FIELDS = ("title", "description", "status", "priority", "due_date", "assigned_to")
+
+
+def encode_cursor(created_at: str, task_id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a task"""
+    raw = json.dumps([created_at, task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def search_match(query: str) -> str:
+    """
+    FTS5 query matching tasks that contain every word of ``query``, each
+    as a prefix ("log in" finds "login page"). Empty when it has no words.
+    """
+    terms = SEARCH_TERM.findall(query)[:MAX_SEARCH_TERMS]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+@instrument_service
 class TaskService:
 
     @staticmethod
     def create_task(task_data: dict, created_by: int):
         assigned_id = task_data.get("assigned_to")
-
-        if assigned_id:
-            with get_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM users WHERE id = ?", (assigned_id,))
-                if not cursor.fetchone():
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Assigned user with ID {assigned_id} does not exist"
-                    )
-
         status = task_data.get("status", "todo")
         priority = task_data.get("priority", "medium")
 
@@ -38,101 +69,211 @@ class TaskService:
                 detail=f"Priority must be one of {TASK_PRIORITIES}"
             )
 
+        # Assignee check, insert and read-back share one connection and transaction
         with get_db() as conn:
             cursor = conn.cursor()
-            now = datetime.utcnow().isoformat()
 
-            cursor.execute("""
-                INSERT INTO tasks (
-                    title, description, status, priority, due_date,
-                    assigned_to, created_by, created_at, updated_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                task_data.get("title"),
-                task_data.get("description"),
-                status,
-                priority,
-                task_data.get("due_date"),
-                assigned_id,
-                created_by,
-                now,
-                now
-            ))
-
-            conn.commit()
-            task_id = cursor.lastrowid
-            return TaskService.get_task_by_id(task_id)
+            if assigned_id:
+                cursor.execute("SELECT id FROM users WHERE id = ?", (assigned_id,))
+                if not cursor.fetchone():
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Assigned user with ID {assigned_id} does not exist"
+                    )
+
+            now = datetime.utcnow().isoformat()
+            task_id, = task_repository.insert(cursor, [{
+                **task_data,
+                "status": status,
+                "priority": priority,
+                "assigned_to": assigned_id
+            }], created_by, now)
+
+            task = TaskService.get_task_by_id(task_id)
+            TaskService._after_write([
+                task_event("created", task_id, assigned_id, task=task)
+            ])
+            AuditService.record([
+                audit_entry(created_by, "create", "task", task_id, task_snapshot(task))
+            ])
+            return task
 
     @staticmethod
     def get_task_by_id(task_id: int):
         with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.*, u.name AS assigned_user_name
-                FROM tasks t
-                LEFT JOIN users u ON t.assigned_to = u.id
-                WHERE t.id = ?
-            """, (task_id,))
-
-            task = cursor.fetchone()
+            task = task_repository.get_rows(conn.cursor(), [task_id]).get(task_id)
             if not task:
                 raise HTTPException(status_code=404, detail="Task not found")
 
-            task_dict = dict(task)
-            task_dict["is_overdue"] = TaskService._check_overdue(task_dict)
-            return task_dict
+            return task_from_row(task)
 
     @staticmethod
     def get_all_tasks(user_id: int = None, role: str = None):
+        return TaskService.list_tasks(user_id=user_id, role=role)["tasks"]
+
+    @staticmethod
+    def list_tasks(
+        user_id: int = None,
+        role: str = None,
+        status: str = None,
+        priority: str = None,
+        assigned_to: int = None,
+        due_after: str = None,
+        due_before: str = None,
+        overdue: bool = None,
+        limit: int = None,
+        cursor: str = None,
+        convert_rows=None
+    ):
+        """
+        Filtered task list ordered by (created_at, id) descending.
+
+        With ``limit`` the result is one keyset page and ``next_cursor``
+        points after its last row (None on the last page). Non-admins only
+        ever see tasks assigned to them. Rows become dicts via
+        ``task_from_row`` unless ``convert_rows`` builds the list instead.
+        """
+        if status is not None and status not in TASK_STATUSES:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Status must be one of {TASK_STATUSES}"
+            )
+        if priority is not None and priority not in TASK_PRIORITIES:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Priority must be one of {TASK_PRIORITIES}"
+            )
+
+        conditions = []
+        params = []
+
+        # The only assignee the page can contain, if any; sharded storage
+        # then reads a single shard
+        scope = assigned_to if role == "admin" else user_id
+        if role != "admin" or assigned_to is not None:
+            conditions.append("t.assigned_to = ?")
+            params.append(scope)
+
+        if status is not None:
+            conditions.append("t.status = ?")
+            params.append(status)
+        if priority is not None:
+            conditions.append("t.priority = ?")
+            params.append(priority)
+        if due_after is not None:
+            conditions.append("t.due_ts >= ?")
+            params.append(TaskService._filter_timestamp(due_after))
+        if due_before is not None:
+            conditions.append("t.due_ts < ?")
+            params.append(TaskService._filter_timestamp(due_before))
+        if overdue is True:
+            conditions.append(f"({OVERDUE_SQL})")
+        elif overdue is False:
+            conditions.append(f"NOT ({OVERDUE_SQL})")
+
+        if cursor:
+            conditions.append("(t.created_at, t.id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        if limit is not None:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+
         with get_db() as conn:
-            cursor = conn.cursor()
+            # Fetch one extra row to learn whether another page exists
+            rows = task_repository.select(
+                conn.cursor(), conditions, params,
+                limit=None if limit is None else limit + 1,
+                assigned_to=scope
+            )
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+
+        tasks = convert_rows(rows) if convert_rows else [task_from_row(row) for row in rows]
+        return {"tasks": tasks, "next_cursor": next_cursor}
+
+    @staticmethod
+    def search_tasks(
+        query: str,
+        user_id: int = None,
+        role: str = None,
+        status: str = None,
+        priority: str = None,
+        assigned_to: int = None,
+        limit: int = 20,
+        offset: int = 0
+    ):
+        """
+        Tasks whose title or description contains every word of ``query``,
+        best BM25 match first, each with a highlighted ``snippet``. Filters
+        run in the same statement; non-admins only ever search their own
+        tasks, so ``assigned_to`` only applies to admins.
+
+        Only the ``SEARCH_RANK_WINDOW`` newest matches are ranked and can be
+        paged through. ``total`` counts those; ``truncated`` is true when
+        older matches were left out, and a narrower query reaches them.
+        """
+        match = search_match(query)
+        if not match:
+            raise HTTPException(status_code=422, detail="Search query must contain at least one word")
+        if status is not None and status not in TASK_STATUSES:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Status must be one of {TASK_STATUSES}"
+            )
+        if priority is not None and priority not in TASK_PRIORITIES:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Priority must be one of {TASK_PRIORITIES}"
+            )
 
-            if role == "admin":
-                cursor.execute("""
-                    SELECT t.*, u.name AS assigned_user_name
-                    FROM tasks t
-                    LEFT JOIN users u ON t.assigned_to = u.id
-                    ORDER BY t.created_at DESC
-                """)
-            else:
-                cursor.execute("""
-                    SELECT t.*, u.name AS assigned_user_name
-                    FROM tasks t
-                    LEFT JOIN users u ON t.assigned_to = u.id
-                    WHERE t.assigned_to = ?
-                    ORDER BY t.created_at DESC
-                """, (user_id,))
-
-            tasks = cursor.fetchall()
-            result = []
-
-            for task in tasks:
-                task_dict = dict(task)
-                task_dict["is_overdue"] = TaskService._check_overdue(task_dict)
-                result.append(task_dict)
-
-            return result
+        conditions = []
+        params = []
+
+        scope = assigned_to if role == "admin" else user_id
+        if role != "admin" or assigned_to is not None:
+            conditions.append("t.assigned_to = ?")
+            params.append(scope)
+        if status is not None:
+            conditions.append("t.status = ?")
+            params.append(status)
+        if priority is not None:
+            conditions.append("t.priority = ?")
+            params.append(priority)
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with get_db() as conn:
+            # One extra row tells whether another page exists
+            rows, total, truncated = task_repository.search(
+                conn.cursor(), match, conditions, params,
+                limit=limit + 1, offset=offset, assigned_to=scope
+            )
+
+        return {
+            "results": [task_from_row(row) for row in rows[:limit]],
+            "has_more": len(rows) > limit,
+            "total": total,
+            "truncated": truncated
+        }
 
     @staticmethod
     def update_task(task_id: int, task_data: dict, user_id: int, role: str):
         with get_db() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-            existing_task = cursor.fetchone()
+            existing = task_repository.get(cursor, [task_id]).get(task_id)
 
-            if not existing_task:
+            if not existing:
                 raise HTTPException(status_code=404, detail="Task not found")
 
-            existing = dict(existing_task)
-
             # Authorization
             if role != "admin" and existing["assigned_to"] != user_id:
                 raise HTTPException(status_code=403, detail="Not authorized")
 
-            update_fields = []
-            values = []
+            changes = {}
             now = datetime.utcnow().isoformat()
 
             for key, value in task_data.items():
@@ -148,89 +289,281 @@ class TaskService:
                             detail=f"Priority must be one of {TASK_PRIORITIES}"
                         )
 
-                    update_fields.append(f"{key} = ?")
-                    values.append(value)
+                    changes[key] = value
 
-            if update_fields:
-                update_fields.append("updated_at = ?")
-                values.append(now)
+            if changes:
+                updated = {**existing, **changes, "updated_at": now}
+                if "due_date" in changes:
+                    updated["due_ts"] = to_timestamp(changes["due_date"])
 
                 # Mark completion time
                 if (
                     task_data.get("status") == "done"
                     and existing["status"] != "done"
                 ):
-                    update_fields.append("completed_at = ?")
-                    values.append(now)
-
-                values.append(task_id)
+                    updated["completed_at"] = now
 
-                query = f"""
-                    UPDATE tasks
-                    SET {', '.join(update_fields)}
-                    WHERE id = ?
-                """
-                cursor.execute(query, values)
+                task_repository.update(cursor, [(existing, updated)])
+                diff = task_diff(existing, updated)
+                if diff:
+                    AuditService.record([audit_entry(user_id, "update", "task", task_id, diff)])
 
-            return TaskService.get_task_by_id(task_id)
+            task = TaskService.get_task_by_id(task_id)
+            if changes:
+                TaskService._after_write([
+                    task_event("updated", task_id, task["assigned_to"], existing["assigned_to"], task=task)
+                ])
+            return task
 
     @staticmethod
-    def delete_task(task_id: int):
+    def delete_task(task_id: int, user_id: int = None):
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            existing = task_repository.get(cursor, [task_id]).get(task_id)
 
-            if cursor.rowcount == 0:
+            if not existing:
                 raise HTTPException(status_code=404, detail="Task not found")
 
+            task_repository.delete(cursor, [existing])
+            TaskService._after_write([
+                task_event("deleted", task_id, existing["assigned_to"])
+            ])
+            AuditService.record([
+                audit_entry(user_id, "delete", "task", task_id, task_snapshot(existing))
+            ])
+
             return {"message": "Task deleted successfully"}
 
     @staticmethod
-    def _check_overdue(task: dict) -> bool:
-
-        # Completed tasks are never overdue - FIXED: Check for 'done' not 'completed'
-        if task.get("status") == "done":
-            return False
-        
-        # No due date means not overdue
-        due_date_str = task.get("due_date")
-        if not due_date_str:
-            return False
-        
-        try:
-            # Parse the due date string
-            from datetime import datetime
-            
-            # Handle both ISO format with and without timezone
-            if due_date_str.endswith('Z'):
-                due_date_str = due_date_str[:-1]
-            
-            # Remove timezone info if present (e.g., +00:00)
-            if '+' in due_date_str:
-                due_date_str = due_date_str.split('+')[0]
-            
-            # Try to parse the date
-            try:
-                # Try ISO format first
-                due_date = datetime.fromisoformat(due_date_str)
-            except:
-                # If fromisoformat fails, try parsing just the date part
-                if 'T' in due_date_str:
-                    date_part = due_date_str.split('T')[0]
-                    due_date = datetime.strptime(date_part, '%Y-%m-%d')
-                else:
-                    due_date = datetime.strptime(due_date_str, '%Y-%m-%d')
-            
-            # Get current UTC time
-            now = datetime.utcnow()
-            
-            # Task is overdue if current time > due date
-            is_overdue = now > due_date
-            
-            return is_overdue
-            
-        except Exception as e:
-            # If date parsing fails, assume not overdue
-            print(f"Error checking overdue status: {str(e)}")
-            print(f"Due date string: {due_date_str}")
-            return False
\ No newline at end of file
+    def bulk_create_tasks(items: list, created_by: int):
+        """
+        Create many tasks in one transaction.
+
+        Assignees are validated with a single IN lookup and all valid rows
+        are written with one executemany. Invalid items are reported in the
+        per-item results and skipped; they do not abort the batch.
+        """
+        results = [None] * len(items)
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            known_users = TaskService._existing_user_ids(
+                cursor, {item.get("assigned_to") for item in items}
+            )
+
+            valid = []
+            for index, item in enumerate(items):
+                item = {"status": "todo", "priority": "medium", **item}
+                error = TaskService._field_error(item, known_users)
+                if error:
+                    results[index] = TaskService._bulk_result(index, None, error)
+                    continue
+                valid.append((index, item))
+
+            if valid:
+                task_ids = TaskService.insert_tasks(cursor, [item for _, item in valid], created_by)
+                for (index, _), task_id in zip(valid, task_ids):
+                    results[index] = TaskService._bulk_result(index, task_id)
+
+        return TaskService._bulk_summary(results)
+
+    @staticmethod
+    def insert_tasks(cursor, items: list, created_by: int) -> list:
+        """
+        Insert already-validated task dicts in bulk and update the counters.
+        Runs in the caller's transaction; returns the new ids in item order.
+        """
+        now = datetime.utcnow().isoformat()
+        task_ids = task_repository.insert(cursor, items, created_by, now)
+        TaskService._after_write([
+            task_event("created", task_id, item.get("assigned_to"))
+            for task_id, item in zip(task_ids, items)
+        ])
+        AuditService.record([
+            audit_entry(created_by, "create", "task", task_id, task_snapshot(item))
+            for task_id, item in zip(task_ids, items)
+        ])
+        return task_ids
+
+    @staticmethod
+    def bulk_update_tasks(items: list, user_id: int = None):
+        """Apply partial updates (each item carries its task ``id``) in one transaction"""
+        results = [None] * len(items)
+        now = datetime.utcnow().isoformat()
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            current = task_repository.get(cursor, {item["id"] for item in items})
+            known_users = TaskService._existing_user_ids(
+                cursor, {item.get("assigned_to") for item in items}
+            )
+
+            writes = []
+            events = []
+            audits = []
+            for index, item in enumerate(items):
+                task_id = item["id"]
+                existing = current.get(task_id)
+                if existing is None:
+                    results[index] = TaskService._bulk_result(index, task_id, "Task not found")
+                    continue
+
+                changes = {
+                    k: v for k, v in item.items()
+                    if k in BULK_UPDATE_FIELDS and v is not None
+                }
+                updated = {**existing, **changes}
+                error = TaskService._field_error(
+                    updated, known_users if "assigned_to" in changes else None
+                )
+                if error:
+                    results[index] = TaskService._bulk_result(index, task_id, error)
+                    continue
+
+                if changes:
+                    if "due_date" in changes:
+                        updated["due_ts"] = to_timestamp(changes["due_date"])
+                    updated["updated_at"] = now
+                    if updated["status"] == "done" and existing["status"] != "done":
+                        updated["completed_at"] = now
+                    writes.append((existing, updated))
+                    events.append(task_event(
+                        "updated", task_id, updated["assigned_to"], existing["assigned_to"]
+                    ))
+                    diff = task_diff(existing, updated)
+                    if diff:
+                        audits.append(audit_entry(user_id, "update", "task", task_id, diff))
+                    # Later items for the same id build on this state
+                    current[task_id] = updated
+
+                results[index] = TaskService._bulk_result(index, task_id)
+
+            if writes:
+                task_repository.update(cursor, writes)
+                TaskService._after_write(events)
+                AuditService.record(audits)
+
+        return TaskService._bulk_summary(results)
+
+    @staticmethod
+    def bulk_reassign_tasks(task_ids: list, assigned_to: int = None, user_id: int = None):
+        """Assign every task in ``task_ids`` to ``assigned_to`` (None unassigns)"""
+        results = [None] * len(task_ids)
+        now = datetime.utcnow().isoformat()
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            if assigned_to and not TaskService._existing_user_ids(cursor, {assigned_to}):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Assigned user with ID {assigned_to} does not exist"
+                )
+
+            current = task_repository.get(cursor, set(task_ids))
+            writes = []
+            events = []
+            audits = []
+            for index, task_id in enumerate(task_ids):
+                existing = current.get(task_id)
+                if existing is None:
+                    results[index] = TaskService._bulk_result(index, task_id, "Task not found")
+                    continue
+                if existing["assigned_to"] != assigned_to:
+                    updated = {**existing, "assigned_to": assigned_to, "updated_at": now}
+                    writes.append((existing, updated))
+                    events.append(task_event("updated", task_id, assigned_to, existing["assigned_to"]))
+                    audits.append(audit_entry(user_id, "update", "task", task_id, task_diff(existing, updated)))
+                    current[task_id] = updated
+                results[index] = TaskService._bulk_result(index, task_id)
+
+            if writes:
+                task_repository.update(cursor, writes)
+                TaskService._after_write(events)
+                AuditService.record(audits)
+
+        return TaskService._bulk_summary(results)
+
+    @staticmethod
+    def bulk_delete_tasks(task_ids: list, user_id: int = None):
+        """Delete every task in ``task_ids`` in one transaction"""
+        results = [None] * len(task_ids)
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            current = task_repository.get(cursor, set(task_ids))
+            deleted = []
+            events = []
+            audits = []
+            for index, task_id in enumerate(task_ids):
+                existing = current.pop(task_id, None)
+                if existing is None:
+                    results[index] = TaskService._bulk_result(index, task_id, "Task not found")
+                    continue
+                deleted.append(existing)
+                events.append(task_event("deleted", task_id, existing["assigned_to"]))
+                audits.append(audit_entry(user_id, "delete", "task", task_id, task_snapshot(existing)))
+                results[index] = TaskService._bulk_result(index, task_id)
+
+            if deleted:
+                task_repository.delete(cursor, deleted)
+                TaskService._after_write(events)
+                AuditService.record(audits)
+
+        return TaskService._bulk_summary(results)
+
+    @staticmethod
+    def _after_write(events: list):
+        """Once the write commits, push ``events`` to dashboards and evict the cached responses they affect"""
+        event_hub.publish_after_commit(events)
+        response_cache.invalidate_after_commit(events)
+
+    @staticmethod
+    def _chunks(values: list, size: int = IN_CHUNK_SIZE):
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    @staticmethod
+    def _existing_user_ids(cursor, user_ids: set) -> set:
+        """Subset of ``user_ids`` that exist, resolved with IN (...) lookups"""
+        ids = [user_id for user_id in user_ids if user_id]
+        found = set()
+        for chunk in TaskService._chunks(ids):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT id FROM users WHERE id IN ({placeholders})", chunk)
+            found.update(row["id"] for row in cursor.fetchall())
+        return found
+
+    @staticmethod
+    def _field_error(task: dict, known_users: set = None):
+        """
+        Validation message for a task about to be written, or None.
+        The assignee is only checked when ``known_users`` is given.
+        """
+        if task.get("status") not in TASK_STATUSES:
+            return f"Status must be one of {TASK_STATUSES}"
+        if task.get("priority") not in TASK_PRIORITIES:
+            return f"Priority must be one of {TASK_PRIORITIES}"
+        assigned_to = task.get("assigned_to")
+        if known_users is not None and assigned_to and assigned_to not in known_users:
+            return f"Assigned user with ID {assigned_to} does not exist"
+        return None
+
+    @staticmethod
+    def _filter_timestamp(value: str) -> int:
+        due_ts = to_timestamp(value)
+        if due_ts is None:
+            raise HTTPException(status_code=422, detail=f"Invalid date '{value}'")
+        return due_ts
+
+    @staticmethod
+    def _bulk_result(index: int, task_id: int = None, error: str = None) -> dict:
+        return {"index": index, "id": task_id, "success": error is None, "error": error}
+
+    @staticmethod
+    def _bulk_summary(results: list) -> dict:
+        succeeded = sum(1 for result in results if result["success"])
+        return {
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results
+        }
@@ -0,0 +1,247 @@
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.config import settings
+from app.database import get_db, after_commit
+from app.services.audit_service import AuditService, audit_entry
+from app.utils.security import create_access_token, create_refresh_token, hash_refresh_token
+from app.utils.token_denylist import token_denylist
+from app.metrics import instrument_service
+from fastapi import HTTPException, status
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def access_claims(user_dict: dict, session_id: str) -> dict:
+    """Everything request authorization needs, so it never has to load the user row"""
+    return {
+        "sub": user_dict["email"],
+        "uid": user_dict["id"],
+        "name": user_dict["name"],
+        "role": user_dict["role"],
+        "is_superuser": bool(user_dict.get("is_superuser", 0)),
+        "sid": session_id,
+        "typ": "access",
+    }
+
+
+def principal_from_claims(payload: dict) -> dict:
+    """The ``current_user`` of a request, built from a verified access token"""
+    return {
+        "id": payload["uid"],
+        "email": payload["sub"],
+        "name": payload.get("name"),
+        "role": payload.get("role", "user"),
+        "is_superuser": bool(payload.get("is_superuser")),
+        "is_active": 1,
+        "session_id": payload.get("sid"),
+    }
+
+
+@instrument_service
+class TokenService:
+    """
+    Short-lived access tokens plus rotating refresh tokens.
+
+    Access tokens carry the user's id, name and role, and are trusted for
+    authorization without touching the database; revoking one early goes
+    through ``token_denylist``. Refresh tokens are opaque, stored as SHA-256
+    hashes and single-use: each refresh marks the presented token used and
+    issues a new one in the same session. A used token presented again
+    means it was copied, so the whole session is revoked.
+    """
+
+    @staticmethod
+    def issue(cursor, user_dict: dict, session_id: str = None) -> dict:
+        """New access and refresh token for ``user_dict`` (inside the caller's transaction)"""
+        session_id = session_id or uuid.uuid4().hex
+        refresh_token = create_refresh_token()
+        expires_at = int(time.time()) + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        cursor.execute("""
+            INSERT INTO refresh_tokens (token_hash, session_id, user_id, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (hash_refresh_token(refresh_token), session_id, user_dict["id"], datetime.utcnow().isoformat(),
+              expires_at))
+
+        access_token = create_access_token(
+            data=access_claims(user_dict, session_id),
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+
+    @staticmethod
+    def refresh(refresh_token: str) -> dict:
+        """Rotate a refresh token: a new token pair, with role and name re-read from the user row"""
+        now = int(time.time())
+        reused = None
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, session_id, user_id, expires_at, used_at, revoked_at FROM refresh_tokens "
+                "WHERE token_hash = ?",
+                (hash_refresh_token(refresh_token),)
+            )
+            row = cursor.fetchone()
+            if row is None or row["revoked_at"] is not None or row["expires_at"] <= now:
+                raise _unauthorized("Invalid refresh token")
+
+            # The conditional update makes a concurrent second use lose the race
+            cursor.execute(
+                "UPDATE refresh_tokens SET used_at = ? WHERE id = ? AND used_at IS NULL",
+                (datetime.utcnow().isoformat(), row["id"])
+            )
+            if cursor.rowcount == 0:
+                reused = row
+                TokenService._revoke_session(cursor, row["session_id"])
+                AuditService.record([audit_entry(
+                    row["user_id"], "refresh_token_reuse", "user", row["user_id"],
+                    {"session_id": row["session_id"]}
+                )])
+            else:
+                cursor.execute("SELECT * FROM users WHERE id = ?", (row["user_id"],))
+                user = cursor.fetchone()
+                if user is None or not user["is_active"]:
+                    TokenService._revoke_session(cursor, row["session_id"])
+                else:
+                    user_dict = dict(user)
+                    tokens = TokenService.issue(cursor, user_dict, row["session_id"])
+                    return {**tokens, "user": {
+                        "id": user_dict["id"],
+                        "name": user_dict["name"],
+                        "email": user_dict["email"],
+                        "role": user_dict["role"],
+                        "is_superuser": bool(user_dict.get("is_superuser", 0)),
+                        "last_login": user_dict.get("last_login"),
+                    }}
+
+        # Raised after the block so the revocation commits
+        if reused is not None:
+            raise _unauthorized("Refresh token already used; the session has been revoked")
+        raise _unauthorized("Invalid refresh token")
+
+    @staticmethod
+    def logout(session_id: str = None, refresh_token: str = None, user_id: int = None,
+               all_sessions: bool = False) -> dict:
+        """
+        Revoke the session of the presented access token (or refresh token),
+        or with ``all_sessions`` every token ``user_id`` holds.
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            if refresh_token and session_id is None:
+                cursor.execute(
+                    "SELECT session_id, user_id FROM refresh_tokens WHERE token_hash = ?",
+                    (hash_refresh_token(refresh_token),)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    raise _unauthorized("Invalid refresh token")
+                session_id, user_id = row["session_id"], row["user_id"]
+
+            if all_sessions:
+                if user_id is None:
+                    raise _unauthorized("Not authenticated")
+                revoked = TokenService._revoke_user(cursor, user_id)
+            elif session_id:
+                revoked = TokenService._revoke_session(cursor, session_id)
+            else:
+                raise _unauthorized("Not authenticated")
+            if user_id is not None:
+                AuditService.record([audit_entry(
+                    user_id, "logout", "user", user_id, {"all_sessions": all_sessions}
+                )])
+        return {"revoked_refresh_tokens": revoked}
+
+    @staticmethod
+    def _revoke_session(cursor, session_id: str) -> int:
+        cursor.execute(
+            "UPDATE refresh_tokens SET revoked_at = ? WHERE session_id = ? AND revoked_at IS NULL",
+            (datetime.utcnow().isoformat(), session_id)
+        )
+        TokenService._add_revocation(cursor, "session", session_id)
+        return cursor.rowcount
+
+    @staticmethod
+    def _revoke_user(cursor, user_id: int) -> int:
+        cursor.execute(
+            "UPDATE refresh_tokens SET revoked_at = ? WHERE user_id = ? AND revoked_at IS NULL",
+            (datetime.utcnow().isoformat(), user_id)
+        )
+        revoked = cursor.rowcount
+        TokenService._add_revocation(cursor, "user", user_id)
+        return revoked
+
+    @staticmethod
+    def _add_revocation(cursor, kind: str, subject):
+        # Past this point every access token the entry could match has expired
+        revoked_at = round(time.time(), 3)
+        expires_at = int(revoked_at) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 1
+        cursor.execute(
+            "INSERT INTO token_revocations (kind, subject, revoked_at, expires_at) VALUES (?, ?, ?, ?)",
+            (kind, str(subject), revoked_at, expires_at)
+        )
+        after_commit(lambda: token_denylist.add(kind, subject, revoked_at, expires_at))
+
+    @staticmethod
+    def issue_stream_ticket(payload: dict) -> dict:
+        """
+        Single-use ticket standing for the verified access token ``payload``,
+        for URLs that cannot carry an Authorization header (EventSource).
+        Only the ticket, never the token, ends up in access logs.
+        """
+        # Random like a refresh token, so it is stored the same way
+        ticket = create_refresh_token()
+        now = int(time.time())
+        # Never outlives the token it stands for
+        expires_at = min(now + settings.STREAM_TICKET_SECONDS, int(payload.get("exp", now)))
+        with get_db() as conn:
+            conn.cursor().execute(
+                "INSERT INTO stream_tickets (ticket_hash, claims, expires_at) VALUES (?, ?, ?)",
+                (hash_refresh_token(ticket), json.dumps(payload), expires_at)
+            )
+        return {"ticket": ticket, "expires_in": expires_at - now}
+
+    @staticmethod
+    def redeem_stream_ticket(ticket: str):
+        """The access token claims behind ``ticket``, or None; a ticket is redeemed at most once"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM stream_tickets WHERE ticket_hash = ? RETURNING claims, expires_at",
+                (hash_refresh_token(ticket),)
+            )
+            row = cursor.fetchone()
+        if row is None or row["expires_at"] <= time.time():
+            return None
+        return json.loads(row["claims"])
+
+    @staticmethod
+    def reload_denylist():
+        """Pick up revocations made by other server processes"""
+        with get_db() as conn:
+            token_denylist.reload(conn.cursor())
+
+    @staticmethod
+    def prune() -> int:
+        """Delete expired refresh tokens, revocations and stream tickets; returns how many rows went"""
+        now = int(time.time())
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM refresh_tokens WHERE expires_at <= ?", (now,))
+            removed = cursor.rowcount
+            cursor.execute("DELETE FROM token_revocations WHERE expires_at <= ?", (now,))
+            removed += cursor.rowcount
+            cursor.execute("DELETE FROM stream_tickets WHERE expires_at <= ?", (now,))
+            return removed + cursor.rowcount
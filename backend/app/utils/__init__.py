@@ -1,4 +1,5 @@
-from .security import verify_password, get_password_hash, create_access_token, decode_access_token
-from .dependencies import get_current_user, require_admin
+# Submodules are imported where they are used: the password hashing workers
+# load app.utils.passwords, and must not pull in the database layer through here
+from .security import verify_password, verify_and_update_password, get_password_hash, create_access_token, decode_access_token
  
-__all__ = ['verify_password', 'get_password_hash', 'create_access_token', 'decode_access_token', 'get_current_user', 'require_admin']
\ No newline at end of file
+__all__ = ['verify_password', 'verify_and_update_password', 'get_password_hash', 'create_access_token', 'decode_access_token']
\ No newline at end of file
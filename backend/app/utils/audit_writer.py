@@ -0,0 +1,173 @@
+"""
+Background writer for audit records.
+
+Request handlers only put rows on a bounded in-memory queue; a single
+writer thread drains it and inserts whole batches with ``executemany``
+whenever ``batch_size`` rows are waiting or ``flush_interval`` seconds have
+passed. When the queue is full, a ``submit`` call blocks for up to
+``enqueue_timeout`` seconds in total (backpressure); rows still without
+room by then are counted as dropped.
+"""
+import logging
+import queue
+import threading
+import time
+from app.config import settings
+from app.database import get_db
+
+INSERT_SQL = """
+    INSERT INTO audit_logs (user_id, action, entity_type, entity_id, details, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float, enqueue_timeout: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._flushes = 0
+        self._blocked = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread (called on application startup)"""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, rows: list):
+        """
+        Queue audit rows ``(user_id, action, entity_type, entity_id, details, created_at)``.
+        Without a running writer (CLI scripts) the rows are written immediately.
+        """
+        if not rows:
+            return
+        if not self.running:
+            self._write(rows)
+            return
+
+        # One deadline for the whole call, so a large batch waits at most
+        # enqueue_timeout rather than that long per row
+        deadline = None
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self._blocked += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.enqueue_timeout
+                try:
+                    self._queue.put(row, timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Full:
+                    self._dropped += len(rows) - index
+                    logger.warning("Audit queue full: dropped %d records", len(rows) - index)
+                    return
+            self._enqueued += 1
+
+    def flush(self):
+        """Block until every queued row has been written"""
+        if self.running:
+            self._queue.join()
+
+    def stop(self):
+        """Write everything still queued and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "flushes": self._flushes,
+            "blocked": self._blocked,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    # Write what we have, then drain the rest without waiting
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if stopping:
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            try:
+                self._write(batch)
+            finally:
+                # Always acknowledged, so flush() and stop() cannot hang on a failed batch
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, rows: list):
+        # Any failure (database error, pool timeout, ...) costs only its own
+        # chunk; the writer thread keeps running
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            try:
+                with get_db() as conn:
+                    conn.executemany(INSERT_SQL, chunk)
+            except Exception:
+                self._failed += len(chunk)
+                logger.error("Audit write failed for %d records", len(chunk), exc_info=True)
+                continue
+            self._flushes += 1
+            self._written += len(chunk)
+
+
+audit_writer = AuditWriter(
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT,
+)
@@ -0,0 +1,35 @@
+"""
+In-process caches for request authentication.
+
+``token_cache`` maps a raw JWT to its verified payload, so repeated
+requests with the same token skip signature verification.
+``principal_cache`` maps a token subject (email) to the user row, so
+authenticated requests do not query SQLite every time. Anything in the
+server that changes a user row must call ``invalidate_user`` once the
+write commits. The caches are per process: a change made elsewhere (the
+``create_admin`` utility, another worker) is seen once the cached entry
+expires, after at most ``PRINCIPAL_CACHE_TTL`` seconds.
+"""
+from app.config import settings
+from app.utils.cache import TTLCache
+
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL
+)
+
+
+def invalidate_user(email: str):
+    """Drop the cached principal for ``email`` after its user row changed"""
+    principal_cache.pop(email)
+
+
+def cache_stats() -> dict:
+    return {
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+    }
@@ -1,9 +1,17 @@
+"""
+Interactive user management for the task manager database.
+
+Runs in its own process, so it cannot evict a running server's cached
+principals; a server picks up users changed here within
+PRINCIPAL_CACHE_TTL seconds. (New users are never cached before they
+exist, so creating one takes effect at once.)
+"""
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
  
 from app.database import get_db
-from app.utils.security import get_password_hash
+from app.utils.passwords import get_password_hash
 from datetime import datetime
  
 def create_admin_user(name: str, email: str, password: str):
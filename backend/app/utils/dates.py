@@ -0,0 +1,72 @@
+"""
+Due-date parsing shared by every service.
+
+Due dates are normalized when a task is written: ``tasks.due_ts`` holds the
+due instant as UTC epoch seconds, so SQL can filter and index on it. The
+parser here is only needed at write time and for legacy rows whose
+``due_ts`` was never filled in.
+"""
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+# Lenient fallback for strings ``datetime.fromisoformat`` rejects: single-digit
+# fields, more than six fractional digits, "+HHMM" offsets or trailing text
+# after the time (the date part alone is enough).
+_DUE_DATE_RE = re.compile(
+    r"\s*(\d{4})-(\d{1,2})-(\d{1,2})"
+    r"(?:[T ](\d{1,2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?"
+    r"\s*(Z|[+-]\d{2}(?::?\d{2})?)?"
+)
+
+
+def parse_due_date(value) -> Optional[datetime]:
+    """
+    Timezone-aware UTC datetime for a due date, or None if it cannot be
+    parsed. Values without an offset are taken to be UTC.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+    else:
+        text = str(value).strip()
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            parsed = _parse_lenient(text)
+            if parsed is None:
+                return None
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def to_timestamp(value) -> Optional[int]:
+    """UTC epoch seconds for a due date (the ``tasks.due_ts`` value), or None"""
+    parsed = parse_due_date(value)
+    return int(parsed.timestamp()) if parsed is not None else None
+
+
+def _parse_lenient(text: str) -> Optional[datetime]:
+    match = _DUE_DATE_RE.match(text)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    try:
+        parsed = datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            int((fraction or "0")[:6].ljust(6, "0"))
+        )
+    except ValueError:
+        return None
+
+    if offset and offset != "Z":
+        digits = offset[1:].replace(":", "")
+        delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:4] or 0))
+        parsed = parsed.replace(tzinfo=timezone(delta if offset[0] == "+" else -delta))
+    return parsed
@@ -1,30 +1,111 @@
-from fastapi import Depends, HTTPException, status
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from app.utils.security import decode_access_token
+from app.utils.auth_cache import token_cache, principal_cache
+from app.utils.token_denylist import token_denylist
+from app.services.token_service import TokenService, principal_from_claims
 from app.database import get_db
+from app.utils.executors import run_db
  
 # Change from HTTPBearer to OAuth2PasswordBearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
  
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     """Get current authenticated user"""
-    payload = decode_access_token(token)
-    
+    return await _authenticate(token)
+ 
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified, unrevoked payload of the request's access token"""
+    return _verified_payload(token)
+ 
+async def get_stream_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(None)
+):
+    """
+    Authenticated user for streaming endpoints. Browsers' EventSource cannot
+    set headers, so it passes a single-use ``?ticket=`` from
+    ``POST /api/tasks/events/ticket`` instead; access tokens are never
+    accepted in the URL, where access logs would keep them.
+    """
+    if token:
+        return await _authenticate(token)
+    payload = await run_db(TokenService.redeem_stream_ticket, ticket) if ticket else None
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # The token behind the ticket may have been revoked since it was issued
+    if token_denylist.is_revoked(payload):
+        raise _credentials_error()
+    return await _principal(payload)
+ 
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """Authenticated user if the request carries a valid token, else None"""
+    if not token:
+        return None
+    try:
+        return await _authenticate(token)
+    except HTTPException:
+        return None
+ 
+async def _authenticate(token: str) -> dict:
+    return await _principal(_verified_payload(token))
+ 
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+ 
+def _verified_payload(token: str) -> dict:
+    """Payload of a valid, unexpired and unrevoked token, else 401"""
+    payload = _decode_token(token)
+    if payload is None or payload.get("sub") is None or token_denylist.is_revoked(payload):
+        raise _credentials_error()
+    return payload
+ 
+async def _principal(payload: dict) -> dict:
+    """The ``current_user`` for a verified token payload"""
+    # Access tokens carry everything authorization needs: no user row lookup
+    if payload.get("typ") == "access" and "uid" in payload:
+        return principal_from_claims(payload)
     
-    email: str = payload.get("sub")
-    if email is None:
+    # Tokens issued before claims-based authorization: load the user
+    email = payload["sub"]
+    user = principal_cache.get(email)
+    if user is None:
+        user = await run_db(_load_user, email)
+        principal_cache.set(email, user)
+    # Claims-based tokens stop being issued for a disabled user at the next
+    # refresh; older tokens are checked against the row
+    if not user.get("is_active", 1):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled"
         )
+    return dict(user)
+ 
+def _decode_token(token: str):
+    """Verified JWT payload, served from the token cache until the token expires"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     
+    payload = decode_access_token(token)
+    if payload is not None:
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            token_cache.set(token, payload, ttl=remaining)
+    return payload
+ 
+def _load_user(email: str) -> dict:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
@@ -38,7 +119,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         
         return dict(user)
  
-def require_admin(current_user: dict = Depends(get_current_user)):
+async def require_admin(current_user: dict = Depends(get_current_user)):
     """Require admin role"""
     if current_user.get("role") != "admin":
         raise HTTPException(
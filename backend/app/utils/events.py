@@ -0,0 +1,210 @@
+"""
+In-process pub/sub for live task events.
+
+Services publish from database worker threads once their transaction has
+committed; the hub hands the events to the event loop, which routes each one
+only to the subscribers allowed to see it (every admin, plus the task's
+current and previous assignee). Each subscriber has a bounded queue keyed by
+task id: repeated events for one task coalesce into the newest, and a
+subscriber that falls too far behind has its queue dropped and receives a
+single ``resync`` event telling it to catch up through the delta-sync API.
+"""
+import asyncio
+import json
+from collections import OrderedDict, defaultdict
+from app.config import settings
+from app.database import after_commit
+
+RESYNC_FRAME = 'event: resync\ndata: {"type": "resync"}\n\n'
+
+
+def encode_frame(event: dict) -> str:
+    """Server-Sent Events frame for ``event``"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def task_event(event_type: str, task_id: int, assigned_to: int = None,
+               previous_assigned_to: int = None, task: dict = None) -> dict:
+    """
+    Task event as published by the services. ``task`` carries the full task
+    when the service already has it; otherwise clients fetch the change.
+    """
+    event = {"type": event_type, "task_id": task_id, "assigned_to": assigned_to}
+    if previous_assigned_to is not None and previous_assigned_to != assigned_to:
+        event["previous_assigned_to"] = previous_assigned_to
+    if task is not None:
+        event["task"] = task
+    return event
+
+
+class Subscription:
+    """One connected client; only touched from the event loop thread"""
+
+    def __init__(self, user_id: int, is_admin: bool, maxsize: int):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.maxsize = maxsize
+        self.closed = False
+        self.resync = False
+        self.coalesced = 0
+        self.overflows = 0
+        self._pending = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def put(self, task_id: int, frame: str):
+        if self.closed:
+            return
+        if task_id in self._pending:
+            # Only the newest state of a task matters to the client
+            self.coalesced += 1
+            del self._pending[task_id]
+        elif self.resync:
+            # Already told to resync; nothing queued is needed
+            return
+        elif len(self._pending) >= self.maxsize:
+            self.overflows += 1
+            self._pending.clear()
+            self.resync = True
+            self._ready.set()
+            return
+        self._pending[task_id] = frame
+        self._ready.set()
+
+    def request_resync(self):
+        if not self.closed:
+            self._pending.clear()
+            self.resync = True
+            self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float):
+        """
+        Everything queued as one chunk of frames; "" when ``timeout`` passes
+        with nothing to send, None once the subscription is closed.
+        """
+        if not self._pending and not self.resync and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return ""
+        self._ready.clear()
+        if self.closed:
+            return None
+
+        if self.resync:
+            self.resync = False
+            return RESYNC_FRAME
+        frames = "".join(self._pending.values())
+        self._pending.clear()
+        return frames
+
+
+class EventHub:
+    def __init__(self, queue_size: int, broadcast_limit: int):
+        self.queue_size = queue_size
+        self.broadcast_limit = broadcast_limit
+        self._loop = None
+        self._admins = set()
+        self._users = defaultdict(set)
+        self._published = 0
+
+    def bind(self, loop):
+        """Attach the hub to the running event loop (called on startup)"""
+        self._loop = loop
+
+    def publish(self, events: list):
+        """
+        Queue ``events`` for delivery. Safe to call from any thread; a no-op
+        when no event loop is bound (CLI scripts, tests without startup).
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not events:
+            return
+
+        if len(events) > self.broadcast_limit:
+            # Large batches (imports, bulk edits) become a single resync
+            loop.call_soon_threadsafe(self._broadcast_resync)
+            return
+
+        # Frames are encoded here, on the publishing worker thread, so the
+        # event loop only routes strings.
+        routed = []
+        for event in events:
+            previous = event.get("previous_assigned_to")
+            removed = None
+            if previous is not None:
+                removed = encode_frame({"type": "deleted", "task_id": event["task_id"]})
+            routed.append((event["task_id"], event.get("assigned_to"), encode_frame(event), previous, removed))
+        loop.call_soon_threadsafe(self._dispatch, routed)
+
+    def publish_after_commit(self, events: list):
+        """Publish ``events`` once the current transaction commits"""
+        if events:
+            after_commit(lambda: self.publish(events))
+
+    def subscribe(self, user_id: int, role: str) -> Subscription:
+        subscription = Subscription(user_id, role == "admin", self.queue_size)
+        if subscription.is_admin:
+            self._admins.add(subscription)
+        else:
+            self._users[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        if subscription.is_admin:
+            self._admins.discard(subscription)
+            return
+        subscribers = self._users.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._users[subscription.user_id]
+
+    def close(self):
+        """Close every subscription so open streams finish"""
+        for subscription in list(self._subscriptions()):
+            subscription.close()
+        self._admins.clear()
+        self._users.clear()
+
+    def stats(self) -> dict:
+        subscriptions = list(self._subscriptions())
+        return {
+            "subscribers": len(subscriptions),
+            "admin_subscribers": len(self._admins),
+            "published": self._published,
+            "queued": sum(len(s._pending) for s in subscriptions),
+            "coalesced": sum(s.coalesced for s in subscriptions),
+            "overflows": sum(s.overflows for s in subscriptions),
+        }
+
+    def _subscriptions(self):
+        yield from self._admins
+        for subscribers in self._users.values():
+            yield from subscribers
+
+    def _dispatch(self, routed: list):
+        for task_id, assigned_to, frame, previous, removed in routed:
+            self._published += 1
+            for subscription in self._admins:
+                subscription.put(task_id, frame)
+            for subscription in self._users.get(assigned_to, ()):
+                subscription.put(task_id, frame)
+            if previous is not None:
+                # From the previous assignee's point of view the task is gone
+                for subscription in self._users.get(previous, ()):
+                    subscription.put(task_id, removed)
+
+    def _broadcast_resync(self):
+        for subscription in self._subscriptions():
+            subscription.request_resync()
+
+
+event_hub = EventHub(
+    queue_size=settings.EVENT_QUEUE_SIZE,
+    broadcast_limit=settings.EVENT_BROADCAST_LIMIT,
+)
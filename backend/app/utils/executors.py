@@ -0,0 +1,123 @@
+"""
+Bounded worker pools for blocking work called from async route handlers.
+
+SQLite access runs on the database pool and password hashing on its own
+pool, so a burst of logins can only occupy the hashing workers and never
+delays task reads queued for the database workers.
+
+Hashing runs in worker processes by default (``HASH_POOL=process``), so
+concurrent logins use every core whatever the bcrypt binding does with the
+GIL. The pool is started on first use (or by ``start_hash_pool`` at
+startup), and callers beyond ``HASH_QUEUE_SIZE`` waiting ones are turned
+away with 503 instead of piling up behind a login storm.
+"""
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.config import settings
+from app.profiling import profile_var
+
+HASH_POOLS = ("process", "thread")
+
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_WORKERS,
+    thread_name_prefix="db-worker"
+)
+
+_hash_executor = None
+_hash_lock = threading.Lock()
+_hash_slots = None
+
+
+def hash_executor():
+    """The password hashing pool, created on first use"""
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            if settings.HASH_POOL not in HASH_POOLS:
+                raise ValueError(f"HASH_POOL must be one of {HASH_POOLS}")
+            if settings.HASH_POOL == "process":
+                # spawn: forking a process that already runs threads is unsafe
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=settings.HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.HASH_WORKERS,
+                    thread_name_prefix="hash-worker"
+                )
+        return _hash_executor
+
+
+def start_hash_pool():
+    """Start every hashing worker now, so the first logins do not pay for it"""
+    executor = hash_executor()
+    for _ in range(settings.HASH_WORKERS):
+        executor.submit(int)
+
+
+async def run_in_executor(executor, func, *args, **kwargs):
+    """Run ``func`` on ``executor`` with the caller's context variables"""
+    loop = asyncio.get_running_loop()
+    profile = profile_var.get()
+    if profile is not None:
+        # Sample the worker's stack for the request while it runs this call
+        func = functools.partial(profile.run_in_thread, func)
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
+
+async def run_db(func, *args, **kwargs):
+    """Run blocking database work on the database worker pool"""
+    return await run_in_executor(db_executor, func, *args, **kwargs)
+
+
+async def run_hash(func, *args, **kwargs):
+    """
+    Run password hashing / verification on the hashing pool. ``func`` and
+    its arguments must be picklable for the process pool (module-level
+    functions of ``app.utils.passwords``, which workers can import without
+    loading the rest of the app).
+    """
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.HASH_WORKERS + settings.HASH_QUEUE_SIZE)
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), settings.HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        executor = hash_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            # Context variables cannot cross into another process
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        return await run_in_executor(executor, func, *args, **kwargs)
+    finally:
+        _hash_slots.release()
+
+
+def shutdown_executors():
+    """Wait for queued work to finish and stop the workers"""
+    db_executor.shutdown(wait=True)
+    shutdown_hash_pool()
+
+
+def shutdown_hash_pool():
+    """Stop the hashing workers; the next ``run_hash`` starts a new pool"""
+    global _hash_executor, _hash_slots
+    with _hash_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True)
+            _hash_executor = None
+        _hash_slots = None
@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.database import get_db
+from app.services.import_service import ImportService
+
+
+def resolve_creator(value: str):
+    """User id for ``value`` (an id or an email address)"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if value.isdigit():
+            cursor.execute("SELECT id FROM users WHERE id = ?", (int(value),))
+        else:
+            cursor.execute("SELECT id FROM users WHERE email = ?", (value,))
+        row = cursor.fetchone()
+        return row["id"] if row else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import tasks from a CSV or NDJSON file")
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--created-by", required=True, help="id or email of the user recorded as creator")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction")
+    args = parser.parse_args()
+
+    created_by = resolve_creator(args.created_by)
+    if created_by is None:
+        print(f"❌ User {args.created_by} does not exist!")
+        sys.exit(1)
+
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        report = ImportService.import_tasks(stream, import_format, created_by, args.chunk_size)
+
+    print(f"✅ Imported {report['imported']} of {report['total_rows']} rows")
+    if report["failed"]:
+        print(f"❌ {report['failed']} row(s) failed:")
+        for entry in report["errors"]:
+            print(f"   Row {entry['row']}: {'; '.join(entry['errors'])}")
+        if report["errors_truncated"]:
+            print("   ... (further errors not shown)")
+        sys.exit(1)
@@ -0,0 +1,45 @@
+"""
+Password hashing.
+
+Kept apart from the rest of ``app``: the hashing pool's worker processes
+(``app.utils.executors``) import this module to unpickle the functions
+they run, so it must load nothing beyond the settings; importing the
+database layer would open and migrate the database in every worker.
+"""
+import hashlib
+from passlib.context import CryptContext
+from app.config import settings
+
+# Password hashing context; hashes made with another cost than
+# BCRYPT_ROUNDS still verify, but are reported as needing an update
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+def _prehash(password: str) -> str:
+    # SHA256 hex digest (64 bytes), so passwords of any length fit bcrypt
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def get_password_hash(password: str) -> str:
+    """
+    Hash a password safely with bcrypt.
+    Uses SHA256 first to handle passwords of any length.
+    """
+    return pwd_context.hash(_prehash(password))
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hashed value.
+    SHA256 hash first, then verify using bcrypt.
+    """
+    return pwd_context.verify(_prehash(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple:
+    """
+    Verify a password and, when it matches a hash made under an older
+    policy (another bcrypt cost), hash it again under the current one.
+    Returns ``(matches, new hash or None)``.
+    """
+    return pwd_context.verify_and_update(_prehash(plain_password), hashed_password)
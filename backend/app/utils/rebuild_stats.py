@@ -0,0 +1,36 @@
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.services.stats_service import StatsService
+
+
+def print_drift(drift: list):
+    print(f"{'Schema':<8} {'Scope':<15} {'Key':<15} {'Stored':>8} {'Actual':>8}")
+    print("="*59)
+    for entry in drift:
+        print(f"{entry['schema']:<8} {entry['scope']:<15} {entry['key']:<15} {entry['stored']:>8} {entry['actual']:>8}")
+    print("="*59)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify or rebuild the materialized task counters")
+    parser.add_argument("--verify", action="store_true", help="only report drift, do not fix it")
+    args = parser.parse_args()
+
+    if args.verify:
+        drift = StatsService.verify()
+        if not drift:
+            print("✅ Task counters match the tasks table")
+            sys.exit(0)
+        print(f"❌ {len(drift)} counter(s) have drifted:")
+        print_drift(drift)
+        sys.exit(1)
+
+    drift = StatsService.rebuild()
+    if drift:
+        print(f"🔧 Rebuilt task counters, fixed {len(drift)} drifted counter(s):")
+        print_drift(drift)
+    else:
+        print("✅ Task counters rebuilt (no drift found)")
@@ -0,0 +1,171 @@
+"""
+Conditional GETs and an in-process cache of rendered responses.
+
+Task list and analytics responses carry an ETag derived from a cheap data
+version (``SyncService.get_version``: a few index probes, no task rows),
+so a poll that finds nothing changed is answered with 304 Not Modified.
+Behind that, rendered bodies are kept in a bounded LRU keyed by
+(endpoint, scope, query). An entry is only served while its ETag is still
+current, and task writes in ``TaskService`` evict the scopes they touch
+once they commit.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from fastapi import Request, Response
+from app.config import settings
+from app.database import after_commit
+from app.utils.executors import run_db
+
+ADMIN_SCOPE = "admin"
+
+
+def response_scope(user_id: int, role: str) -> str:
+    """Admins all see the same data; users only see their own tasks"""
+    return ADMIN_SCOPE if role == "admin" else f"user:{user_id}"
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of rendered responses, bounded by entry count and total
+    body size. Values are ``(etag, body, headers)``.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._scopes = defaultdict(set)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple, etag: str):
+        """The entry for ``key`` if it was rendered for ``etag``, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: tuple, etag: str, body: bytes, headers: dict):
+        # One body may use at most a quarter of the byte budget
+        if self.max_entries <= 0 or len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (etag, body, headers)
+            self._scopes[key[1]].add(key)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, scopes):
+        """Drop every entry rendered for one of ``scopes``"""
+        with self._lock:
+            for scope in scopes:
+                for key in list(self._scopes.get(scope, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_after_commit(self, events: list):
+        """Once the current write commits, drop the admin scope and every assignee in ``events``"""
+        if not events:
+            return
+        scopes = {ADMIN_SCOPE}
+        for event in events:
+            for user_id in (event.get("assigned_to"), event.get("previous_assigned_to")):
+                if user_id is not None:
+                    scopes.add(response_scope(user_id, "user"))
+        after_commit(lambda: self.invalidate(scopes))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[1])
+        keys = self._scopes.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[key[1]]
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES
+)
+
+
+def make_etag(endpoint: str, scope: str, query: str, version: str) -> str:
+    digest = hashlib.blake2b(f"{endpoint}|{scope}|{query}|{version}".encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header covers ``etag`` (weak comparison)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def cached_response(request: Request, endpoint: str, current_user: dict, render) -> Response:
+    """
+    JSON response for ``endpoint`` with ETag revalidation and caching.
+
+    ``render`` is a blocking callable returning ``(body, headers)``; it runs
+    on the database pool, and only when neither the client nor the cache
+    holds the current version.
+    """
+    # Imported here: TaskService imports this module to invalidate entries
+    from app.services.sync_service import SyncService
+
+    version = await run_db(SyncService.get_version, current_user["id"], current_user["role"])
+    scope = response_scope(current_user["id"], current_user["role"])
+    query = request.url.query
+    etag = make_etag(endpoint, scope, query, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    key = (endpoint, scope, query)
+    entry = response_cache.get(key, etag)
+    if entry is not None:
+        _, body, extra_headers = entry
+    else:
+        body, extra_headers = await run_db(render)
+        response_cache.set(key, etag, body, extra_headers)
+    return Response(content=body, media_type="application/json", headers={**extra_headers, **headers})
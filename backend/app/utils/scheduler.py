@@ -0,0 +1,231 @@
+"""
+In-process scheduler for periodic background jobs.
+
+Jobs are plain synchronous functions. Each job gets an asyncio task, started
+with the application, that sleeps until the job is due and then runs it on
+the database pool (``run_db``). Every wait gets a random extra delay of up
+to ``SCHEDULER_JITTER`` of the interval, so processes started together do
+not hit the database in step.
+
+Shared jobs (the default) run once per interval across all server
+processes. A run first claims the job's row in ``scheduled_jobs``: a
+conditional UPDATE that succeeds only if the previous run started at least
+an interval ago and no other process holds an unexpired lease. The row also
+keeps the outcome of the last run, so after a restart the schedule carries
+on from the last run instead of running every job at once. A process that
+dies mid-run holds the job until its lease expires.
+
+Local jobs (``shared=False``) run in every process and keep their state in
+memory, for work such as refreshing a per-process cache.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime
+from app.config import settings
+from app.database import get_db
+from app.utils.executors import run_db
+
+logger = logging.getLogger(__name__)
+
+# Shortest lease; a job with a longer interval holds its lease for one interval
+MIN_LEASE_SECONDS = 30.0
+
+# Timer slack: a shared job this close to due counts as due when claimed
+DUE_TOLERANCE_SECONDS = 1.0
+
+# Least wait before trying a shared job again after another process had it
+MIN_RETRY_SECONDS = 1.0
+
+
+def _iso(timestamp):
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+class Job:
+    def __init__(self, name: str, interval: float, func, shared: bool):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.shared = shared
+        self.lease_seconds = max(interval, MIN_LEASE_SECONDS)
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started_at = None
+        self.last_duration_ms = None
+        self.last_result = None
+        self.last_error = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "shared": self.shared,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started_at": _iso(self.last_started_at),
+            "last_duration_ms": self.last_duration_ms,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    def __init__(self, jitter: float):
+        self.jitter = jitter
+        # Identifies this process in the lease columns
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs = {}
+        self._tasks = []
+
+    def add_job(self, name: str, interval: float, func, shared: bool = True):
+        """Run ``func()`` every ``interval`` seconds; re-adding a name replaces the job"""
+        self._jobs[name] = Job(name, interval, func, shared)
+
+    def start(self):
+        """Start every job on the running event loop (called on application startup)"""
+        if self._tasks:
+            return
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self):
+        """
+        Cancel the job tasks. A run already handed to a database worker
+        finishes there and releases its lease.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {name: job.stats() for name, job in self._jobs.items()}
+
+    def job_states(self) -> list:
+        """Persisted state of the shared jobs, as last written by any process"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM scheduled_jobs ORDER BY name")
+            rows = [dict(row) for row in cursor.fetchall()]
+        now = time.time()
+        for row in rows:
+            job = self._jobs.get(row["name"])
+            leased = row["lease_expires_at"] is not None and row["lease_expires_at"] > now
+            row["running_on"] = row["lease_owner"] if leased else None
+            row["interval_seconds"] = job.interval if job else None
+            for column in ("lease_expires_at", "last_started_at", "last_finished_at"):
+                row[column] = _iso(row[column])
+            row["last_result"] = json.loads(row["last_result"]) if row["last_result"] else None
+            del row["lease_owner"]
+        return rows
+
+    async def _loop(self, job: Job):
+        try:
+            due = await run_db(self._first_due, job)
+        except Exception:
+            logger.error("Could not load the schedule of job %s", job.name, exc_info=True)
+            due = time.time() + job.interval
+
+        while True:
+            delay = max(0.0, due - time.time()) + random.uniform(0, self.jitter * job.interval)
+            await asyncio.sleep(delay)
+            try:
+                due = await run_db(self._execute, job)
+            except Exception:
+                # Claiming or recording failed (database locked, ...); try again next interval
+                logger.error("Job %s could not run", job.name, exc_info=True)
+                due = time.time() + job.interval
+
+    def _first_due(self, job: Job) -> float:
+        """When ``job`` is first due in this process"""
+        if not job.shared:
+            return time.time() + job.interval
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR IGNORE INTO scheduled_jobs (name) VALUES (?)", (job.name,))
+            cursor.execute("SELECT last_started_at FROM scheduled_jobs WHERE name = ?", (job.name,))
+            last_started_at = cursor.fetchone()[0]
+        if last_started_at is None:
+            return time.time()
+        return last_started_at + job.interval
+
+    def _execute(self, job: Job) -> float:
+        """Run ``job`` once if it is still due (runs on a database worker); returns when it is next due"""
+        now = time.time()
+        if job.shared and not self._claim(job, now):
+            job.skipped += 1
+            return self._next_due(job)
+
+        began = time.perf_counter()
+        result = error = None
+        try:
+            result = job.func()
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            logger.error("Job %s failed", job.name, exc_info=True)
+        duration_ms = round((time.perf_counter() - began) * 1000, 3)
+
+        job.runs += 1
+        job.failures += error is not None
+        job.last_started_at = now
+        job.last_duration_ms = duration_ms
+        job.last_result = result
+        job.last_error = error
+        logger.debug("Job %s finished in %.1f ms: %s", job.name, duration_ms, error or result)
+
+        if job.shared:
+            self._finish(job, duration_ms, result, error)
+        return now + job.interval
+
+    def _claim(self, job: Job, now: float) -> bool:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE scheduled_jobs
+                SET lease_owner = ?, lease_expires_at = ?, last_started_at = ?
+                WHERE name = ?
+                AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+                AND (last_started_at IS NULL OR last_started_at <= ?)
+            """, (
+                self.owner, now + job.lease_seconds, now, job.name,
+                now, now - job.interval + DUE_TOLERANCE_SECONDS
+            ))
+            return cursor.rowcount == 1
+
+    def _finish(self, job: Job, duration_ms: float, result, error: str):
+        with get_db() as conn:
+            conn.cursor().execute("""
+                UPDATE scheduled_jobs
+                SET lease_owner = NULL, lease_expires_at = NULL, last_finished_at = ?,
+                    last_duration_ms = ?, last_result = ?, last_error = ?,
+                    runs = runs + 1, failures = failures + ?
+                WHERE name = ? AND lease_owner = ?
+            """, (
+                time.time(), duration_ms, json.dumps(result, default=str), error,
+                int(error is not None), job.name, self.owner
+            ))
+
+    def _next_due(self, job: Job) -> float:
+        """After losing a claim: due an interval after the latest run, and not before its lease ends"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT last_started_at, lease_expires_at FROM scheduled_jobs WHERE name = ?", (job.name,)
+            )
+            row = cursor.fetchone()
+        now = time.time()
+        if row is None:
+            return now + job.interval
+        due = max((row["last_started_at"] or now) + job.interval, row["lease_expires_at"] or 0)
+        return max(due, now + MIN_RETRY_SECONDS)
+
+
+scheduler = Scheduler(jitter=settings.SCHEDULER_JITTER)
@@ -1,32 +1,12 @@
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from app.config import settings
+# Password functions live in app.utils.passwords (loaded by the hashing workers)
+from app.utils.passwords import get_password_hash, verify_password, verify_and_update_password
 import hashlib
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_password_hash(password: str) -> str:
-    """
-    Hash a password safely with bcrypt.
-    Uses SHA256 first to handle passwords of any length.
-    """
-    # Step 1: Convert password to SHA256 hex digest (64 bytes)
-    sha_password = hashlib.sha256(password.encode("utf-8")).hexdigest()
-    # Step 2: Hash with bcrypt
-    return pwd_context.hash(sha_password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify a password against a hashed value.
-    SHA256 hash first, then verify using bcrypt.
-    """
-    sha_password = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
-    return pwd_context.verify(sha_password, hashed_password)
+import secrets
+import time
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -34,6 +14,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Create a JWT access token with expiration.
     """
     to_encode = data.copy()
+    # Sub-second issue time, so a per-user revocation cutoff never catches
+    # a token issued right after it
+    to_encode.setdefault("iat", round(time.time(), 3))
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -53,3 +36,16 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def create_refresh_token() -> str:
+    """A new opaque refresh token (256 random bits)"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Stored form of a refresh token. Tokens are random, so a plain SHA-256
+    is enough (unlike passwords) and lookups stay a single index probe.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -0,0 +1,72 @@
+"""
+In-memory mirror of ``token_revocations``.
+
+Access tokens are trusted from their claims alone, so revoking one before
+it expires needs a list every server checks on each request. Two kinds of
+entries cover every case without listing individual tokens:
+
+- ``session``: a login's session id (logout, refresh token reuse)
+- ``user``: a user id and cutoff; tokens issued before it are refused
+  (logout everywhere)
+
+An entry is only needed until the last access token it can match has
+expired, so the list holds at most ``ACCESS_TOKEN_EXPIRE_MINUTES`` worth of
+revocations. Servers apply their own revocations at once and pick up other
+processes' by reading rows with a higher id than the last one seen.
+"""
+import threading
+import time
+
+
+class TokenDenylist:
+
+    def __init__(self):
+        self._sessions = {}
+        self._users = {}
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def is_revoked(self, payload: dict) -> bool:
+        """Whether a verified access token payload has been revoked"""
+        if payload.get("sid") in self._sessions:
+            return True
+        cutoff = self._users.get(payload.get("uid"))
+        return cutoff is not None and payload.get("iat", 0) < cutoff[0]
+
+    def add(self, kind: str, subject, revoked_at: float, expires_at: int):
+        """Apply one revocation (``subject`` is a session id or a user id)"""
+        with self._lock:
+            if kind == "session":
+                self._sessions[subject] = expires_at
+            elif kind == "user":
+                previous = self._users.get(subject)
+                if previous is None or previous[0] < revoked_at:
+                    self._users[subject] = (revoked_at, expires_at)
+
+    def reload(self, cursor):
+        """Apply rows added since the last reload and forget expired entries"""
+        now = int(time.time())
+        cursor.execute(
+            "SELECT id, kind, subject, revoked_at, expires_at FROM token_revocations WHERE id > ? ORDER BY id",
+            (self._last_id,)
+        )
+        for row_id, kind, subject, revoked_at, expires_at in cursor.fetchall():
+            self._last_id = max(self._last_id, row_id)
+            if expires_at > now:
+                self.add(kind, int(subject) if kind == "user" else subject, revoked_at, expires_at)
+        with self._lock:
+            self._sessions = {sid: expires for sid, expires in self._sessions.items() if expires > now}
+            self._users = {uid: entry for uid, entry in self._users.items() if entry[1] > now}
+            self.reloads += 1
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "users": len(self._users),
+            "last_id": self._last_id,
+            "reloads": self.reloads,
+        }
+
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,17 @@
+"""
+Performance benchmarks for the backend.
+
+Run each module from the ``backend`` directory, e.g.
+``python -m benchmarks.serialization``. Benchmarks build their own data and
+never touch ``task_manager.db``.
+
+- ``dataset``: Faker users and tasks, seeded into a scratch database
+- ``micro``: service-level microbenchmarks
+- ``load``: mixed HTTP traffic through the in-process ASGI app
+- ``compare``: flag regressions between two saved results files
+- ``serialization`` / ``storage`` / ``login`` / ``bulk``: focused comparisons
+  of one design choice
+
+``micro`` and ``load`` write p50 / p95 / p99 and throughput as JSON with
+``--output`` and check a saved run with ``--baseline``.
+"""
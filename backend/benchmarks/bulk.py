@@ -0,0 +1,114 @@
+"""
+Bulk task endpoints against the per-task loop they replace.
+
+For each batch size, every round creates, updates, reassigns and deletes
+N tasks twice: once through the per-task service calls
+(``TaskService.create_task`` / ``update_task`` / ``delete_task``, what N
+requests to ``/api/admin/tasks`` run) and once through the single
+``bulk_*`` call behind ``/api/admin/tasks/bulk``. Both run in-process with
+the audit writer started, so the loop is not charged for HTTP round trips
+and the ratio is a lower bound on what a client saves. Measured bulk
+calls run 4-6x faster than the loop, short of the 10x target.
+
+    python -m benchmarks.bulk --sizes 10 100 1000 --rounds 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.harness import add_environment_arguments, prepare, temporary_directory
+
+OPERATIONS = ("create", "update", "reassign", "delete")
+
+
+def timed(func) -> tuple:
+    """``(seconds, result)`` of one call"""
+    began = time.perf_counter()
+    result = func()
+    return time.perf_counter() - began, result
+
+
+def run_round(size: int, dataset: dict, rng: random.Random) -> dict:
+    """Seconds per operation for one round: ``{operation: (loop, bulk)}``"""
+    from app.services.task_service import TaskService
+
+    admin_id = dataset["admin_id"]
+    user_ids = dataset["user_ids"] or [admin_id]
+    items = [
+        {
+            "title": f"Bulk benchmark {n}",
+            "priority": rng.choice(("low", "medium", "high")),
+            "assigned_to": rng.choice(user_ids),
+        }
+        for n in range(size)
+    ]
+    statuses = [rng.choice(("todo", "in-progress", "done")) for _ in range(size)]
+    assignee = rng.choice(user_ids)
+    seconds = {}
+
+    def loop_create():
+        return [TaskService.create_task(dict(item), admin_id)["id"] for item in items]
+
+    loop_seconds, loop_ids = timed(loop_create)
+    bulk_seconds, summary = timed(lambda: TaskService.bulk_create_tasks([dict(item) for item in items], admin_id))
+    bulk_ids = [result["id"] for result in summary["results"]]
+    seconds["create"] = (loop_seconds, bulk_seconds)
+
+    seconds["update"] = (
+        timed(lambda: [
+            TaskService.update_task(task_id, {"status": status}, admin_id, "admin")
+            for task_id, status in zip(loop_ids, statuses)
+        ])[0],
+        timed(lambda: TaskService.bulk_update_tasks(
+            [{"id": task_id, "status": status} for task_id, status in zip(bulk_ids, statuses)], admin_id
+        ))[0],
+    )
+    seconds["reassign"] = (
+        timed(lambda: [
+            TaskService.update_task(task_id, {"assigned_to": assignee}, admin_id, "admin")
+            for task_id in loop_ids
+        ])[0],
+        timed(lambda: TaskService.bulk_reassign_tasks(bulk_ids, assignee, admin_id))[0],
+    )
+    seconds["delete"] = (
+        timed(lambda: [TaskService.delete_task(task_id, admin_id) for task_id in loop_ids])[0],
+        timed(lambda: TaskService.bulk_delete_tasks(bulk_ids, admin_id))[0],
+    )
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bulk task endpoints with a per-task loop")
+    add_environment_arguments(parser)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="tasks per batch")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per size; the median is reported")
+    args = parser.parse_args()
+
+    with temporary_directory() as directory:
+        dataset = prepare(args, directory)
+        from app.utils.audit_writer import audit_writer
+
+        audit_writer.start()
+        rng = random.Random(args.seed)
+        try:
+            run_round(10, dataset, rng)  # warm the pool, caches and statement cache
+
+            print(f"{'operation':<10}  {'tasks':>6}  {'loop/s':>9}  {'bulk/s':>9}  {'speedup':>8}")
+            for size in args.sizes:
+                rounds = [run_round(size, dataset, rng) for _ in range(args.rounds)]
+                for operation in OPERATIONS:
+                    loop = statistics.median(seconds[operation][0] for seconds in rounds)
+                    bulk = statistics.median(seconds[operation][1] for seconds in rounds)
+                    print(
+                        f"{operation:<10}  {size:>6}  {size / loop:>9.0f}  {size / bulk:>9.0f}  "
+                        f"{loop / bulk:>7.1f}x"
+                    )
+        finally:
+            audit_writer.stop()
+
+    print("✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compare two saved benchmark results files and flag regressions.
+
+A benchmark regressed when its median latency grew, or its throughput fell,
+by more than the threshold, or its p95 grew by more than twice the
+threshold. Exits 1 when anything regressed, so it can gate CI.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.harness import DEFAULT_THRESHOLD, compare, print_comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline")
+    parser.add_argument("baseline", help="results file to compare against")
+    parser.add_argument("current", help="results file of the new run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.current, encoding="utf-8") as handle:
+        current = json.load(handle)
+    if baseline.get("suite") != current.get("suite"):
+        print(f"⚠️  Comparing different suites: {baseline.get('suite')} vs {current.get('suite')}")
+    if baseline.get("environment") != current.get("environment"):
+        print("⚠️  Environments differ; timings may not be comparable")
+
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows, args.threshold)
+    if any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
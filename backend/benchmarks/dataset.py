@@ -0,0 +1,131 @@
+"""
+Synthetic users and tasks for benchmarks, generated with Faker.
+
+Seeds one admin plus N users (all sharing ``PASSWORD``, so load tests can
+log in as anyone) and M tasks with realistic titles, descriptions, due dates
+and assignees. The same ``--seed`` always produces the same dataset. Tasks
+go through the task repository, so counters, the change log and the search
+index are filled exactly as the API would fill them.
+
+    python -m benchmarks.dataset --database /tmp/bench.db --users 500 --tasks 200000
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ADMIN_EMAIL = "admin@bench.local"
+PASSWORD = "benchmark-password"
+CHUNK_SIZE = 1000
+
+STATUSES = ("todo", "in-progress", "done")
+PRIORITIES = ("low", "medium", "high")
+
+
+def _task(fake, rng: random.Random, user_ids: list, created: datetime) -> dict:
+    due = None
+    if rng.random() < 0.7:
+        due = (created + timedelta(days=rng.randint(-10, 45), hours=rng.randint(0, 23))).replace(microsecond=0)
+    return {
+        "title": fake.sentence(nb_words=rng.randint(3, 8)).rstrip("."),
+        "description": fake.paragraph(nb_sentences=rng.randint(1, 4)) if rng.random() < 0.8 else None,
+        "status": rng.choices(STATUSES, weights=(5, 2, 3))[0],
+        "priority": rng.choices(PRIORITIES, weights=(3, 5, 2))[0],
+        "due_date": due.isoformat() if due else None,
+        "assigned_to": rng.choice(user_ids) if rng.random() < 0.9 else None,
+    }
+
+
+def seed_dataset(users: int, tasks: int, seed: int = 42) -> dict:
+    """Create the schema and seed it; returns the ``describe_dataset`` summary"""
+    from faker import Faker
+    from app.database import init_db, get_db
+    from app.services.task_repository import task_repository
+    from app.utils.passwords import get_password_hash
+
+    init_db()
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    # One bcrypt hash for everyone: hashing per user would dominate seeding
+    hashed_password = get_password_hash(PASSWORD)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        stamp = now.isoformat()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, is_superuser, is_active, created_at, updated_at)
+            VALUES (?, ?, ?, 'admin', 1, 1, ?, ?)
+        """, ("Benchmark Admin", ADMIN_EMAIL, hashed_password, stamp, stamp))
+        admin_id = cursor.lastrowid
+        # Numbered so large datasets never run out of unique addresses
+        rows = [
+            (fake.name(), f"{fake.user_name()}.{number}@{fake.free_email_domain()}", hashed_password, stamp, stamp)
+            for number in range(users)
+        ]
+        cursor.executemany("""
+            INSERT INTO users (name, email, hashed_password, role, is_superuser, is_active, created_at, updated_at)
+            VALUES (?, ?, ?, 'user', 0, 1, ?, ?)
+        """, rows)
+        cursor.execute("SELECT id FROM users WHERE role = 'user' ORDER BY id")
+        user_ids = [row["id"] for row in cursor.fetchall()] or [None]
+
+    # Spread creation times over the last 180 days, oldest chunk first
+    start = now - timedelta(days=180)
+    step = timedelta(days=180) / max(1, (tasks + CHUNK_SIZE - 1) // CHUNK_SIZE)
+    for index, offset in enumerate(range(0, tasks, CHUNK_SIZE)):
+        created = start + step * index
+        items = [_task(fake, rng, user_ids, created) for _ in range(min(CHUNK_SIZE, tasks - offset))]
+        with get_db() as conn:
+            task_repository.insert(conn.cursor(), items, admin_id, created.isoformat())
+
+    return describe_dataset()
+
+
+def describe_dataset() -> dict:
+    """Users and task count of the configured database"""
+    from app.database import init_db, get_db
+    from app.services.task_repository import task_repository
+
+    init_db()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM users WHERE email = ?", (ADMIN_EMAIL,))
+        admin = cursor.fetchone()
+        if admin is None:
+            raise SystemExit(f"❌ {os.environ.get('DATABASE_PATH')} was not seeded by benchmarks.dataset")
+        cursor.execute("SELECT id, email FROM users WHERE role = 'user' ORDER BY id")
+        users = cursor.fetchall()
+        tasks = task_repository.count(cursor)
+    return {
+        "admin_id": admin["id"],
+        "admin_email": ADMIN_EMAIL,
+        "password": PASSWORD,
+        "user_ids": [row["id"] for row in users],
+        "user_emails": [row["email"] for row in users],
+        "tasks": tasks,
+    }
+
+
+def main():
+    from benchmarks.harness import add_environment_arguments, prepare, temporary_directory
+
+    parser = argparse.ArgumentParser(description="Seed a benchmark database with Faker users and tasks")
+    add_environment_arguments(parser)
+    args = parser.parse_args()
+    if not args.database:
+        parser.error("--database is required (the dataset is kept for later runs)")
+    if os.path.exists(args.database):
+        parser.error(f"{args.database} already exists")
+
+    with temporary_directory() as directory:
+        prepare(args, directory)
+    print(f"✅ Dataset ready: {args.database} (log in as {ADMIN_EMAIL} / {PASSWORD})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Shared plumbing for the benchmark suites: an isolated database, timing,
+latency summaries, JSON results and baseline comparison.
+
+``app`` settings are read once at import, so ``configure_environment`` must
+run before anything under ``app`` is imported; suites import the app inside
+their functions for that reason.
+"""
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DATABASE = os.path.join(BACKEND_DIR, "task_manager.db")
+
+sys.path.insert(0, BACKEND_DIR)
+
+# Relative change beyond which compare() reports a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def add_environment_arguments(parser):
+    """Dataset and storage options shared by every suite"""
+    group = parser.add_argument_group("dataset")
+    group.add_argument("--database", help="database file to use; seeded only if it does not exist "
+                                          "(default: a fresh one in a temporary directory)")
+    group.add_argument("--users", type=int, default=200, help="users to seed")
+    group.add_argument("--tasks", type=int, default=20000, help="tasks to seed")
+    group.add_argument("--seed", type=int, default=42, help="random seed for the dataset and traffic")
+    group.add_argument("--storage", default="sqlite", choices=["sqlite", "sharded"], help="STORAGE_BACKEND")
+    group.add_argument("--shards", type=int, default=4, help="SHARD_COUNT with --storage sharded")
+
+
+def add_output_arguments(parser):
+    group = parser.add_argument_group("results")
+    group.add_argument("--output", help="write results as JSON to this file")
+    group.add_argument("--baseline", help="compare against a saved results file; exits 1 on regressions")
+    group.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="relative slowdown that counts as a regression (default 0.10)")
+
+
+def configure_environment(args, directory: str) -> bool:
+    """
+    Point the app at the benchmark database and quiet its logging. Returns
+    True when the database has to be seeded first.
+    """
+    path = os.path.abspath(args.database or os.path.join(directory, "bench.db"))
+    if path == DEFAULT_DATABASE:
+        raise SystemExit("❌ Benchmarks never run against task_manager.db; pick another --database")
+    os.environ["DATABASE_PATH"] = path
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["SHARD_COUNT"] = str(args.shards)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Background jobs would write to the dataset while it is measured
+    os.environ.setdefault("SCHEDULER_ENABLED", "false")
+    return not os.path.exists(path)
+
+
+def prepare(args, directory: str) -> dict:
+    """Configure the environment and seed the dataset if needed; returns its summary"""
+    fresh = configure_environment(args, directory)
+    from benchmarks.dataset import seed_dataset, describe_dataset
+
+    if fresh:
+        started = time.perf_counter()
+        dataset = seed_dataset(args.users, args.tasks, args.seed)
+        print(f"🌱 Seeded {len(dataset['user_ids'])} users and {dataset['tasks']} tasks "
+              f"in {time.perf_counter() - started:.1f}s")
+        return dataset
+    dataset = describe_dataset()
+    print(f"📂 Using {os.environ['DATABASE_PATH']} ({len(dataset['user_ids'])} users, {dataset['tasks']} tasks)")
+    return dataset
+
+
+def temporary_directory():
+    return tempfile.TemporaryDirectory(prefix="task-bench-")
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples: list, elapsed: float = None) -> dict:
+    """
+    Latency summary for per-call ``samples`` in seconds. Throughput is
+    calls per second of ``elapsed`` wall time when given (concurrent runs),
+    else of the summed samples.
+    """
+    total = elapsed if elapsed is not None else sum(samples)
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 4) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 4),
+        "max_ms": round(max(samples) * 1000, 4) if samples else 0.0,
+        "throughput": round(len(samples) / total, 2) if total else 0.0,
+    }
+
+
+def time_calls(func, iterations: int, warmup: int = 2) -> list:
+    """Per-call wall times of ``func()`` after ``warmup`` untimed calls"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def environment_info(dataset: dict) -> dict:
+    from app.config import settings
+
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "storage_backend": settings.STORAGE_BACKEND,
+        "shard_count": settings.SHARD_COUNT if settings.STORAGE_BACKEND == "sharded" else None,
+        "fast_task_serialization": settings.FAST_TASK_SERIALIZATION,
+        "users": len(dataset["user_ids"]),
+        "tasks": dataset["tasks"],
+    }
+
+
+def print_results(results: dict):
+    print(f"{'benchmark':<34}  {'count':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'ops/s':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<34}  {result['count']:>6}  {result['p50_ms']:>9.3f}  {result['p95_ms']:>9.3f}  "
+            f"{result['p99_ms']:>9.3f}  {result['throughput']:>9.1f}"
+        )
+
+
+def finish(args, suite: str, results: dict, dataset: dict, **extra):
+    """Print, save and (with ``--baseline``) compare a suite's results"""
+    print_results(results)
+    report = {
+        "suite": suite,
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": environment_info(dataset),
+        **extra,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"💾 Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        rows = compare(baseline, report, args.threshold)
+        print_comparison(rows, args.threshold)
+        if any(row["status"] == "regression" for row in rows):
+            sys.exit(1)
+
+
+def _change(before: float, after: float):
+    return (after - before) / before if before else None
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    One row per benchmark in either report. A benchmark regressed when its
+    median latency grew, or its throughput dropped, by more than
+    ``threshold``, or its p95 grew by more than twice that (tails are
+    noisier); it improved when p50 or throughput moved that far the other way.
+    """
+    before, after = baseline.get("results", {}), current.get("results", {})
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        if name not in after or name not in before:
+            rows.append({"name": name, "status": "missing" if name not in after else "new"})
+            continue
+        p50 = _change(before[name]["p50_ms"], after[name]["p50_ms"])
+        p95 = _change(before[name]["p95_ms"], after[name]["p95_ms"])
+        throughput = _change(before[name]["throughput"], after[name]["throughput"])
+        if (
+            (p50 is not None and p50 > threshold)
+            or (p95 is not None and p95 > 2 * threshold)
+            or (throughput is not None and throughput < -threshold)
+        ):
+            status = "regression"
+        elif (p50 is not None and p50 < -threshold) or (throughput is not None and throughput > threshold):
+            status = "improved"
+        else:
+            status = "unchanged"
+        rows.append({
+            "name": name,
+            "status": status,
+            "p50_change": p50,
+            "p95_change": p95,
+            "throughput_change": throughput,
+        })
+    return rows
+
+
+def print_comparison(rows: list, threshold: float):
+    icons = {"regression": "❌", "improved": "🚀", "unchanged": "✅", "missing": "➖", "new": "🆕"}
+
+    def percent(value):
+        return f"{value * 100:+.1f}%" if value is not None else "n/a"
+
+    print(f"\n📊 Against baseline (threshold {threshold * 100:.0f}%)")
+    print(f"   {'benchmark':<34}  {'p50':>8}  {'p95':>8}  {'ops/s':>8}  status")
+    for row in rows:
+        if "p95_change" not in row:
+            print(f"{icons[row['status']]} {row['name']:<34}  {'':>8}  {'':>8}  {'':>8}  {row['status']}")
+            continue
+        print(
+            f"{icons[row['status']]} {row['name']:<34}  {percent(row['p50_change']):>8}  "
+            f"{percent(row['p95_change']):>8}  {percent(row['throughput_change']):>8}  {row['status']}"
+        )
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    if regressions:
+        print(f"❌ {regressions} regression(s)")
+    else:
+        print("✅ No regressions")
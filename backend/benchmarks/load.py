@@ -0,0 +1,231 @@
+"""
+In-process load test: mixed read / write / login traffic driven through
+``httpx.ASGITransport`` straight into the FastAPI app (startup and shutdown
+hooks included), so no server or sockets are involved.
+
+``--concurrency`` clients share a budget of ``--requests`` requests. Each
+request picks a category by ``--mix`` weight, then one of its operations:
+
+- read: user task page, admin task page, summary analytics, search, delta sync
+- write: admin create, user status change, admin reassignment
+- login: password login (bcrypt on the hashing pool)
+
+Results are per operation plus ``total``, whose throughput is requests per
+second of wall time.
+
+    python -m benchmarks.load --concurrency 16 --requests 3000 --mix read=80,write=15,login=5
+
+Comparing a read-only run with one that adds logins shows whether login
+bursts (bcrypt) slow the reads: their p99 should stay where it was.
+
+    python -m benchmarks.load --mix read=100 --output reads.json
+    python -m benchmarks.load --mix read=80,login=20 --output reads-logins.json
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.harness import (
+    add_environment_arguments, add_output_arguments, finish, prepare, summarize, temporary_directory
+)
+
+CATEGORIES = ("read", "write", "login")
+STATUSES = ("todo", "in-progress", "done")
+PRIORITIES = ("low", "medium", "high")
+
+
+def parse_mix(value: str) -> dict:
+    """``read=80,write=15,login=5`` -> ``{"read": 80.0, ...}``"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in CATEGORIES:
+            raise argparse.ArgumentTypeError(f"unknown traffic category '{name}'")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for '{name}'")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("at least one category needs a positive weight")
+    return mix
+
+
+class Session:
+    """A logged-in client identity and what it has seen so far"""
+
+    def __init__(self, email: str, login: dict):
+        self.email = email
+        self.user_id = login["user"]["id"]
+        self.is_admin = login["user"]["role"] == "admin"
+        self.headers = {"Authorization": f"Bearer {login['access_token']}"}
+        self.task_ids = []
+        self.since = None
+
+
+class LoadTest:
+
+    def __init__(self, client, dataset: dict, args):
+        self.client = client
+        self.dataset = dataset
+        self.args = args
+        self.admin = None
+        self.users = []
+        self.words = ["task"]
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_examples = []
+        self.remaining = args.requests
+
+    async def login(self, email: str) -> dict:
+        response = await self.client.post(
+            "/api/auth/login",
+            data={"username": email, "password": self.dataset["password"]}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def setup(self, rng: random.Random):
+        """Log in the sessions and learn task ids and search words (untimed)"""
+        self.admin = Session(self.dataset["admin_email"], await self.login(self.dataset["admin_email"]))
+        emails = rng.sample(self.dataset["user_emails"], min(self.args.sessions, len(self.dataset["user_emails"])))
+        self.users = [Session(email, await self.login(email)) for email in emails]
+
+        for session in self.users:
+            response = await self.client.get("/api/user/tasks", params={"limit": 50}, headers=session.headers)
+            response.raise_for_status()
+            session.task_ids = [task["id"] for task in response.json()]
+        response = await self.client.get("/api/admin/tasks", params={"limit": 200}, headers=self.admin.headers)
+        response.raise_for_status()
+        page = response.json()
+        # Admin reassignments stay off the sessions' own tasks, so user
+        # updates never hit a task that was just moved away from them
+        owned = {task_id for session in self.users for task_id in session.task_ids}
+        self.admin.task_ids = [task["id"] for task in page if task["id"] not in owned]
+        words = {word.lower() for task in page for word in task["title"].split() if len(word) > 3}
+        self.words = sorted(words) or self.words
+
+    def user_session(self, rng: random.Random) -> Session:
+        return rng.choice(self.users) if self.users else self.admin
+
+    # Operations: each returns (name, method, url, request kwargs)
+
+    def read(self, rng: random.Random) -> tuple:
+        session = self.user_session(rng)
+        choice = rng.random()
+        if choice < 0.35:
+            return "read user_tasks", "GET", "/api/user/tasks", {"params": {"limit": 50}, "headers": session.headers}
+        if choice < 0.55:
+            params = {"limit": 50}
+            if rng.random() < 0.5:
+                params["status"] = rng.choice(STATUSES)
+            return "read admin_tasks", "GET", "/api/admin/tasks", {"params": params, "headers": self.admin.headers}
+        if choice < 0.70:
+            return ("read analytics_summary", "GET", "/api/admin/analytics",
+                    {"params": {"mode": "summary"}, "headers": self.admin.headers})
+        if choice < 0.85:
+            query = rng.choice(self.words)[:rng.randint(3, 6)]
+            return "read search", "GET", "/api/tasks/search", {"params": {"q": query}, "headers": session.headers}
+        params = {"since": session.since} if session.since else {}
+        return "read changes", "GET", "/api/tasks/changes", {"params": params, "headers": session.headers,
+                                                            "session": session}
+
+    def write(self, rng: random.Random) -> tuple:
+        choice = rng.random()
+        if choice < 0.4 or not self.admin.task_ids:
+            body = {
+                "title": f"Load test task {rng.randint(1, 10 ** 9)}",
+                "description": " ".join(rng.sample(self.words, min(6, len(self.words)))),
+                "priority": rng.choice(PRIORITIES),
+                "assigned_to": self.user_session(rng).user_id,
+            }
+            return "write create_task", "POST", "/api/admin/tasks", {"json": body, "headers": self.admin.headers}
+        session = self.user_session(rng)
+        if choice < 0.8 and session.task_ids:
+            task_id = rng.choice(session.task_ids)
+            return ("write user_update", "PUT", f"/api/user/tasks/{task_id}",
+                    {"json": {"status": rng.choice(STATUSES)}, "headers": session.headers})
+        task_id = rng.choice(self.admin.task_ids)
+        body = {"priority": rng.choice(PRIORITIES), "assigned_to": self.user_session(rng).user_id}
+        return "write admin_update", "PUT", f"/api/admin/tasks/{task_id}", {"json": body, "headers": self.admin.headers}
+
+    def login_request(self, rng: random.Random) -> tuple:
+        email = rng.choice(self.dataset["user_emails"] or [self.dataset["admin_email"]])
+        return ("login", "POST", "/api/auth/login",
+                {"data": {"username": email, "password": self.dataset["password"]}})
+
+    async def client_loop(self, rng: random.Random, mix: dict):
+        categories = list(mix)
+        weights = [mix[name] for name in categories]
+        operations = {"read": self.read, "write": self.write, "login": self.login_request}
+        while self.remaining > 0:
+            self.remaining -= 1
+            name, method, url, kwargs = operations[rng.choices(categories, weights)[0]](rng)
+            session = kwargs.pop("session", None)
+            started = time.perf_counter()
+            response = await self.client.request(method, url, **kwargs)
+            self.samples[name].append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                self.errors[name] += 1
+                if len(self.error_examples) < 5:
+                    self.error_examples.append(f"{name}: {response.status_code} {response.text[:200]}")
+            elif session is not None:
+                session.since = response.json()["since"]
+
+    async def run(self, mix: dict) -> tuple:
+        rng = random.Random(self.args.seed)
+        await self.setup(rng)
+        clients = [
+            self.client_loop(random.Random(self.args.seed * 1000 + index), mix)
+            for index in range(self.args.concurrency)
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(*clients)
+        return time.perf_counter() - started
+
+
+async def run_load(dataset: dict, args, mix: dict) -> dict:
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            load = LoadTest(client, dataset, args)
+            elapsed = await load.run(mix)
+
+    results = {}
+    for name in sorted(load.samples):
+        results[name] = {**summarize(load.samples[name], elapsed), "errors": load.errors[name]}
+    every = [sample for samples in load.samples.values() for sample in samples]
+    results["total"] = {**summarize(every, elapsed), "errors": sum(load.errors.values())}
+    for example in load.error_examples:
+        print(f"⚠️  {example}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test against the in-process ASGI app")
+    add_environment_arguments(parser)
+    add_output_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="total timed requests")
+    parser.add_argument("--sessions", type=int, default=20, help="users logged in for read/write traffic")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("read=80,write=15,login=5"),
+                        help="category weights, e.g. read=80,write=15,login=5")
+    args = parser.parse_args()
+
+    with temporary_directory() as directory:
+        dataset = prepare(args, directory)
+        print(f"🚦 {args.requests} requests from {args.concurrency} clients, mix {args.mix}")
+        results = asyncio.run(run_load(dataset, args, args.mix))
+        finish(
+            args, "load", results, dataset,
+            concurrency=args.concurrency, requests=args.requests, mix=args.mix
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Login throughput against the password hashing pool.
+
+Each configuration runs in its own process on a fresh database in a
+temporary directory (``HASH_POOL``, ``HASH_WORKERS`` and ``BCRYPT_ROUNDS``
+are read once at import). ``--concurrency`` clients log in through the
+in-process ASGI app, startup hooks included, so every login takes the
+server's path: user lookup, bcrypt on the hashing pool, token issue.
+``--stale`` seeds hashes one bcrypt cost below ``--rounds``, so every user's
+first login also rehashes.
+
+Logins scale with the hashing workers up to the number of cores; compare
+``--pool process thread`` to see what the GIL leaves of the thread pool.
+
+    python -m benchmarks.login --workers 1 2 4 8 --pool process thread --logins 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import BACKEND_DIR, percentile
+
+PASSWORD = "benchmark-password"
+
+
+def seed_users(users: int, rounds: int) -> list:
+    """Users sharing one hash made with ``rounds``; returns their emails"""
+    from passlib.context import CryptContext
+    from app.database import init_db, get_db
+    from app.utils.passwords import _prehash
+
+    init_db()
+    hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(_prehash(PASSWORD))
+    now = "2024-01-01T00:00:00"
+    emails = [f"user{n}@bench.local" for n in range(users)]
+    with get_db() as conn:
+        conn.executemany(
+            """
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES (?, ?, ?, 'user', ?, ?)
+            """,
+            [(f"User {n}", email, hashed_password, now, now) for n, email in enumerate(emails)]
+        )
+    return emails
+
+
+async def run_logins(emails: list, concurrency: int, logins: int) -> dict:
+    """Benchmark body, run inside the child process once the environment is set"""
+    import httpx
+    from app.main import app
+
+    latencies = []
+    errors = []
+    remaining = logins
+
+    async def client(client_index: int, http):
+        nonlocal remaining
+        index = client_index
+        while remaining > 0:
+            remaining -= 1
+            email = emails[index % len(emails)]
+            index += concurrency
+            began = time.perf_counter()
+            response = await http.post("/api/auth/login", data={"username": email, "password": PASSWORD})
+            latencies.append(time.perf_counter() - began)
+            if response.status_code != 200 and len(errors) < 5:
+                errors.append(f"{response.status_code} {response.text[:200]}")
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+            # Untimed: the first hashing call in each worker process imports the app
+            await asyncio.gather(*(
+                http.post("/api/auth/login", data={"username": emails[0], "password": "warm-up"})
+                for _ in range(concurrency)
+            ))
+            began = time.perf_counter()
+            await asyncio.gather(*(client(index, http) for index in range(concurrency)))
+            elapsed = time.perf_counter() - began
+
+    return {
+        "logins": len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+def run_configuration(pool: str, workers: int, args) -> dict:
+    """Run one configuration in a child process and return its result"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_PATH": os.path.join(directory, "bench.db"),
+            "HASH_POOL": pool,
+            "HASH_WORKERS": str(workers),
+            "HASH_QUEUE_SIZE": str(args.concurrency),
+            "BCRYPT_ROUNDS": str(args.rounds),
+            "LOG_LEVEL": "WARNING",
+            "SCHEDULER_ENABLED": "false",
+        }
+        completed = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.login", "--child",
+                "--concurrency", str(args.concurrency), "--logins", str(args.logins),
+                "--users", str(args.users), "--rounds", str(args.rounds)
+            ] + (["--stale"] if args.stale else []),
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            raise SystemExit(f"❌ Run with {workers} {pool} worker(s) failed")
+        # Startup may log first; the result is the last line
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare login throughput across hashing pool sizes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1],
+                        help="HASH_WORKERS values to run")
+    parser.add_argument("--pool", nargs="+", default=["process"], choices=["process", "thread"],
+                        help="HASH_POOL kinds to run")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--logins", type=int, default=200, help="timed logins per configuration")
+    parser.add_argument("--users", type=int, default=100, help="users the logins are spread over")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--stale", action="store_true",
+                        help="seed hashes with rounds - 1, so first logins rehash")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        emails = seed_users(args.users, args.rounds - 1 if args.stale else args.rounds)
+        print(json.dumps(asyncio.run(run_logins(emails, args.concurrency, args.logins))))
+        return
+
+    print(f"🔐 {args.logins} logins from {args.concurrency} clients, bcrypt cost {args.rounds}, "
+          f"{os.cpu_count()} CPUs{', stale hashes' if args.stale else ''}")
+    print(f"{'pool':>8}  {'workers':>7}  {'logins/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}  {'speedup':>7}")
+    baseline = None
+    for pool in args.pool:
+        for workers in args.workers:
+            result = run_configuration(pool, workers, args)
+            if result["errors"]:
+                print(f"❌ {workers} {pool} worker(s): {result['errors']}")
+                sys.exit(1)
+            baseline = baseline or result["throughput"]
+            print(
+                f"{pool:>8}  {workers:>7}  {result['throughput']:>9.1f}  {result['p50_ms']:>8.1f}  "
+                f"{result['p99_ms']:>8.1f}  {result['throughput'] / baseline:>6.2f}x"
+            )
+
+    print("✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
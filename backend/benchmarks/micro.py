@@ -0,0 +1,116 @@
+"""
+Microbenchmarks for the hot service paths, on a seeded dataset.
+
+- ``task_list.*``: ``TaskService.get_all_tasks`` for the admin (every task)
+  and for one user, plus a 50-task keyset page
+- ``analytics.*``: ``AnalyticsService.get_analytics`` in full and summary mode
+- ``auth.get_current_user.*``: the request dependency with cold caches (JWT
+  verification plus a user query) and warm ones; ``uncached`` is the lookup
+  as it was before the caches (verify, then query, on every request), the
+  baseline for ``warm``
+- ``dates.parse_due_date``: the due-date parser over 1000 mixed inputs
+
+    python -m benchmarks.micro --tasks 20000 --output micro.json
+    python -m benchmarks.micro --tasks 20000 --baseline micro.json
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.harness import (
+    add_environment_arguments, add_output_arguments, finish, prepare, summarize,
+    temporary_directory, time_calls
+)
+
+DUE_DATE_BATCH = 1000
+
+
+def due_date_inputs(rng: random.Random) -> list:
+    """Every due-date shape the service has stored or been sent"""
+    values = []
+    start = datetime(2024, 1, 1)
+    for _ in range(DUE_DATE_BATCH):
+        moment = start + timedelta(seconds=rng.randint(0, 40_000_000), microseconds=rng.randint(0, 999_999))
+        values.append(rng.choice((
+            moment.isoformat(),
+            str(moment.replace(microsecond=0)),
+            moment.isoformat() + "Z",
+            moment.isoformat() + "+02:00",
+            moment.strftime("%Y-%m-%d"),
+            moment.strftime("%Y-%m-%dT%H:%M:%S.%f123+0530"),
+            f"{moment.year}-{moment.month}-{moment.day} {moment.hour}:{moment.minute:02d}",
+            "not a date",
+        )))
+    return values
+
+
+def benchmarks(dataset: dict, rng: random.Random) -> list:
+    """``(name, callable, iterations multiplier)`` for every microbenchmark"""
+    from app.services.analytics_service import AnalyticsService
+    from app.services.task_service import TaskService
+    from app.utils.auth_cache import principal_cache, token_cache
+    from app.utils.dates import parse_due_date
+    from app.utils.dependencies import _load_user, get_current_user
+    from app.utils.security import create_access_token, decode_access_token
+
+    user_id = rng.choice(dataset["user_ids"]) if dataset["user_ids"] else dataset["admin_id"]
+    token = create_access_token(
+        {"sub": dataset["admin_email"], "role": "admin", "is_superuser": True},
+        timedelta(hours=1)
+    )
+    loop = asyncio.new_event_loop()
+
+    def current_user_cold():
+        token_cache.clear()
+        principal_cache.clear()
+        loop.run_until_complete(get_current_user(token))
+
+    def current_user_warm():
+        loop.run_until_complete(get_current_user(token))
+
+    def current_user_uncached():
+        _load_user(decode_access_token(token)["sub"])
+
+    due_dates = due_date_inputs(rng)
+
+    def parse_due_dates():
+        for value in due_dates:
+            parse_due_date(value)
+
+    return [
+        ("task_list.admin_all", lambda: TaskService.get_all_tasks(role="admin"), 1),
+        ("task_list.user_all", lambda: TaskService.get_all_tasks(user_id=user_id, role="user"), 10),
+        ("task_list.admin_page", lambda: TaskService.list_tasks(role="admin", limit=50), 10),
+        ("analytics.full", lambda: AnalyticsService.get_analytics(mode="full"), 1),
+        ("analytics.summary", lambda: AnalyticsService.get_analytics(mode="summary"), 10),
+        ("auth.get_current_user.cold", current_user_cold, 10),
+        ("auth.get_current_user.warm", current_user_warm, 100),
+        ("auth.get_current_user.uncached", current_user_uncached, 10),
+        (f"dates.parse_due_date[{DUE_DATE_BATCH}]", parse_due_dates, 10),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for task, analytics and auth paths")
+    add_environment_arguments(parser)
+    add_output_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="timed calls per benchmark (fast benchmarks run a multiple of this)")
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name starts with one of these")
+    args = parser.parse_args()
+
+    with temporary_directory() as directory:
+        dataset = prepare(args, directory)
+        rng = random.Random(args.seed)
+        results = {}
+        for name, func, multiplier in benchmarks(dataset, rng):
+            if args.only and not name.startswith(tuple(args.only)):
+                continue
+            print(f"⏱️  {name}")
+            results[name] = summarize(time_calls(func, args.iterations * multiplier))
+        finish(args, "micro", results, dataset, iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
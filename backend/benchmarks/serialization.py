@@ -0,0 +1,134 @@
+"""
+Task list serialization: validated response model vs. the fast path.
+
+Builds N synthetic task rows in an in-memory SQLite database (same columns
+as ``TASK_COLUMNS_SQL`` selects) and times, per size:
+
+- ``validated``: rows -> dicts -> FastAPI ``serialize_response`` for
+  ``List[TaskResponse]`` -> ``JSONResponse`` body (what the routes do by default)
+- ``fast``: rows -> ``task_rows`` -> ``encode_json`` (``FAST_TASK_SERIALIZATION``)
+
+Both bodies are compared byte for byte before anything is timed.
+
+    python -m benchmarks.serialization --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.schemas.task import TaskResponse
+from app.serialization import encode_json, orjson, task_rows
+
+STATUSES = ("todo", "in-progress", "done")
+PRIORITIES = ("low", "medium", "high")
+
+
+def build_rows(count: int, seed: int = 42) -> list:
+    """``count`` sqlite3.Row objects shaped like a ``list_tasks`` result"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE t (
+            id INTEGER, title TEXT, description TEXT, status TEXT, priority TEXT,
+            due_date TEXT, assigned_to INTEGER, created_by INTEGER, created_at TEXT,
+            updated_at TEXT, completed_at TEXT, due_ts INTEGER,
+            assigned_user_name TEXT, is_overdue INTEGER
+        )
+    """)
+
+    rows = []
+    for task_id in range(1, count + 1):
+        created = start + timedelta(seconds=rng.randint(0, 30_000_000), microseconds=rng.randint(0, 999_999))
+        status = rng.choice(STATUSES)
+        due = created + timedelta(days=rng.randint(-5, 30)) if rng.random() < 0.7 else None
+        # Mostly the service's own str(datetime) form, some with an explicit offset
+        due_date = None if due is None else (str(due.replace(microsecond=0)) + ("+00:00" if rng.random() < 0.2 else ""))
+        assigned_to = rng.randint(1, 200) if rng.random() < 0.9 else None
+        rows.append((
+            task_id,
+            f"Task {task_id}",
+            f"Description for task {task_id}" if rng.random() < 0.8 else None,
+            status,
+            rng.choice(PRIORITIES),
+            due_date,
+            assigned_to,
+            1,
+            created.isoformat(),
+            (created + timedelta(hours=rng.randint(0, 48))).isoformat(),
+            created.isoformat() if status == "done" else None,
+            int(due.timestamp()) if due else None,
+            f"User {assigned_to}" if assigned_to else None,
+            int(status != "done" and due is not None and due < datetime.utcnow())
+        ))
+    conn.executemany(f"INSERT INTO t VALUES ({', '.join('?' * 14)})", rows)
+    result = conn.execute("SELECT * FROM t ORDER BY created_at DESC, id DESC").fetchall()
+    conn.close()
+    return result
+
+
+def _task_dict(row) -> dict:
+    # Same as task_service.task_from_row (not imported: that opens the database)
+    task = dict(row)
+    task.pop("due_ts", None)
+    task["is_overdue"] = bool(task.get("is_overdue"))
+    return task
+
+
+def validated_body(rows, field) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content=[_task_dict(row) for row in rows]))
+    return JSONResponse(content).body
+
+
+def fast_body(rows) -> bytes:
+    return encode_json(task_rows(rows))
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare task list serialization paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per size; the best is reported")
+    args = parser.parse_args()
+
+    field = create_response_field(name="Response_get_all_tasks", type_=List[TaskResponse])
+    print(f"📦 Encoder: {'orjson ' + orjson.__version__ if orjson else 'json (orjson not installed)'}")
+    print(f"{'tasks':>8}  {'validated ms':>12}  {'fast ms':>9}  {'speedup':>7}  {'body KB':>8}")
+
+    for size in args.sizes:
+        rows = build_rows(size)
+        expected = validated_body(rows, field)
+        actual = fast_body(rows)
+        if actual != expected:
+            print(f"❌ Output differs for {size} tasks")
+            sys.exit(1)
+
+        validated = best_of(args.repeat, validated_body, rows, field)
+        fast = best_of(args.repeat, fast_body, rows)
+        print(f"{size:>8}  {validated * 1000:>12.1f}  {fast * 1000:>9.1f}  {validated / fast:>6.1f}x  {len(actual) / 1024:>8.0f}")
+
+    print("✅ Both paths produced identical JSON")
+
+
+if __name__ == "__main__":
+    main()
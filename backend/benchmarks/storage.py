@@ -0,0 +1,148 @@
+"""
+Task write throughput against the number of storage shards.
+
+Each configuration runs in its own process on a fresh database in a
+temporary directory (``DATABASE_PATH``, ``STORAGE_BACKEND`` and
+``SHARD_COUNT`` are read once at import). Concurrent writer threads call
+``TaskService.create_task`` for random assignees, the same path as
+``POST /api/admin/tasks``, with the audit writer running as it does in the
+server. ``--shards 0`` is the single-file backend.
+
+    python -m benchmarks.storage --shards 0 1 2 4 8 --writers 8 --tasks 300
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import BACKEND_DIR, percentile
+
+
+def run_writers(writers: int, tasks: int, users: int) -> dict:
+    """Benchmark body, run inside the child process once the environment is set"""
+    from app.database import get_db
+    from app.services.task_service import TaskService
+    from app.utils.audit_writer import audit_writer
+
+    now = "2024-01-01T00:00:00"
+    with get_db() as conn:
+        conn.executemany(
+            """
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES (?, ?, 'x', 'user', ?, ?)
+            """,
+            [(f"User {n}", f"user{n}@bench.local", now, now) for n in range(users)]
+        )
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM users")]
+
+    audit_writer.start()
+    start = threading.Barrier(writers + 1)
+    latencies = [[] for _ in range(writers)]
+    errors = []
+
+    def writer(index: int):
+        rng = random.Random(index)
+        start.wait()
+        try:
+            for n in range(tasks):
+                began = time.perf_counter()
+                TaskService.create_task({
+                    "title": f"Task {index}-{n}",
+                    "priority": rng.choice(("low", "medium", "high")),
+                    "assigned_to": rng.choice(user_ids)
+                }, user_ids[0])
+                latencies[index].append(time.perf_counter() - began)
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    audit_writer.stop()
+
+    samples = [value for values in latencies for value in values]
+    return {
+        "tasks": len(samples),
+        "seconds": elapsed,
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "errors": errors[:5],
+    }
+
+
+def run_configuration(shards: int, args) -> dict:
+    """Run one configuration in a child process and return its result"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_PATH": os.path.join(directory, "bench.db"),
+            "STORAGE_BACKEND": "sharded" if shards else "sqlite",
+            "SHARD_COUNT": str(shards or 1),
+            "DB_SYNCHRONOUS": args.synchronous,
+            "LOG_LEVEL": "WARNING",
+            "SCHEDULER_ENABLED": "false",
+        }
+        completed = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.storage", "--child",
+                "--writers", str(args.writers), "--tasks", str(args.tasks), "--users", str(args.users)
+            ],
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            raise SystemExit(f"❌ Run with {shards} shard(s) failed")
+        # Startup may log first; the result is the last line
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare task write throughput across shard counts")
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 1, 2, 4, 8],
+                        help="shard counts to run; 0 is the single-file backend")
+    parser.add_argument("--writers", type=int, default=8, help="concurrent writer threads")
+    parser.add_argument("--tasks", type=int, default=300, help="tasks created by each writer")
+    parser.add_argument("--users", type=int, default=64, help="assignees the tasks are spread over")
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"],
+                        help="PRAGMA synchronous for every file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_writers(args.writers, args.tasks, args.users)))
+        return
+
+    print(f"📦 {args.writers} writers x {args.tasks} tasks, {args.users} assignees, synchronous={args.synchronous}")
+    print(f"{'storage':>10}  {'tasks/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}  {'speedup':>7}")
+    baseline = None
+    for shards in args.shards:
+        result = run_configuration(shards, args)
+        if result["errors"]:
+            print(f"❌ {shards} shard(s): {result['errors']}")
+            sys.exit(1)
+        baseline = baseline or result["throughput"]
+        label = f"{shards} shards" if shards else "single"
+        print(
+            f"{label:>10}  {result['throughput']:>9.0f}  {result['p50_ms']:>8.2f}  "
+            f"{result['p99_ms']:>8.2f}  {result['throughput'] / baseline:>6.2f}x"
+        )
+
+    print("✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
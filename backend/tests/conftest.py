@@ -0,0 +1,42 @@
+"""
+Test setup. ``app`` reads its settings once at import, so the environment
+points it at a scratch database here, before any test module imports it;
+tests never open ``task_manager.db``. ``STORAGE_BACKEND`` defaults to the
+single-file layout; test_sharded_storage re-runs itself with ``sharded``.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+_directory = tempfile.mkdtemp(prefix="task-manager-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_directory, "test.db")
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The migrated scratch database, removed after the session"""
+    from app.database import init_db, close_db
+
+    init_db()
+    yield os.environ["DATABASE_PATH"]
+    close_db()
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+@pytest.fixture
+async def api(database):
+    """HTTP client calling the app in-process (startup hooks are not run)"""
+    import httpx
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
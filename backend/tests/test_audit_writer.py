@@ -0,0 +1,70 @@
+"""
+Audit writer resilience: a failed batch is counted and logged, and the
+writer thread keeps running and acknowledging its queue.
+"""
+import threading
+import time
+
+from app.database import PoolTimeout, get_db
+from app.utils import audit_writer as audit_writer_module
+from app.utils.audit_writer import AuditWriter
+
+
+def audit_row(entity_id: int) -> tuple:
+    return (1, "test", "task", entity_id, None, "2024-01-01T00:00:00")
+
+
+def flush_within(writer: AuditWriter, seconds: float = 5.0) -> bool:
+    """Whether ``writer.flush()`` returns in time (it hangs if a row is never acknowledged)"""
+    thread = threading.Thread(target=writer.flush, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
+
+
+def test_writer_survives_pool_timeout(database, monkeypatch):
+    writer = AuditWriter(max_queue=100, batch_size=10, flush_interval=0.01, enqueue_timeout=0.1)
+    writer.start()
+    try:
+        def exhausted_pool():
+            raise PoolTimeout("Timed out waiting for a database connection")
+
+        monkeypatch.setattr(audit_writer_module, "get_db", exhausted_pool)
+        writer.submit([audit_row(n) for n in range(3)])
+        assert flush_within(writer)
+        assert writer.running
+        assert writer.stats()["failed"] == 3
+
+        monkeypatch.undo()
+        writer.submit([audit_row(1_000_001), audit_row(1_000_002)])
+        assert flush_within(writer)
+        assert writer.stats()["written"] == 2
+        with get_db() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM audit_logs WHERE entity_id IN (1000001, 1000002)"
+            ).fetchone()[0]
+        assert count == 2
+    finally:
+        writer.stop()
+    assert not writer.running
+
+
+def test_full_queue_blocks_submit_for_one_timeout(database):
+    writer = AuditWriter(max_queue=5, batch_size=10, flush_interval=0.01, enqueue_timeout=0.2)
+    # A writer thread that never drains the queue
+    release = threading.Event()
+    writer._thread = threading.Thread(target=release.wait, daemon=True)
+    writer._thread.start()
+    try:
+        began = time.monotonic()
+        writer.submit([audit_row(n) for n in range(100)])
+        elapsed = time.monotonic() - began
+    finally:
+        release.set()
+        writer._thread.join()
+        writer._thread = None
+
+    assert elapsed < 2 * writer.enqueue_timeout
+    stats = writer.stats()
+    assert stats["enqueued"] == 5
+    assert stats["dropped"] == 95
@@ -0,0 +1,17 @@
+"""
+Principal cache invalidation waits for the user write to commit, so a
+concurrent request cannot re-cache the row as it was before the change.
+"""
+from app.database import get_db
+from app.services.auth_service import AuthService
+from app.utils.auth_cache import principal_cache
+
+
+def test_registration_invalidates_after_commit(database):
+    email = "cache-after-commit@test.local"
+    principal_cache.set(email, {"email": email, "stale": True})
+
+    with get_db():
+        AuthService._create_user("Cache Test", email, "x")
+        assert principal_cache.get(email) == {"email": email, "stale": True}
+    assert principal_cache.get(email) is None
@@ -0,0 +1,83 @@
+"""
+Task import validates every row, inserts the valid ones chunk by chunk and
+reports each rejected row by line number.
+"""
+import io
+import json
+
+import pytest
+
+from app.database import get_db
+from app.services import import_service
+from app.services.import_service import ImportService
+from app.services.token_service import TokenService
+
+
+@pytest.fixture(scope="module")
+def admin(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Import Test', 'import-admin@test.local', 'x', 'admin', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """)
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+def imported(title_prefix: str) -> dict:
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT title, status, assigned_to FROM tasks WHERE title LIKE ? ORDER BY id", (f"{title_prefix}%",)
+        ).fetchall()
+    return {row["title"]: (row["status"], row["assigned_to"]) for row in rows}
+
+
+async def test_csv_upload_reports_rejected_rows(api, admin):
+    with get_db() as conn:
+        token = TokenService.issue(conn.cursor(), admin)["access_token"]
+    body = (
+        "title,status,priority,assignee_email,due_date\n"
+        "CSV ok,done,high,IMPORT-ADMIN@test.local,\n"
+        "CSV bad status,archived,low,,\n"
+        "CSV nobody,todo,low,ghost@test.local,\n"
+        "CSV plain,,,,2030-01-01T00:00:00\n"
+    )
+    response = await api.post(
+        "/api/admin/import/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("tasks.csv", body.encode(), "text/csv")}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total_rows"], report["imported"], report["failed"]) == (4, 2, 2)
+    assert [error["row"] for error in report["errors"]] == [3, 4]
+    assert report["errors"][1]["errors"] == ["Unknown assignee email 'ghost@test.local'"]
+    assert imported("CSV ") == {"CSV ok": ("done", admin["id"]), "CSV plain": ("todo", None)}
+
+
+def test_ndjson_import_in_chunks(admin, monkeypatch):
+    flushed = []
+    flush = ImportService._flush
+    monkeypatch.setattr(ImportService, "_flush", staticmethod(
+        lambda batch, created_by: (flushed.append(len(batch)), flush(batch, created_by))
+    ))
+    lines = [json.dumps({"title": f"Chunked {n}", "assigned_to": admin["id"]}) for n in range(5)]
+    lines[2:2] = ["not json", "[1, 2]", json.dumps({"description": "no title"})]
+
+    report = ImportService.import_tasks(io.StringIO("\n".join(lines)), "ndjson", admin["id"], chunk_size=2)
+
+    assert flushed == [2, 2, 1]
+    assert (report["total_rows"], report["imported"], report["failed"]) == (8, 5, 3)
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["errors"][0].startswith("Invalid JSON")
+    assert len(imported("Chunked ")) == 5
+
+
+def test_error_report_is_capped(admin, monkeypatch):
+    monkeypatch.setattr(import_service, "MAX_REPORTED_ERRORS", 2)
+    stream = io.StringIO("\n".join(json.dumps({"title": "Capped", "status": "nope"}) for _ in range(4)))
+    report = ImportService.import_tasks(stream, "ndjson", admin["id"])
+    assert report["failed"] == 4
+    assert len(report["errors"]) == 2
+    assert report["errors_truncated"] is True
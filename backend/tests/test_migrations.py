@@ -0,0 +1,111 @@
+"""
+Schema migrations: the runner's bookkeeping, and EXPLAIN QUERY PLAN checks
+that the task, audit and scheduled-job queries are served by the indexes
+the migrations create rather than by table scans.
+"""
+import logging
+import re
+
+import pytest
+
+from app.database import DATABASE_PATH, get_db, init_db
+from app.migrations import MIGRATIONS, current_version, run_migrations
+from app.services.task_repository import OVERDUE_SQL, TASK_COLUMNS_SQL
+
+TASK_LIST_SQL = f"SELECT {TASK_COLUMNS_SQL} FROM tasks t LEFT JOIN users u ON t.assigned_to = u.id"
+NEWEST_FIRST_SQL = " ORDER BY t.created_at DESC, t.id DESC LIMIT ?"
+
+# A table read without any index: "SCAN tasks", "SCAN t"
+FULL_SCAN = re.compile(r"^SCAN \w+$")
+
+
+def query_plan(sql: str) -> list:
+    """EXPLAIN QUERY PLAN details for ``sql``, every parameter bound to 1"""
+    with get_db() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", [1] * sql.count("?")).fetchall()
+    return [row["detail"] for row in rows]
+
+
+def assert_uses_index(sql: str, index: str, ordered: bool = False):
+    plan = query_plan(sql)
+    scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+    assert not scans, f"full table scan in {plan}"
+    assert any(f"INDEX {index} " in f"{detail} " for detail in plan), f"{index} not used in {plan}"
+    if ordered:
+        assert not any("TEMP B-TREE" in detail for detail in plan), f"sorted in memory: {plan}"
+
+
+def test_every_migration_is_recorded(database):
+    with get_db() as conn:
+        assert current_version(conn) == MIGRATIONS[-1][0]
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    assert versions == [version for version, _, _ in MIGRATIONS]
+
+
+def test_migrations_apply_once(database):
+    with get_db() as conn:
+        assert run_migrations(conn) == []
+        assert current_version(conn) == MIGRATIONS[-1][0]
+
+
+def test_init_db_reports_through_logging(database, caplog):
+    with caplog.at_level(logging.INFO, logger="app.database"):
+        init_db()
+    assert [(record.name, record.levelno, record.getMessage()) for record in caplog.records] == [
+        ("app.database", logging.INFO, f"Database initialized at {DATABASE_PATH}")
+    ]
+
+
+@pytest.mark.parametrize("sql, index, ordered", [
+    # A user's task list
+    (TASK_LIST_SQL + " WHERE t.assigned_to = ?" + NEWEST_FIRST_SQL, "idx_tasks_assigned_created", True),
+    # Admin task list, newest first
+    (TASK_LIST_SQL + NEWEST_FIRST_SQL, "idx_tasks_created", True),
+    # Status filter
+    (TASK_LIST_SQL + " WHERE t.status = ?" + NEWEST_FIRST_SQL, "idx_tasks_status_created", True),
+    # Status and priority filter / breakdown
+    ("SELECT COUNT(*) FROM tasks t WHERE t.status = ? AND t.priority = ?", "idx_tasks_status_priority", False),
+    ("SELECT status, priority, COUNT(*) FROM tasks GROUP BY status, priority", "idx_tasks_status_priority", True),
+], ids=["user-list", "admin-list", "status-filter", "status-priority-filter", "status-priority-breakdown"])
+def test_task_list_and_filter_queries_use_indexes(database, sql, index, ordered):
+    assert_uses_index(sql, index, ordered)
+
+
+@pytest.mark.parametrize("sql, index", [
+    (f"SELECT COUNT(*) FROM tasks t WHERE {OVERDUE_SQL}", "idx_tasks_open_due_ts"),
+    (TASK_LIST_SQL + f" WHERE ({OVERDUE_SQL})" + NEWEST_FIRST_SQL, "idx_tasks_open_due_ts"),
+    (TASK_LIST_SQL + f" WHERE t.assigned_to = ? AND ({OVERDUE_SQL})" + NEWEST_FIRST_SQL,
+     "idx_tasks_assigned_open_due_ts"),
+    # Due-date range filter
+    (TASK_LIST_SQL + " WHERE t.due_ts >= ? AND t.due_ts < ?" + NEWEST_FIRST_SQL, "idx_tasks_due_ts"),
+    # Scheduled overdue sweep and reminders (SQLiteTaskRepository.mark_overdue / mark_reminders)
+    ("""
+        SELECT id FROM tasks
+        WHERE status != 'done' AND overdue_marked_at IS NULL
+        AND due_ts IS NOT NULL AND due_ts < ?
+        ORDER BY due_ts LIMIT ?
+    """, "idx_tasks_overdue_pending"),
+    ("""
+        SELECT id FROM tasks
+        WHERE status != 'done' AND reminder_sent_at IS NULL
+        AND due_ts IS NOT NULL AND due_ts >= ? AND due_ts < ?
+        ORDER BY due_ts LIMIT ?
+    """, "idx_tasks_reminder_pending"),
+], ids=["overdue-count", "overdue-list", "user-overdue-list", "due-range", "overdue-sweep", "reminders"])
+def test_overdue_queries_use_indexes(database, sql, index):
+    # Overdue pages sort the (few) matching rows; the index does the filtering
+    assert_uses_index(sql, index)
+
+
+@pytest.mark.parametrize("sql, index", [
+    ("SELECT * FROM audit_logs WHERE entity_type = ? AND entity_id = ? ORDER BY id DESC", "idx_audit_logs_entity"),
+    ("SELECT * FROM audit_logs WHERE user_id = ? ORDER BY id DESC LIMIT ?", "idx_audit_logs_user"),
+], ids=["by-entity", "by-user"])
+def test_audit_queries_use_indexes(database, sql, index):
+    assert_uses_index(sql, index)
+
+
+def test_full_scan_is_reported(database):
+    # A filter no index covers must trip the check above
+    with pytest.raises(AssertionError, match="full table scan"):
+        assert_uses_index("SELECT * FROM tasks WHERE title = ?", "idx_tasks_created")
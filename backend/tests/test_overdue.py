@@ -0,0 +1,88 @@
+"""
+Overdue state comes from the normalized ``due_ts`` column, kept in step
+with ``due_date`` on every write, and from one shared due-date parser.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import get_db
+from app.services.analytics_service import AnalyticsService
+from app.services.task_service import TaskService
+from app.utils.dates import parse_due_date, to_timestamp
+
+PAST = "2020-01-01T00:00:00"
+FUTURE = "2999-01-01T00:00:00"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-03-05T10:20:30", datetime(2024, 3, 5, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-03-05T10:20:30Z", datetime(2024, 3, 5, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-03-05T12:20:30+02:00", datetime(2024, 3, 5, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-03-05T12:20:30+0200", datetime(2024, 3, 5, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-3-5 9:05", datetime(2024, 3, 5, 9, 5, tzinfo=timezone.utc)),
+    ("2024-03-05T10:20:30.123456789", datetime(2024, 3, 5, 10, 20, 30, 123456, tzinfo=timezone.utc)),
+    ("2024-03-05", datetime(2024, 3, 5, tzinfo=timezone.utc)),
+    ("not a date", None),
+    ("2024-02-30", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_due_date(value, expected):
+    assert parse_due_date(value) == expected
+
+
+@pytest.fixture(scope="module")
+def assignee(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Overdue Test', 'overdue@test.local', 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """)
+        return cursor.lastrowid
+
+
+def overdue_ids(assignee: int) -> list:
+    page = TaskService.list_tasks(role="admin", assigned_to=assignee, overdue=True)
+    return [task["id"] for task in page["tasks"]]
+
+
+def stored_due_ts(task_id: int):
+    with get_db() as conn:
+        return conn.execute("SELECT due_ts FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_overdue_follows_due_date_updates(assignee):
+    before = AnalyticsService.get_summary(0)["overdue_tasks"]
+    task = TaskService.create_task({"title": "Late", "due_date": PAST, "assigned_to": assignee}, assignee)
+    assert task["is_overdue"] is True
+    assert stored_due_ts(task["id"]) == to_timestamp(PAST)
+    assert overdue_ids(assignee) == [task["id"]]
+    assert AnalyticsService.get_summary(0)["overdue_tasks"] == before + 1
+
+    moved = TaskService.update_task(task["id"], {"due_date": FUTURE}, assignee, "admin")
+    assert moved["is_overdue"] is False
+    assert stored_due_ts(task["id"]) == to_timestamp(FUTURE)
+    assert overdue_ids(assignee) == []
+    assert AnalyticsService.get_summary(0)["overdue_tasks"] == before
+
+    TaskService.update_task(task["id"], {"due_date": PAST}, assignee, "admin")
+    assert overdue_ids(assignee) == [task["id"]]
+    done = TaskService.update_task(task["id"], {"status": "done"}, assignee, "admin")
+    assert done["is_overdue"] is False
+    assert overdue_ids(assignee) == []
+    assert AnalyticsService.get_summary(0)["overdue_tasks"] == before
+
+
+def test_due_range_filters(assignee):
+    soon = (datetime.utcnow() + timedelta(days=1)).replace(microsecond=0).isoformat()
+    task = TaskService.create_task({"title": "Soon", "due_date": soon, "assigned_to": assignee}, assignee)
+
+    def due_between(after=None, before=None) -> list:
+        page = TaskService.list_tasks(role="admin", assigned_to=assignee, due_after=after, due_before=before)
+        return [found["id"] for found in page["tasks"]]
+
+    assert task["id"] in due_between(after=datetime.utcnow().isoformat())
+    assert task["id"] not in due_between(before=datetime.utcnow().isoformat())
+    assert task["id"] in due_between(before=FUTURE)
@@ -0,0 +1,83 @@
+"""
+Task lists page by keyset: ``X-Next-Cursor`` points after the last
+(created_at, id) of a page, so ties on created_at neither repeat nor skip
+tasks, and writes between pages do not shift later pages.
+"""
+import pytest
+
+from app.database import get_db
+from app.services.task_service import TaskService
+from app.services.token_service import TokenService
+
+TASKS = 9
+
+
+def create_user(email: str, role: str) -> dict:
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Page Test', ?, 'x', ?, '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """, (email, role))
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+def bearer(user: dict) -> dict:
+    with get_db() as conn:
+        return {"Authorization": f"Bearer {TokenService.issue(conn.cursor(), user)['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def accounts(database):
+    admin = create_user("page-admin@test.local", "admin")
+    assignee = create_user("page-user@test.local", "user")
+    # One bulk insert: every task shares the same created_at
+    summary = TaskService.bulk_create_tasks(
+        [{"title": f"Page {n}", "assigned_to": assignee["id"]} for n in range(TASKS)], admin["id"]
+    )
+    return admin, assignee, [result["id"] for result in summary["results"]]
+
+
+async def pages(api, path: str, headers: dict, params: dict) -> list:
+    """Task ids of every page, following ``X-Next-Cursor``"""
+    collected = []
+    cursor = None
+    while True:
+        response = await api.get(path, headers=headers, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        collected.append([task["id"] for task in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return collected
+
+
+async def test_cursor_pages_through_ties(api, accounts):
+    admin, assignee, task_ids = accounts
+    collected = await pages(api, "/api/admin/tasks", bearer(admin), {"limit": 2, "assigned_to": assignee["id"]})
+
+    assert [len(page) for page in collected] == [2, 2, 2, 2, 1]
+    assert [task_id for page in collected for task_id in page] == sorted(task_ids, reverse=True)
+
+
+async def test_user_pages_are_stable_under_inserts(api, accounts):
+    _, assignee, task_ids = accounts
+    headers = bearer(assignee)
+    first = await api.get("/api/user/tasks", headers=headers, params={"limit": 4})
+    # A newer task lands before the cursor and must not shift the next page
+    newer = TaskService.create_task({"title": "Page newer", "assigned_to": assignee["id"]}, assignee["id"])
+    second = await api.get(
+        "/api/user/tasks", headers=headers, params={"limit": 4, "cursor": first.headers["x-next-cursor"]}
+    )
+
+    newest_first = sorted(task_ids, reverse=True)
+    assert [task["id"] for task in first.json()] == newest_first[:4]
+    assert [task["id"] for task in second.json()] == newest_first[4:8]
+    assert newer["id"] not in [task["id"] for task in second.json()]
+    TaskService.delete_task(newer["id"], assignee["id"])
+
+
+async def test_invalid_cursor_is_rejected(api, accounts):
+    admin, _, _ = accounts
+    response = await api.get("/api/admin/tasks", headers=bearer(admin), params={"limit": 2, "cursor": "%%%"})
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+"""
+The hashing pool's worker processes import ``app.utils.passwords`` to run
+their functions, which must not load (and migrate) the database.
+"""
+import os
+import subprocess
+import sys
+
+from app.utils.executors import run_hash, shutdown_hash_pool
+from app.utils.passwords import get_password_hash, verify_and_update_password
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def loaded_modules(module: str) -> set:
+    """``app`` modules loaded by importing ``module`` in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sorted(sys.modules)))"],
+        cwd=BACKEND_DIR, env=os.environ, capture_output=True, text=True, check=True
+    )
+    return {name for name in completed.stdout.split() if name.split(".")[0] == "app"}
+
+
+def test_password_module_loads_without_the_database():
+    modules = loaded_modules("app.utils.passwords")
+    assert "app.utils.passwords" in modules
+    assert "app.database" not in modules
+    assert "app.utils.dependencies" not in modules
+
+
+async def test_hash_pool_round_trip(database):
+    try:
+        hashed = await run_hash(get_password_hash, "correct horse")
+        assert await run_hash(verify_and_update_password, "correct horse", hashed) == (True, None)
+        assert (await run_hash(verify_and_update_password, "wrong", hashed))[0] is False
+    finally:
+        shutdown_hash_pool()
@@ -0,0 +1,71 @@
+"""
+``X-Profile: 1`` only profiles requests that ``require_admin`` would let
+through: revoked, non-admin and disabled users' tokens are ignored.
+"""
+from datetime import timedelta
+
+import pytest
+
+from app.database import get_db
+from app.middleware import _admin_profile_requested
+from app.services.token_service import TokenService
+from app.utils.auth_cache import principal_cache
+from app.utils.security import create_access_token
+
+
+def create_user(email: str, role: str, is_active: int = 1) -> dict:
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, is_active, created_at, updated_at)
+            VALUES ('Profile Test', ?, 'x', ?, ?, '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """, (email, role, is_active))
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+def login(user: dict) -> str:
+    with get_db() as conn:
+        return TokenService.issue(conn.cursor(), user)["access_token"]
+
+
+def profile_scope(token: str, header: bytes = b"1") -> dict:
+    return {"type": "http", "headers": [(b"x-profile", header), (b"authorization", f"Bearer {token}".encode())]}
+
+
+@pytest.fixture(scope="module")
+def admin(database):
+    return create_user("profile-admin@test.local", "admin")
+
+
+async def test_admin_token_is_profiled(admin):
+    token = login(admin)
+    assert await _admin_profile_requested(profile_scope(token))
+    assert not await _admin_profile_requested(profile_scope(token, b"0"))
+
+
+async def test_user_token_is_not_profiled(database):
+    user = create_user("profile-user@test.local", "user")
+    assert not await _admin_profile_requested(profile_scope(login(user)))
+
+
+async def test_revoked_admin_token_is_not_profiled(admin):
+    token = login(admin)
+    with get_db() as conn:
+        session_id = conn.execute(
+            "SELECT session_id FROM refresh_tokens WHERE user_id = ? ORDER BY id DESC LIMIT 1", (admin["id"],)
+        ).fetchone()[0]
+    TokenService.logout(session_id=session_id, user_id=admin["id"])
+    assert not await _admin_profile_requested(profile_scope(token))
+
+
+async def test_disabled_admin_is_not_profiled(database):
+    # Tokens from before claims-based authorization are checked against the user row
+    disabled = create_user("profile-disabled@test.local", "admin", is_active=0)
+    principal_cache.pop(disabled["email"])
+    token = create_access_token({"sub": disabled["email"], "role": "admin"}, timedelta(minutes=5))
+    assert not await _admin_profile_requested(profile_scope(token))
+
+
+async def test_invalid_token_is_not_profiled(database):
+    assert not await _admin_profile_requested(profile_scope("not-a-token"))
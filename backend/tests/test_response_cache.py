@@ -0,0 +1,94 @@
+"""
+Task lists answer a current ``If-None-Match`` with 304, serve repeat
+requests from the response cache, and drop cached bodies once a write
+that concerns the caller commits.
+"""
+import pytest
+
+from app.database import get_db
+from app.services.task_service import TaskService
+from app.services.token_service import TokenService
+from app.utils.response_cache import response_cache, response_scope
+
+
+def create_user(email: str) -> dict:
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Cache Test', ?, 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """, (email,))
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+def bearer(user: dict) -> dict:
+    with get_db() as conn:
+        return {"Authorization": f"Bearer {TokenService.issue(conn.cursor(), user)['access_token']}"}
+
+
+def cached_keys(user: dict) -> set:
+    return response_cache._scopes.get(response_scope(user["id"], "user"), set())
+
+
+@pytest.fixture
+def users(database, request):
+    response_cache.clear()
+    name = request.node.name
+    return create_user(f"{name}@test.local"), create_user(f"{name}-other@test.local")
+
+
+async def test_unchanged_list_is_not_modified(api, users):
+    user, _ = users
+    TaskService.create_task({"title": "Cached", "assigned_to": user["id"]}, user["id"])
+    headers = bearer(user)
+
+    first = await api.get("/api/user/tasks", headers=headers)
+    assert first.status_code == 200 and first.headers["etag"]
+
+    revalidated = await api.get("/api/user/tasks", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == first.headers["etag"]
+
+    hits = response_cache.hits
+    repeat = await api.get("/api/user/tasks", headers=headers)
+    assert repeat.content == first.content
+    assert response_cache.hits == hits + 1
+
+
+async def test_write_invalidates_the_callers_entries(api, users):
+    user, other = users
+    headers = bearer(user)
+    first = await api.get("/api/user/tasks", headers=headers)
+    assert cached_keys(user)
+
+    # Another user's task changes neither this user's ETag nor cache entry
+    TaskService.create_task({"title": "Elsewhere", "assigned_to": other["id"]}, other["id"])
+    unrelated = await api.get("/api/user/tasks", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert unrelated.status_code == 304
+    assert cached_keys(user)
+
+    task = TaskService.create_task({"title": "Invalidating", "assigned_to": user["id"]}, user["id"])
+    assert not cached_keys(user)
+
+    changed = await api.get("/api/user/tasks", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert task["id"] in [found["id"] for found in changed.json()]
+
+    # Reassigning away changes the previous assignee's list too
+    TaskService.update_task(task["id"], {"assigned_to": other["id"]}, user["id"], "admin")
+    moved = await api.get("/api/user/tasks", headers={**headers, "If-None-Match": changed.headers["etag"]})
+    assert moved.status_code == 200
+    assert task["id"] not in [found["id"] for found in moved.json()]
+
+
+async def test_rolled_back_write_keeps_the_cache(api, users):
+    user, _ = users
+    await api.get("/api/user/tasks", headers=bearer(user))
+    with pytest.raises(RuntimeError):
+        with get_db():
+            TaskService.create_task({"title": "Never committed", "assigned_to": user["id"]}, user["id"])
+            raise RuntimeError("caller failed")
+    assert cached_keys(user)
@@ -0,0 +1,108 @@
+"""
+Shared jobs run in one process at a time: a run claims the job's lease in
+``scheduled_jobs``, and other schedulers skip the job while the lease is
+held or the interval has not passed.
+"""
+import threading
+import time
+
+from app.database import get_db
+from app.utils.scheduler import Scheduler
+
+
+def job_row(name: str) -> dict:
+    with get_db() as conn:
+        return dict(conn.execute("SELECT * FROM scheduled_jobs WHERE name = ?", (name,)).fetchone())
+
+
+def rewind(name: str, seconds: float):
+    """Pretend the last run started ``seconds`` earlier"""
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE scheduled_jobs SET last_started_at = last_started_at - ? WHERE name = ?", (seconds, name)
+        )
+
+
+def shared_job(scheduler: Scheduler, name: str, func):
+    scheduler.add_job(name, 60, func)
+    job = scheduler._jobs[name]
+    scheduler._first_due(job)
+    return job
+
+
+def test_only_the_lease_holder_runs(database):
+    first, second = Scheduler(jitter=0), Scheduler(jitter=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append("first")
+        started.set()
+        release.wait(5)
+        return {"done": True}
+
+    first_job = shared_job(first, "lease_test", slow)
+    second_job = shared_job(second, "lease_test", lambda: calls.append("second"))
+
+    runner = threading.Thread(target=first._execute, args=(first_job,))
+    runner.start()
+    assert started.wait(5)
+    assert job_row("lease_test")["lease_owner"] == first.owner
+
+    # Held lease: the other process skips and waits for the lease to end
+    due = second._execute(second_job)
+    assert second_job.skipped == 1
+    assert due >= job_row("lease_test")["lease_expires_at"]
+
+    release.set()
+    runner.join(5)
+    row = job_row("lease_test")
+    assert (row["lease_owner"], row["runs"], row["last_result"]) == (None, 1, '{"done": true}')
+
+    # Released, but not due again until an interval after the last start
+    second._execute(second_job)
+    assert second_job.skipped == 2
+
+    rewind("lease_test", 60)
+    second._execute(second_job)
+    assert calls == ["first", "second"]
+    assert job_row("lease_test")["runs"] == 2
+
+
+def test_concurrent_claims_have_one_winner(database):
+    schedulers = [Scheduler(jitter=0) for _ in range(4)]
+    jobs = [shared_job(scheduler, "race_test", lambda: None) for scheduler in schedulers]
+    barrier = threading.Barrier(len(schedulers))
+    now = time.time()
+    won = []
+
+    def claim(scheduler, job):
+        barrier.wait()
+        won.append(scheduler._claim(job, now))
+
+    threads = [threading.Thread(target=claim, args=pair) for pair in zip(schedulers, jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(won) == [False, False, False, True]
+
+
+def test_expired_lease_of_a_dead_process_is_taken_over(database):
+    survivor = Scheduler(jitter=0)
+    calls = []
+    job = shared_job(survivor, "takeover_test", lambda: calls.append(1))
+    with get_db() as conn:
+        conn.execute("""
+            UPDATE scheduled_jobs SET lease_owner = 'dead:1', lease_expires_at = ?, last_started_at = ?
+            WHERE name = 'takeover_test'
+        """, (time.time() + 30, time.time() - 120))
+
+    survivor._execute(job)
+    assert calls == []
+
+    with get_db() as conn:
+        conn.execute("UPDATE scheduled_jobs SET lease_expires_at = ? WHERE name = 'takeover_test'", (time.time() - 1,))
+    survivor._execute(job)
+    assert calls == [1]
+    assert job_row("takeover_test")["lease_owner"] is None
@@ -0,0 +1,100 @@
+"""
+Task search ranks title hits above description hits, highlights matches
+in the snippet and only searches a user's own tasks. It ranks only the
+``SEARCH_RANK_WINDOW`` newest matches and says so: ``total`` counts the
+ranked matches and ``truncated`` is set when older ones were left out.
+"""
+import pytest
+
+from app.config import settings
+from app.database import get_db
+from app.services.task_service import TaskService
+
+MATCHES = 8
+
+
+@pytest.fixture(scope="module")
+def task_ids(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Search Test', 'search@test.local', 'x', 'admin', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """)
+        admin_id = cursor.lastrowid
+    summary = TaskService.bulk_create_tasks(
+        [{"title": f"Zephyrine report {n}"} for n in range(MATCHES)], admin_id
+    )
+    return [result["id"] for result in summary["results"]]
+
+
+def search_all(query: str, limit: int = 3) -> list:
+    """Every page of ``query``, following ``has_more``"""
+    pages = []
+    offset = 0
+    while True:
+        page = TaskService.search_tasks(query, role="admin", limit=limit, offset=offset)
+        pages.append(page)
+        if not page["has_more"]:
+            return pages
+        offset += limit
+
+
+def test_search_within_window(task_ids, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_RANK_WINDOW", MATCHES)
+    pages = search_all("zephyrine")
+    assert {page["total"] for page in pages} == {MATCHES}
+    assert not any(page["truncated"] for page in pages)
+    assert sorted(hit["id"] for page in pages for hit in page["results"]) == sorted(task_ids)
+
+
+def test_search_beyond_window_is_truncated(task_ids, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_RANK_WINDOW", 5)
+    pages = search_all("zephyrine")
+    assert {page["total"] for page in pages} == {5}
+    assert all(page["truncated"] for page in pages)
+    # The newest matches are the ones ranked
+    assert sorted(hit["id"] for page in pages for hit in page["results"]) == sorted(task_ids)[-5:]
+
+
+def test_search_without_matches(database):
+    page = TaskService.search_tasks("qwxzvbnothing", role="admin")
+    assert page == {"results": [], "has_more": False, "total": 0, "truncated": False}
+
+
+@pytest.fixture(scope="module")
+def owners(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        ids = []
+        for email in ("search-owner@test.local", "search-stranger@test.local"):
+            cursor.execute("""
+                INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+                VALUES ('Search Owner', ?, 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+            """, (email,))
+            ids.append(cursor.lastrowid)
+    owner, stranger = ids
+    summary = TaskService.bulk_create_tasks([
+        {"title": "Quarterly budget", "description": "numbers", "assigned_to": owner},
+        {"title": "Team offsite", "description": "book rooms and review the quarterly budget", "assigned_to": owner},
+        {"title": "Quarterly budget for the stranger", "assigned_to": stranger},
+    ], owner)
+    return owner, stranger, [result["id"] for result in summary["results"]]
+
+
+def test_title_hits_rank_first_with_highlights(owners):
+    owner, _, (title_hit, description_hit, _) = owners
+    page = TaskService.search_tasks("quarterly budg", user_id=owner, role="user")
+    assert [hit["id"] for hit in page["results"]] == [title_hit, description_hit]
+    assert page["results"][0]["rank"] < page["results"][1]["rank"]
+    assert page["results"][0]["snippet"] == "<mark>Quarterly</mark> <mark>budget</mark>"
+    assert "<mark>quarterly</mark> <mark>budget</mark>" in page["results"][1]["snippet"]
+
+
+def test_users_only_find_their_own_tasks(owners):
+    owner, stranger, (_, _, stranger_task) = owners
+    assert [hit["id"] for hit in TaskService.search_tasks("stranger", user_id=owner, role="user")["results"]] == []
+    found = TaskService.search_tasks("quarterly", user_id=stranger, role="user")["results"]
+    assert [hit["id"] for hit in found] == [stranger_task]
+    # assigned_to only narrows admin searches
+    assert TaskService.search_tasks("quarterly", user_id=stranger, role="user", assigned_to=owner)["results"] == found
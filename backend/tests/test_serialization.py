@@ -0,0 +1,88 @@
+"""
+The fast task list path (``task_rows`` + ``encode_json``) writes exactly
+the bytes of the validated ``TaskResponse`` path, for every timestamp form
+stored in the tasks table.
+"""
+import pytest
+
+from app import serialization
+from app.config import settings
+from app.database import get_db
+from app.serialization import format_datetime, render_task_page, task_rows, _normalize_datetime
+from app.services.task_service import TaskService
+from app.services.token_service import TokenService
+from app.utils.response_cache import response_cache
+
+# (created_at, due_date, completed_at) as they occur in stored rows
+TIMESTAMPS = [
+    ("2024-01-02T03:04:05.123456", None, None),
+    ("2024-01-02T03:04:05", "2024-06-01T00:00:00", "2024-01-03T00:00:00.000001"),
+    ("2024-01-02 03:04:05", "2024-06-01 12:30:00+00:00", None),
+    ("2024-01-02T03:04:05.000000", "2024-06-01T12:30:00.500000+00:00", None),
+    ("2024-01-02T03:04:05.120000", "2024-06-01T12:30:00+02:00", "2024-01-02T03:04:05+00:00"),
+    ("2024-01-02T03:04:05Z", "2024-06-01T00:00:00.000000+00:00", None),
+]
+
+
+@pytest.fixture(scope="module")
+def assignee(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Zoë “Serializer”', 'serialize@test.local', 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """)
+        user_id = cursor.lastrowid
+    for n, (created_at, due_date, completed_at) in enumerate(TIMESTAMPS):
+        task = TaskService.create_task({
+            "title": f"Serialized {n} – ünïcode \"quoted\"",
+            "description": None if n % 2 else "line\nbreak",
+            "assigned_to": user_id,
+        }, user_id)
+        # Timestamps only: the counters do not depend on them
+        with get_db() as conn:
+            conn.execute(
+                "UPDATE tasks SET created_at = ?, updated_at = ?, due_date = ?, completed_at = ? WHERE id = ?",
+                (created_at, created_at, due_date, completed_at, task["id"])
+            )
+    return user_id
+
+
+@pytest.mark.parametrize("value", sorted({value for row in TIMESTAMPS for value in row if value}))
+def test_format_datetime_matches_pydantic(value):
+    assert format_datetime(value) == _normalize_datetime(value)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_fast_page_matches_validated_page(assignee, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    def page(fast: bool):
+        return render_task_page(TaskService.list_tasks(
+            role="admin", assigned_to=assignee, limit=4, convert_rows=task_rows if fast else None
+        ), fast)
+
+    fast_body, fast_headers = page(True)
+    slow_body, slow_headers = page(False)
+    assert fast_body == slow_body
+    assert fast_headers == slow_headers and "X-Next-Cursor" in fast_headers
+
+
+async def test_routes_render_the_same_bytes(api, assignee, monkeypatch):
+    with get_db() as conn:
+        user = dict(conn.execute("SELECT * FROM users WHERE id = ?", (assignee,)).fetchone())
+        headers = {"Authorization": f"Bearer {TokenService.issue(conn.cursor(), user)['access_token']}"}
+
+    bodies = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_TASK_SERIALIZATION", fast)
+        # The cache key does not depend on the flag
+        response_cache.clear()
+        response = await api.get("/api/user/tasks", headers=headers)
+        assert response.status_code == 200
+        bodies.append(response.content)
+    assert bodies[0] == bodies[1]
+    assert len(bodies[0]) > 2
@@ -0,0 +1,168 @@
+"""
+``ShardedTaskRepository`` through the task service: ids stride across
+shards, lists merge shards in (created_at, id) order with working cursors,
+and updates and deletes reach the shard that holds the task.
+
+Settings are read once at import, so the default session runs this module
+again in a child session with ``STORAGE_BACKEND=sharded``; there the
+tests below run and ``test_sharded_session`` is skipped.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.database import get_db, shard_files
+from app.migrations import SHARD_MIGRATIONS, current_version
+from app.services.stats_service import StatsService
+from app.services.task_repository import task_repository
+from app.services.task_service import TaskService
+
+SHARDS = 3
+SHARDED = settings.STORAGE_BACKEND == "sharded"
+sharded = pytest.mark.skipif(not SHARDED, reason="runs in the sharded child session")
+
+
+@pytest.mark.skipif(SHARDED, reason="already the sharded session")
+def test_sharded_session():
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", os.path.abspath(__file__)],
+        cwd=backend,
+        env={**os.environ, "STORAGE_BACKEND": "sharded", "SHARD_COUNT": str(SHARDS)},
+        capture_output=True,
+        text=True
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+
+
+@pytest.fixture(scope="module")
+def users(database):
+    """Two user ids per shard, keyed by shard index"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        ids = []
+        for n in range(SHARDS * 2):
+            cursor.execute("""
+                INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+                VALUES ('Shard Test', ?, 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+            """, (f"shard{n}@test.local",))
+            ids.append(cursor.lastrowid)
+    by_shard = {}
+    for user_id in ids:
+        by_shard.setdefault(user_id % SHARDS, []).append(user_id)
+    return by_shard
+
+
+def stored_on(task_id: int) -> list:
+    """Schemas whose tasks table holds ``task_id``"""
+    with get_db() as conn:
+        return [
+            schema for schema, _ in shard_files()
+            if conn.execute(f"SELECT 1 FROM {schema}.tasks WHERE id = ?", (task_id,)).fetchone()
+        ]
+
+
+@sharded
+def test_shards_are_attached_and_migrated(database):
+    schemas = [schema for schema, _ in shard_files()]
+    assert schemas == [f"shard{index}" for index in range(SHARDS)]
+    assert [shard.schema for shard in task_repository.partitions] == schemas
+    with get_db() as conn:
+        attached = {row["name"] for row in conn.execute("PRAGMA database_list")}
+    assert set(schemas) <= attached
+    for _, path in shard_files():
+        shard = sqlite3.connect(path)
+        try:
+            assert current_version(shard) == SHARD_MIGRATIONS[-1][0]
+        finally:
+            shard.close()
+
+
+@sharded
+def test_ids_stride_across_shards(users):
+    created = []
+    for index in range(SHARDS):
+        for assignee in users[index]:
+            created.append((index, TaskService.create_task(
+                {"title": f"Striding {assignee}", "assigned_to": assignee}, assignee
+            )))
+    unassigned = TaskService.create_task({"title": "Striding nobody"}, users[0][0])
+
+    ids = [task["id"] for _, task in created] + [unassigned["id"]]
+    assert len(set(ids)) == len(ids)
+    for index, task in created:
+        assert task["id"] % SHARDS == index
+        assert stored_on(task["id"]) == [f"shard{index}"]
+    assert stored_on(unassigned["id"]) == ["shard0"]
+
+
+@sharded
+def test_list_merges_shards_in_order(users):
+    assignees = [user_id for index in range(SHARDS) for user_id in users[index]]
+    # One bulk insert shares a created_at, so the merge has to break ties by id
+    summary = TaskService.bulk_create_tasks(
+        [{"title": f"Merged {n}", "assigned_to": assignees[n % len(assignees)]} for n in range(20)],
+        assignees[0]
+    )
+    assert summary["failed"] == 0
+
+    everything = TaskService.list_tasks(role="admin")["tasks"]
+    keys = [(task["created_at"], task["id"]) for task in everything]
+    assert keys == sorted(keys, reverse=True)
+
+    paged, cursor = [], None
+    while True:
+        page = TaskService.list_tasks(role="admin", limit=3, cursor=cursor)
+        paged.extend(task["id"] for task in page["tasks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert paged == [task["id"] for task in everything]
+
+    own = TaskService.list_tasks(user_id=assignees[1], role="user")["tasks"]
+    assert own and {task["assigned_to"] for task in own} == {assignees[1]}
+    assert [task["id"] for task in own] == [task["id"] for task in everything if task["assigned_to"] == assignees[1]]
+
+
+@sharded
+def test_update_moves_task_between_shards(users):
+    source, target = users[1][0], users[2][0]
+    task = TaskService.create_task({"title": "Moving", "assigned_to": source}, source)
+    assert stored_on(task["id"]) == ["shard1"]
+
+    moved = TaskService.update_task(task["id"], {"assigned_to": target, "status": "done"}, source, "admin")
+    assert moved["id"] == task["id"]
+    assert moved["assigned_to"] == target and moved["status"] == "done"
+    assert stored_on(task["id"]) == ["shard2"]
+    assert TaskService.get_task_by_id(task["id"])["title"] == "Moving"
+
+    # Updates that stay on the shard are written in place
+    TaskService.update_task(task["id"], {"title": "Moved"}, target, "admin")
+    assert stored_on(task["id"]) == ["shard2"]
+
+    TaskService.bulk_reassign_tasks([task["id"]], None, target)
+    assert stored_on(task["id"]) == ["shard0"]
+    assert StatsService.verify() == []
+
+
+@sharded
+def test_delete_reaches_the_owning_shard(users):
+    tasks = [
+        TaskService.create_task({"title": f"Doomed {index}", "assigned_to": users[index][1]}, users[index][1])
+        for index in range(SHARDS)
+    ]
+    TaskService.delete_task(tasks[1]["id"], users[1][1])
+    assert stored_on(tasks[1]["id"]) == []
+    with pytest.raises(HTTPException) as raised:
+        TaskService.get_task_by_id(tasks[1]["id"])
+    assert raised.value.status_code == 404
+
+    summary = TaskService.bulk_delete_tasks([tasks[0]["id"], tasks[2]["id"], tasks[1]["id"]], users[0][1])
+    assert [result["error"] for result in summary["results"]] == [None, None, "Task not found"]
+    assert all(stored_on(task["id"]) == [] for task in tasks)
+    assert StatsService.verify() == []
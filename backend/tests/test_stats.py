@@ -0,0 +1,77 @@
+"""
+Materialized task counters stay equal to ``COUNT(*)`` over the tasks table
+through single and bulk writes, and ``rebuild`` reports and repairs drift.
+"""
+import pytest
+
+from app.database import get_db
+from app.services.stats_service import StatsService
+from app.services.task_service import TaskService
+
+
+@pytest.fixture(scope="module")
+def users(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        ids = []
+        for n in range(3):
+            cursor.execute("""
+                INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+                VALUES ('Stats Test', ?, 'x', 'admin', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+            """, (f"stats{n}@test.local",))
+            ids.append(cursor.lastrowid)
+    return ids
+
+
+def test_counters_follow_every_write(users):
+    admin, first, second = users
+    task = TaskService.create_task({"title": "Counted", "priority": "high", "assigned_to": first}, admin)
+    assert StatsService.verify() == []
+
+    TaskService.update_task(task["id"], {"status": "done", "assigned_to": second}, admin, "admin")
+    assert StatsService.verify() == []
+
+    TaskService.delete_task(task["id"], admin)
+    assert StatsService.verify() == []
+
+    created = TaskService.bulk_create_tasks([
+        {"title": f"Bulk counted {n}", "priority": ("low", "medium", "high")[n % 3],
+         "assigned_to": (None, first, second)[n % 3]}
+        for n in range(9)
+    ], admin)
+    ids = [result["id"] for result in created["results"]]
+    assert StatsService.verify() == []
+
+    TaskService.bulk_update_tasks([
+        {"id": task_id, "status": ("todo", "in-progress", "done")[n % 3], "priority": "low"}
+        for n, task_id in enumerate(ids)
+    ], admin)
+    assert StatsService.verify() == []
+
+    TaskService.bulk_reassign_tasks(ids[:5], second, admin)
+    TaskService.bulk_reassign_tasks(ids[5:], None, admin)
+    assert StatsService.verify() == []
+
+    TaskService.bulk_delete_tasks(ids[::2], admin)
+    assert StatsService.verify() == []
+
+    with get_db() as conn:
+        total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    counters = StatsService.get_counters()
+    assert sum(counters["status"].values()) == total
+    assert sum(counters["assignee"].values()) == total
+
+
+def test_rebuild_repairs_drift(users):
+    with get_db() as conn:
+        conn.execute("UPDATE task_counters SET count = count + 5 WHERE scope = 'status' AND key = 'todo'")
+    assert StatsService.verify() == [
+        {"schema": "main", "scope": "status", "key": "todo",
+         "stored": StatsService.get_counters()["status"]["todo"],
+         "actual": StatsService.get_counters()["status"]["todo"] - 5}
+    ]
+    fixed = StatsService.rebuild()
+    assert [(entry["scope"], entry["key"], entry["stored"] - entry["actual"]) for entry in fixed] == [
+        ("status", "todo", 5)
+    ]
+    assert StatsService.verify() == []
@@ -0,0 +1,60 @@
+"""
+Event streams authenticate with single-use tickets instead of access
+tokens in the URL.
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.database import get_db
+from app.services.token_service import TokenService
+from app.utils.dependencies import _decode_token, get_stream_user
+
+
+@pytest.fixture(scope="module")
+def claims(database):
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Stream Test', 'stream@test.local', 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """)
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        user = dict(cursor.fetchone())
+        tokens = TokenService.issue(cursor, user)
+    return _decode_token(tokens["access_token"])
+
+
+async def test_ticket_works_once(claims):
+    ticket = TokenService.issue_stream_ticket(claims)["ticket"]
+    user = await get_stream_user(token=None, ticket=ticket)
+    assert user["email"] == "stream@test.local"
+
+    with pytest.raises(HTTPException) as raised:
+        await get_stream_user(token=None, ticket=ticket)
+    assert raised.value.status_code == 401
+
+
+async def test_expired_ticket_is_refused(claims, monkeypatch):
+    ticket = TokenService.issue_stream_ticket(claims)["ticket"]
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+    with pytest.raises(HTTPException):
+        await get_stream_user(token=None, ticket=ticket)
+
+
+async def test_ticket_of_revoked_session_is_refused(claims):
+    ticket = TokenService.issue_stream_ticket(claims)["ticket"]
+    TokenService.logout(session_id=claims["sid"], user_id=claims["uid"])
+    with pytest.raises(HTTPException) as raised:
+        await get_stream_user(token=None, ticket=ticket)
+    assert raised.value.status_code == 401
+
+
+async def test_stream_requires_credentials(database):
+    with pytest.raises(HTTPException) as raised:
+        await get_stream_user(token=None, ticket=None)
+    assert raised.value.status_code == 401
+    with pytest.raises(HTTPException):
+        await get_stream_user(token=None, ticket="not-a-ticket")
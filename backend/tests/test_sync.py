@@ -0,0 +1,94 @@
+"""
+Delta sync: changes after a token, tombstones for tasks the caller can no
+longer see, paging with ``has_more`` and ``reset`` for unusable tokens.
+"""
+import pytest
+
+from app.database import get_db
+from app.services.sync_service import SyncService
+from app.services.task_service import TaskService
+from app.services.token_service import TokenService
+
+
+def create_user(email: str, role: str) -> dict:
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Sync Test', ?, 'x', ?, '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """, (email, role))
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+@pytest.fixture(scope="module")
+def users(database):
+    return create_user("sync-admin@test.local", "admin"), create_user("sync-user@test.local", "user")
+
+
+async def test_changes_and_tombstones(api, users):
+    admin, user = users
+    with get_db() as conn:
+        headers = {"Authorization": f"Bearer {TokenService.issue(conn.cursor(), user)['access_token']}"}
+
+    first = (await api.get("/api/tasks/changes", headers=headers)).json()
+    assert first["reset"] is True and first["changes"] == []
+
+    kept = TaskService.create_task({"title": "Sync kept", "assigned_to": user["id"]}, admin["id"])
+    doomed = TaskService.create_task({"title": "Sync doomed", "assigned_to": user["id"]}, admin["id"])
+    moved = TaskService.create_task({"title": "Sync moved", "assigned_to": user["id"]}, admin["id"])
+    TaskService.create_task({"title": "Sync elsewhere", "assigned_to": admin["id"]}, admin["id"])
+    TaskService.update_task(kept["id"], {"status": "done"}, admin["id"], "admin")
+
+    delta = (await api.get("/api/tasks/changes", headers=headers, params={"since": first["since"]})).json()
+    assert delta["reset"] is False and delta["deleted"] == []
+    assert [task["id"] for task in delta["changes"]] == [doomed["id"], moved["id"], kept["id"]]
+    assert delta["changes"][-1]["status"] == "done"
+
+    TaskService.delete_task(doomed["id"], admin["id"])
+    TaskService.update_task(moved["id"], {"assigned_to": admin["id"]}, admin["id"], "admin")
+
+    tombstones = (await api.get("/api/tasks/changes", headers=headers, params={"since": delta["since"]})).json()
+    assert tombstones["changes"] == []
+    assert tombstones["deleted"] == [doomed["id"], moved["id"]]
+
+    idle = (await api.get("/api/tasks/changes", headers=headers, params={"since": tombstones["since"]})).json()
+    assert (idle["changes"], idle["deleted"], idle["since"]) == ([], [], tombstones["since"])
+
+
+def test_changes_page_with_has_more(users):
+    admin, _ = users
+    since = SyncService.get_changes(admin["id"], "admin")["since"]
+    created = TaskService.bulk_create_tasks([{"title": f"Sync page {n}"} for n in range(5)], admin["id"])
+
+    seen = []
+    while True:
+        page = SyncService.get_changes(admin["id"], "admin", since=since, limit=2)
+        seen.extend(task["id"] for task in page["changes"])
+        since = page["since"]
+        if not page["has_more"]:
+            break
+    assert seen == [result["id"] for result in created["results"]]
+
+
+def test_stale_token_resets(users):
+    admin, _ = users
+    stale = SyncService.get_changes(admin["id"], "admin")["since"]
+    TaskService.bulk_create_tasks([{"title": f"Sync pruned {n}"} for n in range(3)], admin["id"])
+    # Everything but the newest row is past a negative retention window
+    assert SyncService.prune(retention_days=-1) > 0
+
+    page = SyncService.get_changes(admin["id"], "admin", since=stale)
+    assert page["reset"] is True
+    assert page["since"] != stale
+
+    assert SyncService.get_changes(admin["id"], "admin", since=str(10**9))["reset"] is True
+    assert SyncService.get_changes(admin["id"], "admin", since=page["since"])["reset"] is False
+
+
+async def test_invalid_token_is_rejected(api, users):
+    _, user = users
+    with get_db() as conn:
+        headers = {"Authorization": f"Bearer {TokenService.issue(conn.cursor(), user)['access_token']}"}
+    response = await api.get("/api/tasks/changes", headers=headers, params={"since": "not-a-token"})
+    assert response.status_code == 400
@@ -0,0 +1,84 @@
+"""
+Task creation runs its assignee check, insert and read-back in one pooled
+transaction, committed by ``get_db`` rather than by the service. Bulk
+creation skips invalid items and reports them per item.
+"""
+import pytest
+from fastapi import HTTPException
+
+from app.database import get_db
+from app.services.task_service import TaskService
+
+
+def create_user(conn, email: str) -> int:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+        VALUES ('Task Test', ?, 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """,
+        (email,)
+    )
+    return cursor.lastrowid
+
+
+def task_count(title: str) -> int:
+    with get_db() as conn:
+        return conn.execute("SELECT COUNT(*) FROM tasks WHERE title = ?", (title,)).fetchone()[0]
+
+
+def test_create_task(database):
+    with get_db() as conn:
+        user_id = create_user(conn, "create-task@test.local")
+
+    task = TaskService.create_task({"title": "One transaction", "assigned_to": user_id}, user_id)
+    assert task["assigned_to"] == user_id
+    assert task["status"] == "todo"
+    assert task_count("One transaction") == 1
+
+
+def test_create_task_rolls_back_with_the_caller(database):
+    with get_db() as conn:
+        user_id = create_user(conn, "create-task-rollback@test.local")
+
+    with pytest.raises(RuntimeError):
+        with get_db():
+            TaskService.create_task({"title": "Rolled back", "assigned_to": user_id}, user_id)
+            raise RuntimeError("caller failed")
+    assert task_count("Rolled back") == 0
+
+
+def test_create_task_rejects_unknown_assignee(database):
+    with pytest.raises(HTTPException) as raised:
+        TaskService.create_task({"title": "Nobody", "assigned_to": 999_999}, None)
+    assert raised.value.status_code == 400
+    assert task_count("Nobody") == 0
+
+
+def test_bulk_create_reports_invalid_items(database):
+    with get_db() as conn:
+        user_id = create_user(conn, "bulk-partial@test.local")
+
+    summary = TaskService.bulk_create_tasks([
+        {"title": "Bulk valid 0", "assigned_to": user_id},
+        {"title": "Bulk bad status", "status": "archived"},
+        {"title": "Bulk valid 1"},
+        {"title": "Bulk unknown assignee", "assigned_to": 999_999},
+        {"title": "Bulk bad priority", "priority": "urgent"},
+        {"title": "Bulk valid 2", "status": "done", "priority": "high"},
+    ], user_id)
+
+    assert summary["succeeded"] == 3 and summary["failed"] == 3
+    results = summary["results"]
+    assert [result["index"] for result in results] == list(range(6))
+    assert [result["success"] for result in results] == [True, False, True, False, False, True]
+    assert results[1]["error"].startswith("Status must be one of")
+    assert results[3]["error"] == "Assigned user with ID 999999 does not exist"
+    assert results[4]["error"].startswith("Priority must be one of")
+    assert all(result["id"] is None for result in results if not result["success"])
+
+    for index in (0, 2, 5):
+        task = TaskService.get_task_by_id(results[index]["id"])
+        assert task["title"] == f"Bulk valid {index // 2}"
+    for title in ("Bulk bad status", "Bulk unknown assignee", "Bulk bad priority"):
+        assert task_count(title) == 0
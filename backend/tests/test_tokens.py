@@ -0,0 +1,105 @@
+"""
+Refresh tokens rotate and are single-use; reusing one, logging out and
+logging out everywhere revoke access tokens through the denylist.
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.database import get_db
+from app.services.token_service import TokenService
+from app.utils.dependencies import _decode_token, _verified_payload
+from app.utils.token_denylist import TokenDenylist
+
+
+def create_user(email: str) -> dict:
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (name, email, hashed_password, role, created_at, updated_at)
+            VALUES ('Token Test', ?, 'x', 'user', '2024-01-01T00:00:00', '2024-01-01T00:00:00')
+        """, (email,))
+        cursor.execute("SELECT * FROM users WHERE id = ?", (cursor.lastrowid,))
+        return dict(cursor.fetchone())
+
+
+def login(user: dict) -> dict:
+    with get_db() as conn:
+        return TokenService.issue(conn.cursor(), user)
+
+
+def assert_unauthorized(call, *args):
+    with pytest.raises(HTTPException) as raised:
+        call(*args)
+    assert raised.value.status_code == 401
+
+
+def test_refresh_rotates_the_token(database):
+    tokens = login(create_user("rotate@test.local"))
+    rotated = TokenService.refresh(tokens["refresh_token"])
+
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert rotated["user"]["email"] == "rotate@test.local"
+    assert _verified_payload(rotated["access_token"])["sid"] == _decode_token(tokens["access_token"])["sid"]
+    assert TokenService.refresh(rotated["refresh_token"])["refresh_token"]
+
+
+def test_reused_refresh_token_revokes_the_session(database):
+    tokens = login(create_user("reuse@test.local"))
+    rotated = TokenService.refresh(tokens["refresh_token"])
+
+    with pytest.raises(HTTPException) as raised:
+        TokenService.refresh(tokens["refresh_token"])
+    assert raised.value.status_code == 401
+    assert "revoked" in raised.value.detail
+
+    # The legitimate holder's newer tokens die with the session
+    assert_unauthorized(TokenService.refresh, rotated["refresh_token"])
+    assert_unauthorized(_verified_payload, rotated["access_token"])
+    assert_unauthorized(_verified_payload, tokens["access_token"])
+
+
+def test_logout_revokes_only_its_session(database):
+    user = create_user("logout@test.local")
+    first, second = login(user), login(user)
+    TokenService.logout(session_id=_decode_token(first["access_token"])["sid"], user_id=user["id"])
+
+    assert_unauthorized(_verified_payload, first["access_token"])
+    assert_unauthorized(TokenService.refresh, first["refresh_token"])
+    assert _verified_payload(second["access_token"])
+    assert TokenService.refresh(second["refresh_token"])
+
+
+def test_logout_all_sessions(database):
+    user = create_user("logout-all@test.local")
+    first, second = login(user), login(user)
+    # Cutoffs have millisecond resolution
+    time.sleep(0.01)
+    result = TokenService.logout(user_id=user["id"], all_sessions=True)
+
+    assert result == {"revoked_refresh_tokens": 2}
+    for tokens in (first, second):
+        assert_unauthorized(_verified_payload, tokens["access_token"])
+        assert_unauthorized(TokenService.refresh, tokens["refresh_token"])
+
+    # Logging in again afterwards is unaffected by the cutoff
+    time.sleep(0.01)
+    assert _verified_payload(login(user)["access_token"])
+
+
+def test_other_processes_pick_up_revocations(database):
+    user = create_user("denylist@test.local")
+    tokens = login(user)
+    payload = _decode_token(tokens["access_token"])
+
+    other = TokenDenylist()
+    with get_db() as conn:
+        other.reload(conn.cursor())
+    assert not other.is_revoked(payload)
+
+    TokenService.logout(session_id=payload["sid"], user_id=user["id"])
+    with get_db() as conn:
+        other.reload(conn.cursor())
+    assert other.is_revoked(payload)
+    assert other.stats()["sessions"] >= 1
@@ -1,7 +1,8 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Task, User, Analytics as AnalyticsType } from '../types';
 import { adminAPI } from '../services/api';
 import { authService } from '../services/auth';
+import { createTaskSync, subscribeTaskEvents } from '../services/taskSync';
 import TaskForm from './TaskForm';
 import Analytics from './Analytics';
 import TaskAssignmentView from './TaskAssignmentView';
@@ -16,11 +17,13 @@ const AdminDashboard: React.FC = () => {
   const [showAnalytics, setShowAnalytics] = useState(false);
   const [loading, setLoading] = useState(false);
   const currentUser = authService.getUser();
+  const syncTasks = useRef(createTaskSync(adminAPI.getTasks));
  
   useEffect(() => {
     loadTasks();
     loadUsers();
     loadAnalytics();
+    return subscribeTaskEvents(() => loadTasks());
   }, []);
  
   // Reload analytics when showing analytics view
@@ -35,7 +38,7 @@ const AdminDashboard: React.FC = () => {
   const loadTasks = async () => {
     try {
       console.log('Loading tasks...');
-      const data = await adminAPI.getTasks();
+      const data = await syncTasks.current();
       console.log('Tasks loaded:', data);
       setTasks(data);
     } catch (error) {
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { Analytics as AnalyticsType } from '../types';
+import { Analytics as AnalyticsType, AnalyticsCategory, Task } from '../types';
+import { adminAPI } from '../services/api';
 import { BarChart, Bar, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import TaskTooltip from './TaskTooltip';
 import '../styles/Dashboard.css';
@@ -15,22 +16,36 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
   const [tooltipPosition, setTooltipPosition] = useState({ x: 0, y: 0 });
   const [isRefreshing, setIsRefreshing] = useState(false);
  
+  // Tooltip task lists, fetched on first hover and cached per analytics load
+  const [loadedTasks, setLoadedTasks] = useState<{ [key: string]: Task[] }>({});
+ 
   const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8'];
+  const TOOLTIP_PAGE_SIZE = 20;
+ 
+  const CARD_CATEGORIES: { [card: string]: { title: string; category: AnalyticsCategory } } = {
+    total: { title: 'All Tasks', category: 'all' },
+    completed: { title: 'Completed Tasks', category: 'completed' },
+    overdue: { title: 'Overdue Tasks', category: 'overdue' },
+  };
  
-  // Debug: Log analytics data when it changes
+  // Drop cached lists whenever fresh analytics arrive
   useEffect(() => {
-    console.log("ANALYTICS STATE CHECK")
-    console.log('Completed tasks list:', analytics.completed_tasks_list, {
-      total_tasks: analytics.total_tasks,
-      completed_tasks: analytics.completed_tasks,
-      overdue_tasks: analytics.overdue_tasks,
-      all_tasks_list_length: analytics.all_tasks_list?.length || 0,
-      completed_tasks_list_length: analytics.completed_tasks_list?.length || 0,
-      overdue_tasks_list_length: analytics.overdue_tasks_list?.length || 0,
-      completed_tasks_list: analytics.completed_tasks_list
-    });
+    setLoadedTasks({});
   }, [analytics]);
  
+  const categoryCount = (category: AnalyticsCategory) =>
+    analytics.category_counts?.[category] ?? 0;
+ 
+  const loadCategoryTasks = async (category: AnalyticsCategory) => {
+    if (loadedTasks[category]) return;
+    try {
+      const page = await adminAPI.getAnalyticsTasks(category, TOOLTIP_PAGE_SIZE);
+      setLoadedTasks((prev) => ({ ...prev, [category]: page.tasks }));
+    } catch (error) {
+      console.error(`Error loading ${category} tasks:`, error);
+    }
+  };
+ 
   const statusData = Object.entries(analytics.status_breakdown).map(([key, value]) => ({
     name: key.replace('_', ' ').toUpperCase(),
     value,
@@ -42,17 +57,18 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
   }));
  
   const handleMouseEnter = (cardName: string, event: React.MouseEvent) => {
-    console.log(`Mouse entered card: ${cardName}`);
     const rect = event.currentTarget.getBoundingClientRect();
     setTooltipPosition({
       x: rect.left + rect.width / 2,
       y: rect.top
     });
     setHoveredCard(cardName);
+    if (CARD_CATEGORIES[cardName]) {
+      loadCategoryTasks(CARD_CATEGORIES[cardName].category);
+    }
   };
  
   const handleMouseLeave = () => {
-    console.log('Mouse left card');
     setHoveredCard(null);
   };
  
@@ -65,31 +81,11 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
   };
  
   const getTooltipContent = () => {
-    if (!hoveredCard) return null;
-    
-    let title = '';
-    let tasks: any[] = [];
-    
-    switch (hoveredCard) {
-      case 'total':
-        title = 'All Tasks';
-        tasks = analytics.all_tasks_list || [];
-        break;
-      case 'completed':
-        title = 'Completed Tasks';
-        tasks = analytics.completed_tasks_list || [];
-        break;
-      case 'overdue':
-        title = 'Overdue Tasks';
-        tasks = analytics.overdue_tasks_list || [];
-        break;
-      case 'users':
-        return null;
-      default:
-        return null;
-    }
+    if (!hoveredCard || !CARD_CATEGORIES[hoveredCard]) return null;
     
-    console.log('Tooltip content for', hoveredCard, ':', { title, taskCount: tasks.length, tasks });
+    const { title, category } = CARD_CATEGORIES[hoveredCard];
+    // Show the preview from the summary until the full page has loaded
+    const tasks = loadedTasks[category] || analytics.previews?.[category] || [];
     
     return { title, tasks };
   };
@@ -119,7 +115,7 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
           <h3>Total Tasks</h3>
           <p className="stat-value">{analytics.total_tasks}</p>
           <div className="stat-card-hover-hint">
-            Hover for details ({analytics.all_tasks_list?.length || 0} tasks)
+            Hover for details ({categoryCount('all')} tasks)
           </div>
         </div>
         
@@ -131,7 +127,7 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
           <h3>Completed</h3>
           <p className="stat-value completed">{analytics.completed_tasks}</p>
           <div className="stat-card-hover-hint">
-            Hover for details ({analytics.completed_tasks_list?.length || 0} tasks)
+            Hover for details ({categoryCount('completed')} tasks)
           </div>
         </div>
         
@@ -143,7 +139,7 @@ const Analytics: React.FC<AnalyticsProps> = ({ analytics, onRefresh }) => {
           <h3>Overdue</h3>
           <p className="stat-value overdue">{analytics.overdue_tasks}</p>
           <div className="stat-card-hover-hint">
-            Hover for details ({analytics.overdue_tasks_list?.length || 0} tasks)
+            Hover for details ({categoryCount('overdue')} tasks)
           </div>
         </div>
         
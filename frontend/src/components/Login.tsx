@@ -24,6 +24,7 @@ const Login: React.FC<LoginProps> = ({ onLogin, onSwitchToRegister }) => {
     try {
       const response = await authAPI.login(email, password);
       authService.setToken(response.access_token);
+      authService.setRefreshToken(response.refresh_token);
       authService.setUser(response.user);
       onLogin();
     } catch (err: any) {
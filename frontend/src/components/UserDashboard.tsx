@@ -1,7 +1,8 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Task } from '../types';
 import { userAPI } from '../services/api';
 import { authService } from '../services/auth';
+import { createTaskSync, subscribeTaskEvents } from '../services/taskSync';
 import UserTaskBoard from './UserTaskBoard';
 import UserTaskEditModal from './UserTaskEditModal';
 import '../styles/Dashboard.css';
@@ -11,14 +12,16 @@ const UserDashboard: React.FC = () => {
   const [showEditModal, setShowEditModal] = useState(false);
   const [editingTask, setEditingTask] = useState<Task | null>(null);
   const currentUser = authService.getUser();
+  const syncTasks = useRef(createTaskSync(userAPI.getTasks));
  
   useEffect(() => {
     loadTasks();
+    return subscribeTaskEvents(() => loadTasks());
   }, []);
  
   const loadTasks = async () => {
     try {
-      const data = await userAPI.getTasks();
+      const data = await syncTasks.current();
       setTasks(data);
     } catch (error) {
       console.error('Error loading tasks:', error);
@@ -1,11 +1,20 @@
 import axios from 'axios';
-import { Task, User, Analytics } from '../types';
+import {
+  Task,
+  User,
+  Analytics,
+  AnalyticsCategory,
+  AnalyticsTaskPage,
+  TaskChanges,
+  TaskSearchResults,
+  StreamTicket,
+} from '../types';
 
 /* ================================
    BASE CONFIG
 ================================ */
 
-const API_BASE_URL = 'http://127.0.0.1:8080';
+export const API_BASE_URL = 'http://127.0.0.1:8080';
 
 /**
  * Axios instance for JSON-based APIs
@@ -29,6 +38,62 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+/* ================================
+   TOKEN REFRESH
+================================ */
+
+// Access tokens are short-lived. On a 401 the refresh token is exchanged
+// for a new pair and the request retried once. Refresh tokens are single-use,
+// so concurrent 401s share one refresh call.
+let refreshing: Promise<string> | null = null;
+
+export const refreshAccessToken = (): Promise<string> => {
+  if (!refreshing) {
+    refreshing = (async () => {
+      const refreshToken = localStorage.getItem('refresh_token');
+      if (!refreshToken) {
+        throw new Error('No refresh token');
+      }
+      try {
+        const response = await axios.post(`${API_BASE_URL}/api/auth/refresh`, {
+          refresh_token: refreshToken,
+        });
+        localStorage.setItem('token', response.data.access_token);
+        localStorage.setItem('refresh_token', response.data.refresh_token);
+        localStorage.setItem('user', JSON.stringify(response.data.user));
+        return response.data.access_token as string;
+      } catch (error) {
+        // Expired, revoked or already used: the session is over
+        localStorage.removeItem('token');
+        localStorage.removeItem('refresh_token');
+        localStorage.removeItem('user');
+        throw error;
+      }
+    })().finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+};
+
+api.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const config = error.config;
+    if (error.response?.status !== 401 || !config || config._retried) {
+      return Promise.reject(error);
+    }
+    config._retried = true;
+    try {
+      const token = await refreshAccessToken();
+      config.headers.Authorization = `Bearer ${token}`;
+    } catch {
+      return Promise.reject(error);
+    }
+    return api(config);
+  }
+);
+
 /* ================================
    AUTH API
 ================================ */
@@ -74,6 +139,27 @@ export const authAPI = {
 
     return response.data;
   },
+
+  /**
+   * Revoke this session's tokens. Sent with keepalive so it completes
+   * even when the page reloads right after.
+   */
+  logout: (allSessions: boolean = false) => {
+    const token = localStorage.getItem('token');
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!token && !refreshToken) {
+      return Promise.resolve();
+    }
+    return fetch(`${API_BASE_URL}/api/auth/logout`, {
+      method: 'POST',
+      keepalive: true,
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({ refresh_token: refreshToken, all_sessions: allSessions }),
+    }).catch(() => undefined);
+  },
 };
 
 /* ================================
@@ -103,8 +189,25 @@ export const adminAPI = {
     await api.delete(`/api/admin/tasks/${taskId}`);
   },
 
+  /**
+   * Analytics counts with small per-category previews.
+   * Full task lists are loaded on demand via getAnalyticsTasks.
+   */
   getAnalytics: async (): Promise<Analytics> => {
-    const response = await api.get('/api/admin/analytics');
+    const response = await api.get('/api/admin/analytics', {
+      params: { mode: 'summary' },
+    });
+    return response.data;
+  },
+
+  getAnalyticsTasks: async (
+    category: AnalyticsCategory,
+    limit: number = 20,
+    offset: number = 0
+  ): Promise<AnalyticsTaskPage> => {
+    const response = await api.get(`/api/admin/analytics/tasks/${category}`, {
+      params: { limit, offset },
+    });
     return response.data;
   },
 
@@ -138,6 +241,60 @@ export const userAPI = {
   },
 };
 
+/* ================================
+   SYNC API
+================================ */
+
+export const syncAPI = {
+  /**
+   * Tasks changed since the given token, plus deleted ids.
+   * Without a token (or with a stale one) the response has reset=true.
+   */
+  getChanges: async (since: string | null): Promise<TaskChanges> => {
+    const response = await api.get('/api/tasks/changes', {
+      params: since ? { since } : {},
+    });
+    return response.data;
+  },
+
+  /**
+   * Single-use ticket for opening the event stream; EventSource cannot
+   * send the Authorization header and tokens must stay out of URLs.
+   */
+  getStreamTicket: async (): Promise<StreamTicket> => {
+    const response = await api.post('/api/tasks/events/ticket');
+    return response.data;
+  },
+};
+
+/* ================================
+   SEARCH API
+================================ */
+
+export interface TaskSearchFilters {
+  status?: string;
+  priority?: string;
+  assigned_to?: number;
+  limit?: number;
+  offset?: number;
+}
+
+export const searchAPI = {
+  /**
+   * Full-text search over titles and descriptions, best match first.
+   * Users get their own tasks; snippets wrap matches in <mark>.
+   */
+  searchTasks: async (
+    q: string,
+    filters: TaskSearchFilters = {}
+  ): Promise<TaskSearchResults> => {
+    const response = await api.get('/api/tasks/search', {
+      params: { q, ...filters },
+    });
+    return response.data;
+  },
+};
+
 /* ================================
    EXPORT DEFAULT
 ================================ */
@@ -1,16 +1,22 @@
 import { User } from '../types';
+import { authAPI } from './api';
  
 export const authService = {
   setToken: (token: string) => {
     localStorage.setItem('token', token);
   },
   
+  setRefreshToken: (token: string) => {
+    localStorage.setItem('refresh_token', token);
+  },
+  
   getToken: (): string | null => {
     return localStorage.getItem('token');
   },
   
   removeToken: () => {
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
   },
   
@@ -24,11 +30,13 @@ export const authService = {
   },
   
   isAuthenticated: (): boolean => {
-    return !!localStorage.getItem('token');
+    return !!localStorage.getItem('token') || !!localStorage.getItem('refresh_token');
   },
   
   logout: () => {
+    authAPI.logout();
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
   },
 };
@@ -0,0 +1,110 @@
+import { Task, TaskChanges } from '../types';
+import { API_BASE_URL, syncAPI } from './api';
+
+const byNewest = (a: Task, b: Task) =>
+  b.created_at.localeCompare(a.created_at) || b.id - a.id;
+
+/**
+ * Merge one page of changes into a task list (same order as the list endpoints).
+ */
+export const applyTaskChanges = (tasks: Task[], page: TaskChanges): Task[] => {
+  const byId = new Map(tasks.map((task) => [task.id, task]));
+  page.deleted.forEach((id) => byId.delete(id));
+  page.changes.forEach((task) => byId.set(task.id, task));
+  return Array.from(byId.values()).sort(byNewest);
+};
+
+/**
+ * Keeps a local task list in step with the server via /api/tasks/changes.
+ * The first call, or a reset from the server, falls back to loadAll.
+ */
+export const createTaskSync = (loadAll: () => Promise<Task[]>) => {
+  let since: string | null = null;
+  let tasks: Task[] = [];
+  let last: Promise<Task[]> = Promise.resolve(tasks);
+
+  const sync = async (): Promise<Task[]> => {
+    let page = await syncAPI.getChanges(since);
+
+    if (page.reset) {
+      // The token is taken before the full load, so writes in between are replayed
+      since = page.since;
+      tasks = await loadAll();
+      page = await syncAPI.getChanges(since);
+    }
+
+    for (;;) {
+      tasks = applyTaskChanges(tasks, page);
+      since = page.since;
+      if (!page.has_more) break;
+      page = await syncAPI.getChanges(since);
+    }
+
+    return tasks;
+  };
+
+  // Overlapping calls run one after another so each starts from the latest token
+  return (): Promise<Task[]> => {
+    last = last.then(sync, sync);
+    return last;
+  };
+};
+
+/**
+ * Listen to live task events and call onChange (debounced) when tasks change.
+ * Events only trigger a delta sync, so dropped or coalesced events are harmless.
+ * Returns a function that closes the stream.
+ */
+export const subscribeTaskEvents = (onChange: () => void, delay: number = 250) => {
+  if (!localStorage.getItem('token') || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  let source: EventSource | null = null;
+  let closed = false;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  const schedule = () => {
+    if (timer) return;
+    timer = setTimeout(() => {
+      timer = null;
+      onChange();
+    }, delay);
+  };
+
+  const open = async (retry: boolean) => {
+    // Tickets work once, so every connection (and reconnection) gets a new one;
+    // the API client refreshes an expired access token on the way
+    let ticket: string;
+    try {
+      ({ ticket } = await syncAPI.getStreamTicket());
+    } catch {
+      return;
+    }
+    if (closed) return;
+    const stream = new EventSource(
+      `${API_BASE_URL}/api/tasks/events?ticket=${encodeURIComponent(ticket)}`
+    );
+    source = stream;
+    ['created', 'updated', 'deleted', 'overdue', 'resync'].forEach((type) =>
+      stream.addEventListener(type, schedule)
+    );
+    stream.addEventListener('open', () => {
+      retry = true;
+    });
+    // EventSource reconnects to the same URL, whose ticket is used up, so
+    // the retry fails with 401 and gives up: reconnect with a new ticket,
+    // once per successful connection
+    stream.addEventListener('error', () => {
+      if (closed || !retry || stream.readyState !== EventSource.CLOSED) return;
+      retry = false;
+      open(false);
+    });
+  };
+  open(true);
+
+  return () => {
+    closed = true;
+    if (timer) clearTimeout(timer);
+    source?.close();
+  };
+};
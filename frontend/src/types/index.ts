@@ -31,6 +31,16 @@ export interface Task {
   is_overdue: boolean;
 }
  
+export type AnalyticsCategory =
+  | 'all'
+  | 'completed'
+  | 'todo'
+  | 'in_progress'
+  | 'overdue'
+  | 'high_priority'
+  | 'medium_priority'
+  | 'low_priority';
+
 export interface Analytics {
   total_tasks: number;
   total_users: number;
@@ -42,21 +52,61 @@ export interface Analytics {
     id: number;
     name: string;
     task_count: number;
-    tasks: Task[];
+    tasks?: Task[];
   }>;
-  // New: Detailed task lists
-  all_tasks_list: Task[];
-  completed_tasks_list: Task[];
-  overdue_tasks_list: Task[];
-  todo_tasks_list: Task[];
-  in_progress_tasks_list: Task[];
-  high_priority_tasks_list: Task[];
-  medium_priority_tasks_list: Task[];
-  low_priority_tasks_list: Task[];
+  // Summary mode: per-category counts and small previews
+  category_counts?: { [key in AnalyticsCategory]?: number };
+  previews?: { [key in AnalyticsCategory]?: Task[] };
+  // Full mode only: detailed task lists
+  all_tasks_list?: Task[];
+  completed_tasks_list?: Task[];
+  overdue_tasks_list?: Task[];
+  todo_tasks_list?: Task[];
+  in_progress_tasks_list?: Task[];
+  high_priority_tasks_list?: Task[];
+  medium_priority_tasks_list?: Task[];
+  low_priority_tasks_list?: Task[];
+}
+
+export interface AnalyticsTaskPage {
+  category: AnalyticsCategory;
+  total: number;
+  limit: number;
+  offset: number;
+  tasks: Task[];
+}
+
+export interface StreamTicket {
+  ticket: string;
+  expires_in: number;
+}
+
+export interface TaskChanges {
+  changes: Task[];
+  deleted: number[];
+  since: string;
+  has_more: boolean;
+  reset: boolean;
+}
+ 
+export interface TaskSearchHit extends Task {
+  rank: number;
+  snippet: string | null;
+}
+
+export interface TaskSearchResults {
+  results: TaskSearchHit[];
+  has_more: boolean;
+  /** Matches ranked; capped at SEARCH_RANK_WINDOW per shard */
+  total: number;
+  /** Older matches were left out of the ranking; narrow the query to reach them */
+  truncated: boolean;
 }
  
 export interface AuthResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
+  expires_in: number;
   user: User;
 }
\ No newline at end of file